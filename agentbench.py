@@ -0,0 +1,213 @@
+# File: agentbench.py
+# Date: October 18, 2026
+# Description: Speed benchmark of every agent on a fixed, seeded set of
+# positions. Records search throughput, tree size and per-move latency
+# percentiles, writes them to JSON and checks them against a stored baseline.
+# Run with ./Connect4 bench, or ./Connect4 bench update to store a new baseline.
+
+import json
+import time
+import random
+import playout
+import arraytree
+import tournament
+from benchmark import sample_positions
+
+AGENTS = ['mcts', 'uct0', 'uct1', 'uct2', 'alphabeta', 'solver']
+RESULTS_FILE = 'bench_results.json'
+BASELINE_FILE = 'bench_baseline.json'
+BUDGET_SLACK_MS = 0.5 # milliseconds p95 latency may run past the time per
+                      # move, for the last playout or node and choosing the move
+STALL_SLACK_MS = 3.0 # milliseconds p99 latency may run past it: over 50 moves
+                     # p99 is the slowest, so one stall of the machine sets it
+
+def percentile(values, q):
+    """ Returns the q-th percentile of the values, taking the nearest rank.
+
+    values -- non-empty list of numbers
+    q -- percentile between 0 and 100
+    """
+    ordered = sorted(values)
+    rank = max(1, int(-(-q * len(ordered) // 100)))
+    return ordered[rank - 1]
+
+def count_nodes(root):
+    """ Returns the number of nodes of an mcts or uct0 node tree.
+    """
+    count, stack = 0, [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children.values())
+    return count
+
+def search_counts(agent, policy):
+    """ Returns (playouts, search nodes, tree size) reported by the given
+    policy after its last move, counted since it was created. Counts an
+    agent does not have are None.
+
+    agent -- name of the agent, one of AGENTS
+    policy -- policy made by tournament.policy_factory for that agent
+    """
+    if agent in ('mcts', 'uct0'):
+        tree = policy.tree
+        if isinstance(tree, arraytree.ArrayTree):
+            return (tree.visits[0] - policy.carriedVisits[-1], None, tree.nodes)
+        return (tree.visits - policy.carriedVisits[-1], None, count_nodes(tree))
+    if agent in ('uct1', 'uct2'):
+        return (policy.search.iterations, None, len(policy.search.stateList))
+    if agent == 'alphabeta':
+        return (None, policy.nodes, None)
+    return (None, policy.search.nodes, None)
+
+def bench_agent(agent, positions, t, d):
+    """ Makes one move with a new policy of the given agent in each position
+    and returns its metrics: playouts and nodes per second of search time,
+    mean tree size after a move, and latency percentiles in milliseconds.
+
+    agent -- name of the agent, one of AGENTS
+    positions -- states to move in
+    t -- time allowed per move in seconds
+    d -- max searchable depth for alphabeta
+    """
+    latencies, playouts, nodes, sizes = [], 0, 0, []
+    for i, st in enumerate(positions):
+        random.seed(i)
+        playout.seed(i)
+        policy = tournament.policy_factory(agent, t, st.actor(), d)()
+        start = time.time()
+        policy(st)
+        latencies.append(time.time() - start)
+        p, n, size = search_counts(agent, policy)
+        playouts += p if p != None else 0
+        nodes += n if n != None else 0
+        if size != None:
+            sizes.append(size)
+    seconds = sum(latencies)
+    return {
+        'moves': len(positions),
+        'playoutsPerSec': playouts / seconds if agent not in ('alphabeta', 'solver') else None,
+        'nodesPerSec': nodes / seconds if agent in ('alphabeta', 'solver') else None,
+        'treeSize': sum(sizes) / len(sizes) if sizes else None,
+        'p50ms': 1000 * percentile(latencies, 50),
+        'p95ms': 1000 * percentile(latencies, 95),
+        'p99ms': 1000 * percentile(latencies, 99),
+    }
+
+def best_of(runs):
+    """ Combines the metrics of repeated runs of one agent into the best of
+    each: the highest throughput and the lowest latencies, which are the
+    least disturbed by other work on the machine.
+
+    runs -- list of dicts from bench_agent
+    """
+    best = dict(runs[0])
+    for metrics in runs[1:]:
+        for name, value in metrics.items():
+            if value == None or name in ('moves', 'treeSize'):
+                continue
+            best[name] = max(best[name], value) if name.endswith('PerSec') else min(best[name], value)
+    return best
+
+def run_bench(t=0.01, count=50, seed=0, d=4, repeats=3, agents=AGENTS):
+    """ Benchmarks every agent on the same positions and returns the settings
+    and per-agent metrics as a JSON-ready dict, each the best of the repeats.
+
+    t -- time allowed per move in seconds
+    count -- number of positions
+    seed -- random seed of the positions
+    d -- max searchable depth for alphabeta
+    repeats -- runs of every agent over the positions
+    agents -- names of the agents to run
+    """
+    positions = sample_positions(count, 4, 30, seed)
+    results = {'settings': {'t': t, 'count': count, 'seed': seed, 'd': d, 'repeats': repeats}, 'agents': dict()}
+    for agent in agents:
+        results['agents'][agent] = best_of([bench_agent(agent, positions, t, d) for _ in range(repeats)])
+    return results
+
+def regressions(results, baseline, tolerance=0.25, slackMs=5.0):
+    """ Returns a list of messages, one per metric that is worse than the
+    baseline by more than the tolerance: throughput that dropped, or p99
+    latency that grew. Empty if nothing regressed.
+
+    results -- dict from run_bench
+    baseline -- dict from an earlier run_bench
+    tolerance -- allowed relative change
+    slackMs -- milliseconds p99 latency may grow on top of the tolerance,
+               since a single stall of the machine sets it
+    """
+    messages = []
+    if results['settings'] != baseline['settings']:
+        messages.append("settings differ from the baseline: %s against %s" % (results['settings'], baseline['settings']))
+        return messages
+    for agent, metrics in results['agents'].items():
+        old = baseline['agents'].get(agent)
+        if old == None:
+            continue
+        for name in ('playoutsPerSec', 'nodesPerSec'):
+            if metrics[name] != None and old.get(name) != None and metrics[name] < old[name] * (1 - tolerance):
+                messages.append("%s %s fell from %.1f to %.1f" % (agent, name, old[name], metrics[name]))
+        if metrics['p99ms'] > old['p99ms'] * (1 + tolerance) + slackMs:
+            messages.append("%s p99ms rose from %.3f to %.3f" % (agent, old['p99ms'], metrics['p99ms']))
+    return messages
+
+def over_budget(results, slackMs=BUDGET_SLACK_MS, stallMs=STALL_SLACK_MS):
+    """ Returns a list of messages, one per latency percentile of an agent
+    that is over the time allowed per move by more than its slack: p95 by
+    slackMs, or p99 by stallMs. Empty if every agent kept to its time.
+
+    results -- dict from run_bench
+    slackMs -- milliseconds p95 latency may run past the time per move
+    stallMs -- milliseconds p99 latency may run past the time per move
+    """
+    budgetMs = 1000 * results['settings']['t']
+    messages = []
+    for agent, metrics in results['agents'].items():
+        for name, slack in (('p95ms', slackMs), ('p99ms', stallMs)):
+            if metrics[name] > budgetMs + slack:
+                messages.append("%s %s %.3f is over the %.1fms budget" % (agent, name, metrics[name], budgetMs))
+    return messages
+
+def print_results(results):
+    """ Prints one line of metrics per agent.
+    """
+    for agent, metrics in results['agents'].items():
+        print(agent.upper(), "-", " ; ".join("%s: %s" % (name, round(value, 3) if value != None else "-") for name, value in metrics.items()))
+
+def main(update=False):
+    """ Runs the benchmark, prints and writes the results, checks that every
+    agent moves within its time and compares the results with the stored
+    baseline. Returns 1 if an agent is over budget or anything regressed,
+    else 0. With update, stores the results as the new baseline instead, and
+    fails without storing them if an agent is over budget.
+    """
+    results = run_bench()
+    print_results(results)
+    overruns = over_budget(results)
+    for message in overruns:
+        print("OVER BUDGET:", message)
+    if overruns:
+        print("FAILED:", len(overruns), "agents over the time allowed per move")
+        if update:
+            return 1
+    path = BASELINE_FILE if update else RESULTS_FILE
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print("Wrote", path)
+    if update:
+        return 0
+    try:
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print("No baseline in", BASELINE_FILE, "- run ./Connect4 bench update to store one")
+        return 1 if overruns else 0
+    messages = regressions(results, baseline)
+    for message in messages:
+        print("REGRESSION:", message)
+    if messages:
+        print("FAILED:", len(messages), "regressions against", BASELINE_FILE)
+    else:
+        print("No regressions against", BASELINE_FILE)
+    return 1 if overruns or messages else 0
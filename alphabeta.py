@@ -2,117 +2,526 @@
 # Date: December 18, 2023
 # Description: Minimax algorithm with alpha-beta pruning
 
+import math
 import time
 import connect4
 import numpy as np
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+ASPIRATION = 2.0 # half-width of the aspiration window around the previous depth's score
+WIN_SCORE = 100.0 # value of a won position, above any heuristic score (69
+                  # windows of at most 0.7), plus the depth left so that
+                  # sooner wins are preferred
+
+def board_windows():
+    """ Returns the 69 windows of four cells that can hold a win, as (row,
+    column) board coordinates with row 0 at the top. Windows come in the
+    order array_heuristic visits them: 6 rows of 4 windows, 7 columns of 3
+    windows, then the 12 diagonal and anti-diagonal windows interleaved.
+    """
+    windows = []
+    for r in range(6):
+        for i in range(4):
+            windows.append([(r, i + k) for k in range(4)])
+    for c in range(7):
+        for i in range(3):
+            windows.append([(i + k, c) for k in range(4)])
+    for i in range(3):
+        for j in range(4):
+            windows.append([(i + k, j + k) for k in range(4)])
+            windows.append([(i + k, j + 3 - k) for k in range(4)])
+    return windows
+
+# bitboard bit of every cell in every window, and the score of a window by
+# how many of its cells belong to the actor and to the other player
+WINDOW_BITS = np.array([[connect4.COLUMN_BITS * c + (connect4.HEIGHT - 1 - r) for r, c in w] for w in board_windows()], dtype=np.uint64)
+ONE = np.uint64(1)
+WINDOW_SCORE = np.zeros((5, 5))
+WINDOW_SCORE[3, 0] = 0.7  # three of the actor's discs with an empty slot
+WINDOW_SCORE[2, 0] = 0.4  # two of the actor's discs with two empty slots
+WINDOW_SCORE[0, 3] = -0.7 # three of the other player's discs with an empty slot
+WINDOW_SCORE[0, 2] = -0.4 # two of the other player's discs with two empty slots
+
+def array_heuristic(state):
+    """ Returns the total score at the given state for the current actor.
+    Increases/decreases score marginally to favor states with two or three
+    consecutive discs adjacent to empty slots (allows a potential win).
+    The original window-by-window version of abTree.heuristic, kept as a
+    reference for correctness checks and benchmarks.
+
+    state -- game state
+    """
+    def check_line(line):
+        score = 0
+        actor = state.actor1
+        otherActor = 2 if actor==1 else 1
+        for i in range(len(line) - 3):
+            window = line[i:i+4]
+            if np.count_nonzero(window == actor) == 3 and np.count_nonzero(window == 0) == 1:  # Three red pieces with an empty slot
+                score += 0.7
+            elif np.count_nonzero(window == actor) == 2 and np.count_nonzero(window == 0) == 2:  # Two red pieces with two empty slots
+                score += 0.4
+            elif np.count_nonzero(window == otherActor) == 3 and np.count_nonzero(window == 0) == 1:  # Three black pieces with an empty slot
+                score -= 0.7
+            elif np.count_nonzero(window == otherActor) == 2 and np.count_nonzero(window == 0) == 2:  # Two black pieces with two empty slots
+                score -= 0.4
+        return score
+
+    # Evaluate the board in all directions
+    total_score = 0
+    # Check horizontally
+    board = state.board
+    for row in board:
+        total_score += check_line(row)
+    # Check vertically
+    for col in board.T:
+        total_score += check_line(col)
+    # Check diagonally (both directions)
+    for i in range(3):
+        for j in range(4):
+            total_score += check_line(board[i:i+4, j:j+4].diagonal())
+            total_score += check_line(np.fliplr(board[i:i+4, j:j+4]).diagonal())
+
+    return total_score
+
+class SearchTimeout(Exception):
+    """ Raised inside the search when its deadline passes.
+    """
+    pass
+
+class MoveOrdering:
+    def __init__(self, center=True, killers=True, history=True, hashMove=True):
+        """ Orders the moves searched at each node, trying the most promising
+        ones first so alpha-beta cuts off sooner. Moves are ranked by the
+        transposition table's best move, then killer moves (moves that caused
+        a cutoff at the same ply), then the history table (total cutoffs per
+        player and column, weighted by depth), then distance to the center.
+        Each source can be turned off.
+
+        center -- prefer columns near the center
+        killers -- prefer the last two moves that cut off at the same ply
+        history -- prefer moves that cut off often anywhere in the tree
+        hashMove -- prefer the best move stored in the transposition table
+        """
+        self.center = center
+        self.killers = killers
+        self.history = history
+        self.hashMove = hashMove
+        self.killerTable = dict() # ply -> up to two actions
+        self.historyTable = [[0] * connect4.WIDTH for _ in range(3)] # player -> column -> score
+
+    def order(self, state, actions, ply, hashMove):
+        """ Returns the indices of the given actions in search order.
+
+        state -- game state
+        actions -- legal actions of the state
+        ply -- distance from the root
+        hashMove -- best action stored for the state, or None
+        """
+        killers = self.killerTable.get(ply, ()) if self.killers else ()
+        history = self.historyTable[state.actor1]
+        def rank(i):
+            a = actions[i]
+            return (self.hashMove and a == hashMove,
+                    a in killers,
+                    history[a] if self.history else 0,
+                    -abs(a - 3) if self.center else 0)
+        return sorted(range(len(actions)), key=rank, reverse=True)
+
+    def cutoff(self, state, action, ply, depth):
+        """ Records that the given action caused a cutoff.
+
+        state -- game state the action was played from
+        action -- action that cut off
+        ply -- distance from the root
+        depth -- remaining depth of the search at the state
+        """
+        if self.killers:
+            killers = self.killerTable.get(ply, [])
+            if action not in killers:
+                self.killerTable[ply] = [action] + killers[:1]
+        if self.history:
+            self.historyTable[state.actor1][action] += depth * depth
 
 class abTree:
-    def __init__(self, rootState, depth):
-        self.best_move = self.alphabeta(rootState, depth, float("-inf"), float("inf"), rootState.actor1)
+    def __init__(self, rootState, depth, table=None, deadline=None, pv=(), ordering=None, stats=None, pvs=True, window=None, symmetric=True):
+        """ Searches the given state to the given depth.
+
+        rootState -- game state
+        depth -- maximum tree depth
+        table -- optional TranspositionTable shared between searches for the
+                 same player
+        deadline -- optional time.time() value at which the search raises
+                    SearchTimeout
+        pv -- principal variation (list of actions from rootState) of an
+              earlier search, whose moves are searched first
+        ordering -- optional MoveOrdering, otherwise moves are searched left
+                    to right
+        stats -- optional searchstats.SearchStats the nodes, cutoffs, table
+                 lookups and evaluation time are added to, also when the
+                 search times out
+        pvs -- search with principal variation search, otherwise with the
+               original alphabeta; both find the same move and value
+        window -- optional aspiration window (alpha, beta) to search the root
+                  with first. A score outside it is searched again with a
+                  full window and counted in self.researches.
+        symmetric -- key the table by State.canonical_key, so a position and
+                     its mirror image share an entry, instead of State.key
+        """
+        self.table = table
+        self.symmetric = symmetric
+        self.deadline = deadline
+        self.ordering = ordering
+        self.nodes = 0
+        self.cutoffs = 0
+        self.researches = 0
+        if stats != None:
+            self.heuristic = stats.timed('evaluate', self.heuristic)
+        self.pvMoves = dict()
+        s = rootState
+        for action in pv:
+            if s.is_terminal()[0] or not s.is_legal(action):
+                break
+            self.pvMoves[s.key] = action
+            s = s.successor(action)
+        self.pvTable = dict()
+        root = rootState.copy() # searched in place, and left mid-search by a timeout
+        search = self.pvs if pvs else self.alphabeta
+        if stats == None:
+            self.best_move = self.search_root(search, root, depth, window)
+        else:
+            probes, hits = (table.probes, table.hits) if table != None else (0, 0)
+            try:
+                self.best_move = self.search_root(search, root, depth, window)
+            finally:
+                stats.nodes += self.nodes
+                stats.cutoffs += self.cutoffs
+                if table != None:
+                    stats.ttProbes += table.probes - probes
+                    stats.ttHits += table.hits - hits
+            stats.depth(depth)
+        self.pv = self.pvTable[0]
+
+    def search_root(self, search, root, depth, window):
+        """ Returns (value, index of the best action) of the root, searched
+        within the aspiration window if there is one and again with a full
+        window if the value falls outside it.
+
+        search -- self.pvs or self.alphabeta
+        root -- state to search, whose actor the value is for
+        depth -- maximum tree depth
+        window -- (alpha, beta) to try first, or None
+        """
+        if window != None:
+            alpha, beta = window
+            result = search(root, depth, alpha, beta, root.actor1)
+            if alpha < result[0] < beta:
+                return result
+            self.researches += 1
+        return search(root, depth, float("-inf"), float("inf"), root.actor1)
 
     def heuristic(self, state):
         """ Returns the total score at the given state for the current actor.
         Increases/decreases score marginally to favor states with two or three
         consecutive discs adjacent to empty slots (allows a potential win).
+        Scores all 69 windows at once, then adds the window scores line by
+        line in the same order as array_heuristic so the float result is
+        bit-for-bit identical.
 
         state -- game state
         """
-        def check_line(line):
-            score = 0
-            actor = state.actor1
-            otherActor = 2 if actor==1 else 1
-            for i in range(len(line) - 3):
-                window = line[i:i+4]
-                if np.count_nonzero(window == actor) == 3 and np.count_nonzero(window == 0) == 1:  # Three red pieces with an empty slot
-                    score += 0.7
-                elif np.count_nonzero(window == actor) == 2 and np.count_nonzero(window == 0) == 2:  # Two red pieces with two empty slots
-                    score += 0.4
-                elif np.count_nonzero(window == otherActor) == 3 and np.count_nonzero(window == 0) == 1:  # Three black pieces with an empty slot
-                    score -= 0.7
-                elif np.count_nonzero(window == otherActor) == 2 and np.count_nonzero(window == 0) == 2:  # Two black pieces with two empty slots
-                    score -= 0.4
-            return score
-
-        # Evaluate the board in all directions
-        total_score = 0
-        # Check horizontally
-        board = state.board
-        for row in board:
-            total_score += check_line(row)
-        # Check vertically
-        for col in board.T:
-            total_score += check_line(col)
-        # Check diagonally (both directions)
-        for i in range(3):
-            for j in range(4):
-                total_score += check_line(board[i:i+4, j:j+4].diagonal())
-                total_score += check_line(np.fliplr(board[i:i+4, j:j+4]).diagonal())
+        actor = state.actor1
+        otherActor = 2 if actor==1 else 1
+        mine = ((np.uint64(state.discs[actor]) >> WINDOW_BITS) & ONE).sum(axis=1)
+        theirs = ((np.uint64(state.discs[otherActor]) >> WINDOW_BITS) & ONE).sum(axis=1)
+        scores = WINDOW_SCORE[mine, theirs]
+        lines = np.concatenate((np.add.accumulate(scores[:24].reshape(6, 4), axis=1)[:, -1],    # rows
+                                np.add.accumulate(scores[24:45].reshape(7, 3), axis=1)[:, -1], # columns
+                                scores[45:]))                                                  # diagonals
+        return float(np.add.accumulate(lines)[-1])
 
-        return total_score
-    
-    def alphabeta(self, state, depth, alpha, beta, cActor): # do not change passed cActor
+    def alphabeta(self, state, depth, alpha, beta, cActor, ply=0): # do not change passed cActor
         """ Returns the payoff for the best move found by minimax with alpha-
-        beta pruning for the given state reaching the given depth.
+        beta pruning for the given state reaching the given depth. Values
+        are for cActor: a win is worth WIN_SCORE plus the depth left, a loss
+        as much negated, and the heuristic score of the other player's
+        positions is negated. Children are made one at a time in place on
+        the state and unmade after their search, so moves after a cutoff are
+        never generated, and the state is returned unchanged unless the
+        search times out.
 
         state -- game state
         depth -- maximum tree depth
         alpha -- maximizer's best value, initialized to neg inf
         beta -- minimizer's best value, initialized to pos inf
         curr_actor - current actor, Player 1 or Player 2
+        ply -- distance from the root, used to collect the principal variation
         """
+        if self.deadline != None and time.time() > self.deadline:
+            raise SearchTimeout()
+        self.nodes += 1
+        self.pvTable[ply] = []
         isTerm, val = state.is_terminal()
         if isTerm == True:
-            return (val, 0)
+            return ((WIN_SCORE + depth) * (val if cActor == 1 else -val), 0) # payoffs are player 1's
         elif depth == 0:
-            return (self.heuristic(state), 0)
-        
-        reachableStates = []
+            score = self.heuristic(state) # for the player to move
+            return (score if state.actor1 == cActor else -score, 0)
+
         stateactions = state.get_actions()
-        for action in stateactions:
-            reachableStates.append(state.successor(action))
+        alphaOrig, betaOrig = alpha, beta
+        hashMove = None
+        if self.table != None:
+            key, mirrored = self.table_key(state)
+            entry = self.table.probe(key)
+            if entry != None:
+                hashMove = connect4.mirror_action(entry[3]) if mirrored else entry[3]
+            if entry != None and entry[1] >= depth:
+                value, _, flag, _ = entry
+                move = hashMove
+                if flag == EXACT:
+                    return (value, stateactions.index(move))
+                elif flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return (value, stateactions.index(move))
+
+        if self.ordering != None:
+            order = self.ordering.order(state, stateactions, ply, hashMove)
+        else:
+            order = list(range(len(stateactions)))
+        pvMove = self.pvMoves.get(state.key)
+        if pvMove != None:
+            first = stateactions.index(pvMove)
+            order.remove(first)
+            order.insert(0, first)
 
         i = 0
-        maxI = 0 
+        maxI = order[0]
         if state.actor1 == cActor:
             a = float("-inf")
-            while alpha < beta and i < len(reachableStates):
-                ab, _ = self.alphabeta(reachableStates[i], depth-1, alpha, beta, cActor)
+            while alpha < beta and i < len(order):
+                state.make(stateactions[order[i]])
+                ab, _ = self.alphabeta(state, depth-1, alpha, beta, cActor, ply+1)
+                state.unmake()
                 if ab > a:
                     a = ab
-                    maxI = i
+                    maxI = order[i]
+                    self.pvTable[ply] = [stateactions[maxI]] + self.pvTable[ply+1]
                 alpha = max(alpha, a)
+                if alpha >= beta:
+                    self.cut(state, stateactions[order[i]], ply, depth)
                 i += 1
+            self.record(state, depth, a, alphaOrig, betaOrig, stateactions[maxI])
             return (a, maxI)
 
         else:
             b = float("inf")
-            while alpha < beta and i < len(reachableStates):
-                ba, _ = self.alphabeta(reachableStates[i], depth-1, alpha, beta, cActor)
+            while alpha < beta and i < len(order):
+                state.make(stateactions[order[i]])
+                ba, _ = self.alphabeta(state, depth-1, alpha, beta, cActor, ply+1)
+                state.unmake()
                 if ba < b:
                     b = ba
-                    maxI = i
+                    maxI = order[i]
+                    self.pvTable[ply] = [stateactions[maxI]] + self.pvTable[ply+1]
                 beta = min(beta, b)
+                if alpha >= beta:
+                    self.cut(state, stateactions[order[i]], ply, depth)
                 i += 1
+            self.record(state, depth, b, alphaOrig, betaOrig, stateactions[maxI])
             return (b, maxI)
 
+    def pvs(self, state, depth, alpha, beta, cActor, ply=0):
+        """ Returns (value, index of the best action) found by principal
+        variation search in negamax form: values are for the player to move
+        when that is cActor and negated otherwise, so alphabeta's value is
+        value * sign at every node. The first child in search order gets the
+        full window and every later one a null window just above alpha,
+        which only proves it no better; one that fails high is searched
+        again with the full window unless its value is already exact. A
+        value equal to alpha fails low, so the first of equally good moves
+        is kept, as in alphabeta.
 
+        state -- game state, changed in place while its children are searched
+        depth -- maximum tree depth
+        alpha -- lower bound of the window for the player to move
+        beta -- upper bound of the window for the player to move
+        cActor -- player the search is for, whose values are not negated
+        ply -- distance from the root, used to collect the principal variation
+        """
+        if self.deadline != None and time.time() > self.deadline:
+            raise SearchTimeout()
+        self.nodes += 1
+        self.pvTable[ply] = []
+        sign = 1 if state.actor1 == cActor else -1
+        isTerm, val = state.is_terminal()
+        if isTerm == True:
+            return (sign * (WIN_SCORE + depth) * (val if cActor == 1 else -val), 0)
+        elif depth == 0:
+            return (self.heuristic(state), 0) # already for the player to move
+
+        stateactions = state.get_actions()
+        alphaOrig, betaOrig = alpha, beta
+        hashMove = None
+        if self.table != None:
+            key, mirrored = self.table_key(state)
+            entry = self.table.probe(key)
+            if entry != None:
+                hashMove = connect4.mirror_action(entry[3]) if mirrored else entry[3]
+            if entry != None and entry[1] >= depth:
+                value, _, flag, _ = entry
+                move = hashMove
+                value *= sign # entries hold alphabeta's values
+                if flag == EXACT:
+                    return (value, stateactions.index(move))
+                elif (flag == LOWER) == (sign == 1):
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return (value, stateactions.index(move))
 
-def ab_policy(timeAllowed, cActor, depth):
+        if self.ordering != None:
+            order = self.ordering.order(state, stateactions, ply, hashMove)
+        else:
+            order = list(range(len(stateactions)))
+        pvMove = self.pvMoves.get(state.key)
+        if pvMove != None:
+            first = stateactions.index(pvMove)
+            order.remove(first)
+            order.insert(0, first)
+
+        best = float("-inf")
+        maxI = order[0]
+        i = 0
+        while alpha < beta and i < len(order):
+            state.make(stateactions[order[i]])
+            if i == 0:
+                value = -self.pvs(state, depth-1, -beta, -alpha, cActor, ply+1)[0]
+            else:
+                value = -self.pvs(state, depth-1, -math.nextafter(alpha, math.inf), -alpha, cActor, ply+1)[0]
+                # leaves and terminals are exact whatever the window
+                if alpha < value < beta and depth > 1 and not state.is_terminal()[0]:
+                    value = max(value, -self.pvs(state, depth-1, -beta, -value, cActor, ply+1)[0])
+            state.unmake()
+            if value > best:
+                best = value
+                maxI = order[i]
+                self.pvTable[ply] = [stateactions[maxI]] + self.pvTable[ply+1]
+            alpha = max(alpha, best)
+            if alpha >= beta:
+                self.cut(state, stateactions[order[i]], ply, depth)
+            i += 1
+        if sign == 1:
+            self.record(state, depth, best, alphaOrig, betaOrig, stateactions[maxI])
+        else:
+            self.record(state, depth, -best, -betaOrig, -alphaOrig, stateactions[maxI])
+        return (best, maxI)
+
+    def cut(self, state, action, ply, depth):
+        """ Counts a cutoff and passes it on to the move ordering.
+        """
+        self.cutoffs += 1
+        if self.ordering != None:
+            self.ordering.cutoff(state, action, ply, depth)
+
+    def record(self, state, depth, value, alpha, beta, move):
+        """ Stores a search result in the transposition table, if there is
+        one, flagged by where the value fell relative to the original window.
+
+        state -- searched state
+        depth -- remaining depth of the search
+        value -- value found
+        alpha -- alpha the state was searched with
+        beta -- beta the state was searched with
+        move -- best action found
+        """
+        if self.table == None:
+            return
+        if value <= alpha:
+            flag = UPPER
+        elif value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        key, mirrored = self.table_key(state)
+        self.table.store(key, value, depth, flag, connect4.mirror_action(move) if mirrored else move)
+
+    def table_key(self, state):
+        """ Returns (key, mirrored) of the given state in the transposition
+        table. Moves are stored for the orientation the key stands for and
+        translated with connect4.mirror_action when mirrored.
+        """
+        if self.symmetric:
+            return state.canonical_key()
+        return (state.key, False)
+
+
+
+def ab_policy(timeAllowed, cActor, depth=None, tableBytes=1 << 20, ordering=MoveOrdering, stats=None, pvs=True, aspiration=ASPIRATION, book=None):
     """ Takes the allowed CPU time in seconds and returns a function that takes
-    a state and returns the move suggested by running minimax with alpha-beta
-    pruning for that amount of time to the specified depth.
+    a state and returns the move suggested by iterative deepening minimax
+    with alpha-beta pruning. Depths 1, 2, 3... are searched until the time
+    runs out, and the move from the deepest completed search is returned.
+    Depth 1 always completes so there is a move to return.
 
     time_allowed -- maximum CPU time in seconds
-    depth -- maximum tree depth
+    depth -- optional maximum tree depth, None to deepen until time runs out
+    tableBytes -- memory budget of the transposition table kept across moves,
+                  0 to search without one
+    ordering -- function returning a new MoveOrdering for each move, or None
+                to search moves left to right
+    stats -- searchstats.SearchStats counting the nodes, cutoffs, table
+             lookups and evaluation time of every search, or None. Exposed
+             as ab.stats.
+    pvs -- search with principal variation search instead of the original
+           alphabeta, see abTree
+    aspiration -- half-width of the window around the previous depth's score
+                  that each deeper search tries first, None or 0 to always
+                  search with a full window
+    book -- openingbook.OpeningBook whose move is played without searching
+            whenever the position is in it, or None
+
+    The nodes of every completed search are added up in ab.nodes, the
+    depth of the last move's deepest completed search is ab.depth, and the
+    searches repeated because their score fell outside the aspiration
+    window are counted in ab.researches.
     """
+    table = TranspositionTable(tableBytes) if tableBytes > 0 else None
+
     def ab(state):
+        if book != None:
+            move = book.move(state)
+            if move != None:
+                return move
         timeout = time.time() + timeAllowed
         game = connect4.Connect4()
         st = game.State(state.board, state.actor1)
-        
-        while time.time() < timeout:
-            tree = abTree(st, depth)
-        return tree.best_move[1]
+        actions = st.get_actions()
+        moveOrdering = ordering() if ordering != None else None
+
+        tree = abTree(st, 1, table, None, (), moveOrdering, stats, pvs)
+        ab.nodes += tree.nodes
+        d = 2
+        emptyCells = connect4.CELLS - st.moves
+        while (depth == None or d <= depth) and d <= emptyCells:
+            score = tree.best_move[0]
+            window = (score - aspiration, score + aspiration) if aspiration else None
+            try:
+                tree = abTree(st, d, table, timeout, tree.pv, moveOrdering, stats, pvs, window)
+            except SearchTimeout:
+                break
+            ab.nodes += tree.nodes
+            ab.researches += tree.researches
+            d += 1
+        ab.depth = d - 1
+        return actions[tree.best_move[1]]
 
-        
+    ab.nodes = 0
+    ab.depth = 0
+    ab.researches = 0
+    ab.stats = stats
     return ab
@@ -0,0 +1,269 @@
+# File: arraytree.py
+# Date: October 18, 2026
+# Description: Search trees stored as parallel typed arrays (one slot per node)
+# instead of one Python object per node. Node states are not stored; they are
+# regenerated from the root by replaying the moves on the path to a node.
+
+import math
+import time
+import random
+from array import array
+import playout
+
+NO_NODE = -1
+
+# typecode of every per-node array, in bytes per node: 8 + 8 + 4 + 4 + 1 + 1 + 1
+FIELDS = (('visits', 'q'), ('reward', 'd'), ('parent', 'i'), ('firstChild', 'i'), ('action', 'b'), ('numChildren', 'b'), ('expanded', 'b'))
+
+class ArrayTree:
+    def __init__(self, rootState, playouts=1, capacity=1024):
+        """ Creates a tree holding only the root. Node 0 is the root, and the
+        children of a node sit in one block of consecutive slots, reserved
+        when the node is first expanded. Children are expanded in a random
+        order fixed at that point, so expanding the next slot is the same as
+        picking a random unexpanded action.
+
+        rootState -- state at the root
+        playouts -- random playouts run together to evaluate each new node
+        capacity -- number of node slots allocated up front; doubles when full
+        """
+        self.rootState = rootState
+        self.playouts = playouts
+        self.capacity = capacity
+        for name, typecode in FIELDS:
+            setattr(self, name, array(typecode, bytes(array(typecode).itemsize * capacity)))
+        self.size = 0 # slots in use, including reserved but unexpanded children
+        self.nodes = 1 # expanded nodes, including the root
+        self.stats = None # searchstats.SearchStats timing each iteration, if set
+        self.add_node(NO_NODE, 0)
+
+    def add_node(self, parent, action):
+        """ Appends a node with no statistics and returns its index.
+
+        parent -- index of the parent node, or NO_NODE for the root
+        action -- action that leads from the parent to the node
+        """
+        if self.size == self.capacity:
+            for name, typecode in FIELDS:
+                getattr(self, name).extend(array(typecode, bytes(array(typecode).itemsize * self.capacity)))
+            self.capacity *= 2
+        n = self.size
+        self.size += 1
+        self.visits[n] = 0
+        self.reward[n] = 0
+        self.parent[n] = parent
+        self.firstChild[n] = NO_NODE
+        self.action[n] = action
+        self.numChildren[n] = 0
+        self.expanded[n] = 0
+        return n
+
+    def children(self, n):
+        """ Returns the indices of the expanded children of the given node.
+
+        n -- node index
+        """
+        first = self.firstChild[n]
+        return range(first, first + self.expanded[n])
+
+    def select(self, n, state):
+        """ Returns a uniformly random expanded child of the given node.
+
+        n -- index of a fully expanded node
+        state -- state at that node
+        """
+        return self.firstChild[n] + random.randrange(self.expanded[n])
+
+    def traverse2(self):
+        """ Traverses the tree, expanding nodes based on the actions available
+        from that node. Returns (node, state) for a child from expansion or a
+        terminal.
+        """
+        n, s = self.descend()
+        return self.expand(n, s)
+
+    def descend(self):
+        """ Follows the selection rule down from the root and returns (node,
+        state) for the first node that is terminal or still has unexpanded
+        children.
+        """
+        n, s = 0, self.rootState
+        while s.is_terminal()[0] == False and self.firstChild[n] != NO_NODE and self.expanded[n] == self.numChildren[n]:
+            n = self.select(n, s)
+            s = s.successor(self.action[n])
+        return (n, s)
+
+    def expand(self, n, s):
+        """ Expands the next child of the given node, reserving its block of
+        children first if needed, and returns (child, state). Returns the
+        node itself if it is terminal.
+
+        n -- node index
+        s -- state at that node
+        """
+        if s.is_terminal()[0]:
+            return (n, s)
+        if self.firstChild[n] == NO_NODE:
+            actions = s.get_actions()
+            random.shuffle(actions)
+            self.firstChild[n] = self.size
+            self.numChildren[n] = len(actions)
+            for action in actions:
+                self.add_node(n, action)
+        child = self.firstChild[n] + self.expanded[n]
+        self.expanded[n] += 1
+        self.nodes += 1
+        return (child, s.successor(self.action[child]))
+
+    def simulate(self, state):
+        """ Simulates a random playout to a terminal state from the given state.
+        Returns the payoff to the player at the terminal position. With more
+        than one playout, returns the mean payoff of a batch of playouts.
+        """
+        if self.playouts > 1:
+            if self.stats != None:
+                self.stats.playouts += self.playouts
+            p1Wins, _, p2Wins = playout.batch_playouts(state, self.playouts)
+            return (p1Wins - p2Wins) / self.playouts
+        s = state
+        while s.is_terminal()[0] == False:
+            s = s.successor(random.choice(s.get_actions()))
+        if self.stats != None:
+            self.stats.playouts += 1
+            self.stats.playoutMoves += s.moves - state.moves
+        return s.payoff()
+
+    def update(self, n, payoff):
+        """ Back propagates payoff up the tree by updating the total reward and
+        number of visits.
+        """
+        while self.parent[n] != NO_NODE:
+            self.reward[n] += payoff
+            self.visits[n] += 1
+            n = self.parent[n]
+        self.visits[n] += 1
+
+    def iterate(self):
+        """ Runs one selection, expansion, simulation and backpropagation.
+        """
+        if self.stats != None:
+            self.timed_iteration()
+            return
+        n, s = self.traverse2()
+        self.update(n, self.simulate(s))
+
+    def timed_iteration(self):
+        """ Runs the same iteration as iterate, timing every phase into
+        self.stats and counting the depth reached.
+        """
+        clock = time.perf_counter
+        start = clock()
+        n, s = self.descend()
+        selected = clock()
+        child, sp = self.expand(n, s)
+        expanded = clock()
+        payoff = self.simulate(sp)
+        simulated = clock()
+        self.update(child, payoff)
+        stats = self.stats
+        stats.backprop += clock() - simulated
+        stats.simulate += simulated - expanded
+        stats.expand += expanded - selected
+        stats.select += selected - start
+        stats.iterations += 1
+        if child != n:
+            stats.expansions += 1
+        stats.depth(sp.moves - self.rootState.moves)
+
+    def root_stats(self):
+        """ Returns a dict mapping each expanded action at the root to
+        [visits, total reward], in the order the actions were expanded.
+        """
+        return {self.action[c]: [self.visits[c], self.reward[c]] for c in self.children(0)}
+
+    def find_subtree(self, state):
+        """ Returns a new tree holding the subtree of the node for the given
+        state, searched among the children and grandchildren of the root (the
+        position after our move and the opponent's reply), or None if the
+        state was never expanded. Only the subtree is copied, so the rest of
+        this tree is freed with it.
+
+        state -- current state
+        """
+        for child in self.children(0):
+            s = self.rootState.successor(self.action[child])
+            if s == state:
+                return self.subtree(child, s)
+            for grandchild in self.children(child):
+                sp = s.successor(self.action[grandchild])
+                if sp == state:
+                    return self.subtree(grandchild, sp)
+        return None
+
+    def subtree(self, n, state):
+        """ Returns a new tree rooted at node n, copying its statistics and
+        every block of children below it.
+
+        n -- node index
+        state -- state at that node
+        """
+        tree = self.__class__(state, self.playouts)
+        tree.stats = self.stats
+        tree.visits[0] = self.visits[n]
+        tree.reward[0] = self.reward[n]
+        stack = [(n, 0)]
+        while stack:
+            old, new = stack.pop()
+            first = self.firstChild[old]
+            if first == NO_NODE:
+                continue
+            tree.firstChild[new] = tree.size
+            tree.numChildren[new] = self.numChildren[old]
+            tree.expanded[new] = self.expanded[old]
+            for i in range(self.numChildren[old]):
+                c = tree.add_node(new, self.action[first + i])
+                tree.visits[c] = self.visits[first + i]
+                tree.reward[c] = self.reward[first + i]
+                if i < self.expanded[old]:
+                    tree.nodes += 1
+                    stack.append((first + i, c))
+        return tree
+
+    def bytes_per_node(self):
+        """ Returns the bytes of node storage per expanded node, counting the
+        reserved child slots and unused capacity of the arrays.
+        """
+        total = sum(getattr(self, name).itemsize * self.capacity for name, _ in FIELDS)
+        return total / self.nodes
+
+class UCTArrayTree(ArrayTree):
+    def select(self, n, state):
+        """ Returns the child of the given node with the maximum UCB value, as
+        in uct0Tree.select. If there are multiple children sharing the maximum
+        value, one of them is randomly selected to be returned.
+
+        n -- index of a fully expanded node
+        state -- state at that node
+        """
+        ucb, maxUCB, minUCB = 0, float('-inf'), float('inf')
+        returnChild = []
+        logVisits = math.log(self.visits[n])
+        # if p1
+        if state.actor() == 1:
+            for child in self.children(n):
+                ucb = (self.reward[child]/self.visits[child]) + math.sqrt(2 * logVisits / self.visits[child])
+                if ucb > maxUCB:
+                    maxUCB = ucb
+                    returnChild = [child]
+                elif ucb == maxUCB:
+                    returnChild.append(child)
+        # if p2
+        else:
+            for child in self.children(n):
+                ucb = (self.reward[child]/self.visits[child]) - math.sqrt(2 * logVisits / self.visits[child])
+                if ucb < minUCB:
+                    minUCB = ucb
+                    returnChild = [child]
+                elif ucb == minUCB:
+                    returnChild.append(child)
+        return random.choice(returnChild)
@@ -0,0 +1,669 @@
+# File: benchmark.py
+# Date: October 18, 2026
+# Description: Micro-benchmarks for the Connect 4 engine. Run
+# python3 benchmark.py to run all of them, or name one e.g.
+# python3 benchmark.py playouts
+
+import os
+import sys
+import math
+import time
+import random
+import connect4
+import uct1
+import uct2
+import alphabeta
+import playout
+import mcts
+import uct0
+import nodetree
+import rootparallel
+import arraytree
+import solver
+import earlystop
+import tempfile
+import openingbook
+import selfplay
+import tournament
+import numpy as np
+from searchstats import SearchStats
+from transposition import TranspositionTable
+
+def random_playout(state):
+    """ Plays uniformly random moves from the given state until the game ends.
+    Returns the payoff at the terminal position.
+
+    state -- starting state
+    """
+    s = state
+    while s.is_terminal()[0] == False:
+        s = s.successor(random.choice(s.get_actions()))
+    return s.payoff()
+
+def sample_positions(count, minPlies, maxPlies, seed=0):
+    """ Returns a fixed list of non-terminal positions reached by random
+    moves, the same for every run with the same seed.
+
+    count -- number of positions
+    minPlies -- fewest random moves played from the initial state
+    maxPlies -- most random moves played from the initial state
+    seed -- random seed
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        s = connect4.Connect4().initial_state()
+        for _ in range(rng.randint(minPlies, maxPlies)):
+            s = s.successor(rng.choice(s.get_actions()))
+            if s.is_terminal()[0]:
+                break
+        if not s.is_terminal()[0]:
+            positions.append(s)
+    return positions
+
+def playouts_per_second(game, seconds):
+    """ Returns the number of random playouts from the initial state of the
+    given game completed per second.
+
+    game -- Connect4 or Connect4Array
+    seconds -- time spent measuring
+    """
+    random.seed(0)
+    root = game.initial_state()
+    count = 0
+    start = time.time()
+    while time.time() - start < seconds:
+        random_playout(root)
+        count += 1
+    return count / (time.time() - start)
+
+def bench_playouts(seconds=2.0):
+    """ Compares random playouts per second of the bitboard and NumPy states.
+    """
+    bitboard = playouts_per_second(connect4.Connect4(), seconds)
+    array = playouts_per_second(connect4.Connect4Array(), seconds)
+    print("PLAYOUTS/SEC - BITBOARD: ", round(bitboard, 1), "; NUMPY: ", round(array, 1), "; SPEEDUP: ", round(bitboard / array, 2))
+
+def bench_transpositions(iterations=3000):
+    """ Grows one uct1 and one uct2 table from the initial state and reports
+    how often an expansion reached a position already in the table.
+    """
+    for name, implicit in (('UCT1', uct1.uct1implicit), ('UCT2', uct2.uct2implicit)):
+        random.seed(0)
+        root = connect4.Connect4().initial_state()
+        tree = implicit(root)
+        tree.step(iterations)
+        print(name, "TRANSPOSITIONS - ITERATIONS: ", iterations, "; TABLE SIZE: ", len(tree.stateList), "; HITS: ", tree.hits, "; HIT RATE: ", round(tree.hit_rate(), 4))
+
+def bench_alphabeta_tt(depth=4, count=20, tableBytes=1 << 20):
+    """ Compares nodes searched by alphabeta with and without a transposition
+    table on a fixed set of positions.
+    """
+    plain, cached, same = 0, 0, 0
+    for pos in sample_positions(count, 4, 12):
+        without = alphabeta.abTree(pos, depth)
+        tree = alphabeta.abTree(pos, depth, TranspositionTable(tableBytes))
+        plain += without.nodes
+        cached += tree.nodes
+        same += tree.best_move[0] == without.best_move[0]
+    print("ALPHABETA NODES AT DEPTH", depth, "- WITHOUT TABLE: ", plain, "; WITH TABLE: ", cached, "; RATIO: ", round(cached / plain, 3), "; SAME VALUE: ", same, "/", count)
+
+def bench_alphabeta_ordering(depth=5, count=10):
+    """ Compares nodes, cutoffs and effective branching factor of iterative
+    deepening alphabeta under different move orderings.
+    """
+    positions = sample_positions(count, 4, 12)
+    configs = [
+        ('LEFT TO RIGHT', lambda: None, False),
+        ('CENTER', lambda: alphabeta.MoveOrdering(killers=False, history=False, hashMove=False), False),
+        ('CENTER+KILLERS+HISTORY', lambda: alphabeta.MoveOrdering(hashMove=False), False),
+        ('ALL+HASH MOVE', alphabeta.MoveOrdering, True),
+    ]
+    values = None
+    for name, ordering, useTable in configs:
+        nodes, cutoffs, found = 0, 0, []
+        for pos in positions:
+            moveOrdering = ordering()
+            table = TranspositionTable(1 << 20) if useTable else None
+            pv = ()
+            for d in range(1, depth + 1):
+                tree = alphabeta.abTree(pos, d, table, None, pv, moveOrdering)
+                pv = tree.pv
+                nodes += tree.nodes
+                cutoffs += tree.cutoffs
+            found.append(tree.best_move[0])
+        if values == None:
+            values = found
+        same = sum(1 for a, b in zip(values, found) if a == b)
+        ebf = (nodes / count) ** (1 / depth)
+        print("ALPHABETA", name, "TO DEPTH", depth, "- NODES: ", nodes, "; CUTOFFS: ", cutoffs, "; EFFECTIVE BRANCHING: ", round(ebf, 3), "; SAME VALUE: ", same, "/", count)
+
+def bench_heuristic(seconds=1.0):
+    """ Compares evaluations per second of the precomputed-window heuristic
+    and the original array heuristic, and checks they score alike.
+    """
+    positions = sample_positions(200, 4, 30)
+    tree = alphabeta.abTree.__new__(alphabeta.abTree) # only the heuristic is needed
+    mismatches = sum(1 for pos in positions if tree.heuristic(pos) != alphabeta.array_heuristic(pos))
+    rates = []
+    for evaluate in (tree.heuristic, alphabeta.array_heuristic):
+        count = 0
+        start = time.time()
+        while time.time() - start < seconds:
+            for pos in positions:
+                evaluate(pos)
+            count += len(positions)
+        rates.append(count / (time.time() - start))
+    print("HEURISTIC EVALS/SEC - WINDOWS: ", round(rates[0], 1), "; ARRAY: ", round(rates[1], 1), "; SPEEDUP: ", round(rates[0] / rates[1], 2), "; MISMATCHES: ", mismatches)
+
+def bench_batch_playouts(repeats=50):
+    """ Compares the time to evaluate a leaf with N batched playouts against
+    N playouts run one after another.
+    """
+    playout.seed(0)
+    positions = sample_positions(repeats, 2, 10)
+    for n in (1, 8, 32, 128):
+        start = time.time()
+        for pos in positions:
+            playout.batch_playouts(pos, n)
+        batched = (time.time() - start) / repeats
+        start = time.time()
+        for pos in positions:
+            for _ in range(n):
+                random_playout(pos)
+        serial = (time.time() - start) / repeats
+        print("PLAYOUTS PER LEAF: ", n, "; BATCHED MS/LEAF: ", round(batched * 1000, 3), "; SERIAL MS/LEAF: ", round(serial * 1000, 3), "; SPEEDUP: ", round(serial / batched, 2))
+
+def bench_root_parallel(seconds=0.5):
+    """ Reports root visits per move of root-parallel mcts and uct0 with
+    1, 2, 4 and 8 worker processes. The pools are started before timing.
+    """
+    print("CPU CORES: ", os.cpu_count())
+    root = connect4.Connect4().initial_state()
+    for name, treeClass in (('MCTS', mcts.mctsTree), ('UCT0', uct0.uct0Tree)):
+        base = None
+        for workers in (1, 2, 4, 8):
+            if workers == 1:
+                stats = nodetree.grow_tree(root, time.time() + seconds, 0, treeClass, 1, False)
+            else:
+                rootparallel.get_pool(workers)
+                stats = rootparallel.search(nodetree.grow_tree, root, time.time() + seconds, workers, treeClass, 1, False)
+            visits = sum(v for v, _ in stats.values())
+            base = base or visits
+            print(name, "ROOT-PARALLEL WORKERS: ", workers, "; ROOT VISITS: ", visits, "; SCALING: ", round(visits / base, 2))
+    rootparallel.close_pools()
+
+def node_bytes(node):
+    """ Returns the approximate memory held by one object tree node: the
+    node, its attribute and children dicts, and its state with the state's
+    own lists, bitboards and cached terminal tuple.
+
+    node -- nodetree.Node
+    """
+    st = node.state
+    total = sys.getsizeof(node) + sys.getsizeof(node.__dict__) + sys.getsizeof(node.children)
+    total += sys.getsizeof(st) + sys.getsizeof(st.__dict__) + sys.getsizeof(st.discs) + sys.getsizeof(st.heights)
+    total += sum(sys.getsizeof(bb) for bb in st.discs) + sys.getsizeof(st.key)
+    if st._terminal != None:
+        total += sys.getsizeof(st._terminal)
+    return total
+
+def bench_tree_memory(iterations=5000):
+    """ Compares bytes per node and iterations per second of the object
+    trees and the array-backed trees.
+    """
+    root = connect4.Connect4().initial_state()
+    for name, tree in (('MCTS', mcts.mctsTree), ('UCT0', uct0.uct0Tree)):
+        random.seed(0)
+        rootNode = nodetree.Node(None, root)
+        start = time.time()
+        for _ in range(iterations):
+            tree(rootNode, 1)
+        objectRate = iterations / (time.time() - start)
+        nodes, total, stack = 0, 0, [rootNode]
+        while stack:
+            n = stack.pop()
+            nodes += 1
+            total += node_bytes(n)
+            stack.extend(n.children.values())
+        random.seed(0)
+        arrays = tree.compactTree(root)
+        start = time.time()
+        for _ in range(iterations):
+            arrays.iterate()
+        arrayRate = iterations / (time.time() - start)
+        print(name, "OBJECT TREE - NODES: ", nodes, "; BYTES/NODE: ", round(total / nodes, 1), "; ITERATIONS/SEC: ", round(objectRate, 1))
+        print(name, "ARRAY TREE - NODES: ", arrays.nodes, "; BYTES/NODE: ", round(arrays.bytes_per_node(), 1), "; ITERATIONS/SEC: ", round(arrayRate, 1))
+
+def bench_tree_reuse(timeAllowed=0.05, games=4):
+    """ Plays mcts against uct0 with tree reuse and reports the root visits
+    carried over from the previous move, per move.
+    """
+    random.seed(0)
+    makers = {'MCTS': mcts.mcts_policy, 'UCT0': uct0.uct0_policy}
+    carried = {name: [] for name in makers}
+    for g in range(games):
+        names = ['MCTS', 'UCT0'] if g % 2 == 0 else ['UCT0', 'MCTS']
+        policies = [makers[name](timeAllowed, actor) for actor, name in enumerate(names, 1)]
+        s = connect4.Connect4().initial_state()
+        while not s.is_terminal()[0]:
+            s = s.successor(policies[s.actor1 - 1](s))
+        for name, policy in zip(names, policies):
+            carried[name].extend(policy.carriedVisits[1:])
+    for name, visits in carried.items():
+        print(name, "TREE REUSE - MOVES: ", len(visits), "; MEAN VISITS CARRIED OVER: ", round(sum(visits) / max(1, len(visits)), 1), "; MAX: ", max(visits, default=0))
+
+def bench_uct_throughput(seconds=1.0):
+    """ Compares iterations per second of one persistent uct1/uct2 search
+    against building a new table for every iteration, as the policies used to.
+    """
+    root = connect4.Connect4().initial_state()
+    for name, implicit in (('UCT1', uct1.uct1implicit), ('UCT2', uct2.uct2implicit)):
+        random.seed(0)
+        count = 0
+        start = time.time()
+        while time.time() - start < seconds:
+            implicit(root).step(1)
+            count += 1
+        fresh = count / (time.time() - start)
+        tree = implicit(root)
+        tree.run_until(time.time() + seconds)
+        print(name, "ITERATIONS/SEC - PERSISTENT: ", round(tree.iterations_per_second(), 1), "; NEW TABLE EACH ITERATION: ", round(fresh, 1), "; ROOT VISITS: ", tree.stateList[root][1])
+
+def ucb_by_successor(tree, parentState):
+    """ The uct2 selection rule as it was before entries referenced their
+    children: every child's entry is found by building its state and
+    looking it up, in the orientation the table keeps it under.
+    """
+    childIndexList, best = [], None
+    childVisitList = tree.stateList[parentState][0]
+    actions = parentState.get_actions()
+    sign = 1 if parentState.actor() == 1 else -1
+    for i in range(len(childVisitList)):
+        child = tree.stateList[tree.canonical(parentState.successor(actions[i]))]
+        ucb = sign * (child[3] / child[1]) + math.sqrt(2 * math.log(tree.stateList[parentState][1]) / childVisitList[i])
+        if best == None or ucb > best:
+            best, childIndexList = ucb, [i]
+        elif ucb == best:
+            childIndexList.append(i)
+    return random.choice(childIndexList)
+
+def bench_uct2_selection(iterations=3000, seconds=1.0):
+    """ Compares uct2 selections per second reading the child entries each
+    entry references against building and looking up every child state.
+    Both apply the same rule to the same values.
+    """
+    random.seed(0)
+    tree = uct2.uct2implicit(connect4.Connect4().initial_state())
+    tree.step(iterations)
+    parents = [st for st, vals in tree.stateList.items() if vals[2] == False and len(vals[0]) > 0]
+    rates = []
+    for select in (tree.ucb, lambda st: ucb_by_successor(tree, st)):
+        count = 0
+        start = time.time()
+        while time.time() - start < seconds:
+            for st in parents:
+                select(st)
+            count += len(parents)
+        rates.append(count / (time.time() - start))
+    print("UCT2 SELECTIONS/SEC - DIRECT REFERENCES: ", round(rates[0], 1), "; SUCCESSOR LOOKUP: ", round(rates[1], 1), "; SPEEDUP: ", round(rates[0] / rates[1], 2))
+
+def bench_endgame_solver(count=10, games=4, timeAllowed=0.05):
+    """ Reports the solver's time and nodes per position at increasing numbers
+    of empty cells, then how often uct0 handing over at 16 empty cells
+    finished its solves in time.
+    """
+    for empty in (8, 12, 16, 20, 24):
+        search = solver.Solver()
+        for st in sample_positions(count, connect4.CELLS - empty, connect4.CELLS - empty, seed=empty):
+            search.best_move(st)
+        print("EMPTY CELLS: ", empty, "; MEAN SOLVE SECS: ", round(search.mean_solve_time(), 5), "; MAX SOLVE SECS: ", round(search.maxSolveTime, 5), "; NODES/POSITION: ", round(search.nodes / count, 1))
+    random.seed(0)
+    solved, timeouts, solveTime = 0, 0, 0.0
+    for _ in range(games):
+        policy = uct0.uct0_policy(timeAllowed, 1, solveBelow=16)
+        s = connect4.Connect4().initial_state()
+        while not s.is_terminal()[0]:
+            s = s.successor(policy(s))
+        solved += policy.solver.solved
+        timeouts += policy.solver.timeouts
+        solveTime += policy.solver.solveTime
+    print("UCT0 HAND-OFF AT 16 EMPTY - SOLVED: ", solved, "; TIMED OUT: ", timeouts, "; MEAN SOLVE SECS: ", round(solveTime / solved if solved else 0.0, 5))
+
+def bench_mcts_solver(timeAllowed=0.05, games=3):
+    """ Plays mcts and uct0 against themselves and reports how many moves
+    stopped early on a proven root and the iterations saved per move.
+    """
+    random.seed(0)
+    for name, make in (('MCTS', mcts.mcts_policy), ('UCT0', uct0.uct0_policy)):
+        saved = []
+        for _ in range(games):
+            policies = {1: make(timeAllowed, 1), 2: make(timeAllowed, 2)}
+            s = connect4.Connect4().initial_state()
+            while not s.is_terminal()[0]:
+                s = s.successor(policies[s.actor()](s))
+            saved += policies[1].savedIterations + policies[2].savedIterations
+        proven = [x for x in saved if x > 0]
+        print(name, "- MOVES: ", len(saved), "; PROVEN EARLY: ", len(proven), "; ITERATIONS SAVED/MOVE: ", round(sum(saved) / len(saved), 1), "; PER PROVEN MOVE: ", round(sum(proven) / len(proven) if proven else 0, 1))
+
+def bench_early_stop(timeAllowed=0.05, games=2):
+    """ Plays each tree search policy against itself with each early-stop rule
+    in audit mode, and reports the share of moves stopped early, the time
+    saved per move and how often stopping early changed the move.
+    """
+    random.seed(0)
+    policies = (('MCTS', mcts.mcts_policy), ('UCT0', uct0.uct0_policy), ('UCT1', uct1.uct1_policy), ('UCT2', uct2.uct2_policy))
+    for ruleName, rule in (('VISIT MARGIN', earlystop.VisitMargin), ('CONFIDENCE BOUND', earlystop.ConfidenceBound)):
+        for name, make in policies:
+            stop = rule(audit=True)
+            for _ in range(games):
+                players = {1: make(timeAllowed, 1, earlyStop=stop), 2: make(timeAllowed, 2, earlyStop=stop)}
+                s = connect4.Connect4().initial_state()
+                while not s.is_terminal()[0]:
+                    s = s.successor(players[s.actor()](s))
+            print(ruleName, "-", name, "- STOPPED: ", stop.stops, "/", stop.moves, "; SECS SAVED/MOVE: ", round(stop.timeSaved / stop.moves, 5), "; MOVE CHANGED: ", round(stop.change_rate(), 3))
+
+class CopyingAbTree(alphabeta.abTree):
+    """ alphabeta.abTree whose alphabeta builds a copy of every child with
+    State.successor before searching the first, as the search did before
+    make and unmake. Values, table, move ordering and cutoffs are those of
+    abTree, so the two search the same tree and differ only in how the
+    children are made.
+    """
+
+    def alphabeta(self, state, depth, alpha, beta, cActor, ply=0):
+        """ abTree.alphabeta with every child copied up front instead of made
+        and unmade in place.
+        """
+        self.nodes += 1
+        self.pvTable[ply] = []
+        isTerm, val = state.is_terminal()
+        if isTerm == True:
+            return ((alphabeta.WIN_SCORE + depth) * (val if cActor == 1 else -val), 0)
+        elif depth == 0:
+            score = self.heuristic(state)
+            return (score if state.actor1 == cActor else -score, 0)
+        stateactions = state.get_actions()
+        alphaOrig, betaOrig = alpha, beta
+        hashMove = None
+        if self.table != None:
+            key, mirrored = self.table_key(state)
+            entry = self.table.probe(key)
+            if entry != None:
+                hashMove = connect4.mirror_action(entry[3]) if mirrored else entry[3]
+            if entry != None and entry[1] >= depth:
+                value, _, flag, _ = entry
+                move = hashMove
+                if flag == alphabeta.EXACT:
+                    return (value, stateactions.index(move))
+                elif flag == alphabeta.LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return (value, stateactions.index(move))
+        order = self.ordering.order(state, stateactions, ply, hashMove)
+        pvMove = self.pvMoves.get(state.key)
+        if pvMove != None:
+            order.remove(stateactions.index(pvMove))
+            order.insert(0, stateactions.index(pvMove))
+        reachableStates = [state.successor(stateactions[j]) for j in order]
+        sign = 1 if state.actor1 == cActor else -1
+        best, maxI, i = float("-inf"), order[0], 0
+        while alpha < beta and i < len(reachableStates):
+            value, _ = self.alphabeta(reachableStates[i], depth-1, alpha, beta, cActor, ply+1)
+            if sign * value > best:
+                best = sign * value
+                maxI = order[i]
+                self.pvTable[ply] = [stateactions[maxI]] + self.pvTable[ply+1]
+            if sign == 1:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                self.cut(state, stateactions[order[i]], ply, depth)
+            i += 1
+        self.record(state, depth, sign * best, alphaOrig, betaOrig, stateactions[maxI])
+        return (sign * best, maxI)
+
+def bench_make_unmake(depths=(4, 5, 6, 7, 8), count=3):
+    """ Compares alphabeta.abTree, which makes and unmakes each child in
+    place, with CopyingAbTree, which copies every child before searching
+    the first. Both use the table and move ordering of the policy, without
+    PVS. Prints the states allocated and the nodes per second of each at
+    every depth; the node counts are the same.
+    """
+    positions = sample_positions(count, 6, 12, seed=8)
+    State = connect4.Connect4.State
+    fromBitboards = State.from_bitboards.__func__
+    allocated = 0
+    def counting(cls, *args):
+        nonlocal allocated
+        allocated += 1
+        return fromBitboards(cls, *args)
+    for depth in depths:
+        results = []
+        for tree in (CopyingAbTree, alphabeta.abTree):
+            State.from_bitboards = classmethod(counting)
+            allocated = 0
+            for st in positions:
+                tree(st, depth, TranspositionTable(1 << 20), None, (), alphabeta.MoveOrdering(), pvs=False)
+            State.from_bitboards = classmethod(fromBitboards)
+            nodes = 0
+            start = time.perf_counter()
+            for st in positions:
+                nodes += tree(st, depth, TranspositionTable(1 << 20), None, (), alphabeta.MoveOrdering(), pvs=False).nodes
+            results.append((allocated, nodes / (time.perf_counter() - start), nodes))
+        (copyStates, copyRate, nodes), (madeStates, madeRate, _) = results
+        print("DEPTH: ", depth, "; NODES: ", nodes, "; STATES ALLOCATED - COPIES: ", copyStates, "; MAKE/UNMAKE: ", madeStates, "; NODES/SEC - COPIES: ", round(copyRate, 1), "; MAKE/UNMAKE: ", round(madeRate, 1), "; SPEEDUP: ", round(madeRate / copyRate, 2))
+
+def bench_pvs(depths=(2, 3, 4, 5, 6), count=40, seed=11):
+    """ Checks principal variation search against the original alphabeta on
+    a regression set of positions, each searched to a fixed depth with a
+    new table: counts the positions where the best move or value differ,
+    which must be none, and compares their nodes. Then compares the nodes
+    of iterative deepening to the same depths with plain alphabeta, PVS,
+    and PVS with aspiration windows.
+    """
+    positions = [st for st in sample_positions(count, 2, 34, seed) if not st.is_terminal()[0]]
+    for depth in depths:
+        mismatches, nodes = 0, [0, 0]
+        for st in positions:
+            trees = [alphabeta.abTree(st, depth, TranspositionTable(1 << 20), None, (), alphabeta.MoveOrdering(), pvs=pvs) for pvs in (False, True)]
+            if trees[0].best_move != trees[1].best_move:
+                mismatches += 1
+            nodes[0] += trees[0].nodes
+            nodes[1] += trees[1].nodes
+        print("DEPTH: ", depth, "; POSITIONS: ", len(positions), "; MOVE OR VALUE DIFFERS: ", mismatches, "; NODES - ALPHABETA: ", nodes[0], "; PVS: ", nodes[1], "; RATIO: ", round(nodes[1] / nodes[0], 3))
+    for depth in depths:
+        results = []
+        for pvs, aspiration in ((False, None), (True, None), (True, alphabeta.ASPIRATION)):
+            nodes, researches = 0, 0
+            for st in positions:
+                policy = alphabeta.ab_policy(float('inf'), st.actor(), depth, pvs=pvs, aspiration=aspiration)
+                policy(st)
+                nodes += policy.nodes
+                researches += policy.researches
+            results.append((nodes, researches))
+        print("ITERATIVE DEEPENING TO ", depth, "- NODES - ALPHABETA: ", results[0][0], "; PVS: ", results[1][0], "; PVS WITH ASPIRATION: ", results[2][0], "; ASPIRATION RE-SEARCHES: ", results[2][1])
+
+def bench_symmetry(maxPlies=6, iterations=5000, depth=6, count=10):
+    """ Measures what keying position tables by State.canonical_key saves:
+    distinct positions at each ply of the opening by Zobrist key and by
+    canonical key, then table entries, the positions they cover, hit rate
+    and iterations per second of uct1 and uct2 from the opening and from middlegame positions, and
+    table hit rate and nodes of alphabeta deepening to the given depth,
+    each with and without symmetry.
+    """
+    layer = [connect4.Connect4().initial_state()]
+    for ply in range(1, maxPlies + 1):
+        layer = list({st.key: st for st in (s.successor(a) for s in layer for a in s.get_actions())}.values())
+        canonical = len({st.canonical_key()[0] for st in layer})
+        print("PLY: ", ply, "; POSITIONS: ", len(layer), "; CANONICAL: ", canonical, "; RATIO: ", round(canonical / len(layer), 3))
+    phases = (('OPENING', [connect4.Connect4().initial_state()]), ('MIDDLEGAME', sample_positions(count, 8, 16, seed=4)))
+    for phase, positions in phases:
+        for name, implicit in (('UCT1', uct1.uct1implicit), ('UCT2', uct2.uct2implicit)):
+            results = []
+            for symmetric in (False, True):
+                random.seed(0)
+                entries, covered, lookups, hits, secs = 0, 0, 0, 0, 0.0
+                for st in positions:
+                    tree = implicit(st, symmetric=symmetric)
+                    start = time.perf_counter()
+                    tree.step(iterations // len(positions))
+                    secs += time.perf_counter() - start
+                    entries += len(tree.stateList)
+                    # an entry of a symmetric table also stands for the mirror image
+                    covered += sum(2 if symmetric and s.mirrored() != s else 1 for s in tree.stateList)
+                    lookups += tree.lookups
+                    hits += tree.hits
+                results.append((entries, covered, hits / lookups, iterations / secs))
+            (plainEntries, plainCovered, plainRate, plainSpeed), (symEntries, symCovered, symRate, symSpeed) = results
+            print(phase, name, "- TABLE ENTRIES: ", plainEntries, "->", symEntries, "; POSITIONS COVERED: ", plainCovered, "->", symCovered, "; ENTRIES/POSITION: ", round(plainEntries / plainCovered, 3), "->", round(symEntries / symCovered, 3), "; HIT RATE: ", round(plainRate, 4), "->", round(symRate, 4), "; ITERATIONS/SEC: ", round(plainSpeed, 1), "->", round(symSpeed, 1))
+        results = []
+        for symmetric in (False, True):
+            nodes, probes, hits = 0, 0, 0
+            for st in positions:
+                table = TranspositionTable(1 << 22)
+                tree = alphabeta.abTree(st, 1, table, symmetric=symmetric)
+                for d in range(2, depth + 1):
+                    tree = alphabeta.abTree(st, d, table, None, tree.pv, alphabeta.MoveOrdering(), symmetric=symmetric)
+                    nodes += tree.nodes
+                probes += table.probes
+                hits += table.hits
+            results.append((nodes, hits / probes))
+        print(phase, "ALPHABETA TO DEPTH ", depth, "- NODES: ", results[0][0], "->", results[1][0], "; HIT RATE: ", round(results[0][1], 4), "->", round(results[1][1], 4))
+
+def bench_instrumentation(iterations=3000, depth=4, count=10, repeats=3):
+    """ Runs the same seeded searches with and without a SearchStats and
+    reports the best time of each over the repeats, so the cost of
+    instrumentation shows, along with the counters of one instrumented run.
+    """
+    root = connect4.Connect4().initial_state()
+    def mcts_search(stats):
+        tree = nodetree.Node(None, root)
+        for _ in range(iterations):
+            mcts.mctsTree(tree, 1, stats)
+    def uct0_search(stats):
+        tree = nodetree.Node(None, root)
+        for _ in range(iterations):
+            uct0.uct0Tree(tree, 1, stats)
+    def compact_search(stats):
+        tree = arraytree.ArrayTree(root)
+        tree.stats = stats
+        for _ in range(iterations):
+            tree.iterate()
+    positions = sample_positions(count, 4, 20)
+    def ab_search(stats):
+        for st in positions:
+            alphabeta.abTree(st, depth, TranspositionTable(1 << 20), None, (), alphabeta.MoveOrdering(), stats)
+    searches = (('MCTS', mcts_search), ('UCT0', uct0_search), ('ARRAY TREE', compact_search),
+                ('UCT1', lambda stats: uct1.uct1implicit(root, 1, stats).step(iterations)),
+                ('UCT2', lambda stats: uct2.uct2implicit(root, 1, stats).step(iterations)),
+                ('ALPHABETA', ab_search))
+    for name, search in searches:
+        secs = [float('inf'), float('inf')]
+        for _ in range(repeats):
+            for i, stats in enumerate((None, SearchStats())):
+                random.seed(0)
+                start = time.perf_counter()
+                search(stats)
+                secs[i] = min(secs[i], time.perf_counter() - start)
+        print(name, "- SECS OFF: ", round(secs[0], 4), "; ON: ", round(secs[1], 4), "; OVERHEAD: ", str(round(100 * (secs[1] / secs[0] - 1), 1)) + "%")
+        print("\t", stats.report())
+
+def bench_opening_book(plies=4, depth=5, timeAllowed=0.01, count=200):
+    """ Builds an opening book into a temporary file and reports its build
+    time and size, the time to open it, the time per lookup of random
+    positions inside and beyond its plies, and the time per move of every
+    agent in book positions with and without the book.
+    """
+    path = os.path.join(tempfile.mkdtemp(), openingbook.BOOK_FILE)
+    start = time.perf_counter()
+    entries = openingbook.build(path, plies, depth)
+    print("PLIES: ", plies, "; DEPTH: ", depth, "; ENTRIES: ", entries, "; BYTES: ", os.path.getsize(path), "; BUILD SECS: ", round(time.perf_counter() - start, 2))
+    start = time.perf_counter()
+    book = openingbook.OpeningBook(path)
+    print("OPEN MICROSECS: ", round(1e6 * (time.perf_counter() - start), 1))
+    inside = sample_positions(count, 0, plies)
+    beyond = sample_positions(count, plies + 1, plies + 10)
+    for name, positions in (('INSIDE', inside), ('BEYOND', beyond)):
+        start = time.perf_counter()
+        for _ in range(10):
+            for st in positions:
+                book.lookup(st)
+        print("LOOKUPS", name, "PLIES - MICROSECS EACH: ", round(1e6 * (time.perf_counter() - start) / (10 * len(positions)), 2))
+    print("HIT RATE INSIDE PLIES: ", round(book.hit_rate(), 4))
+    positions = inside[:10]
+    factories = (('MCTS', mcts.mcts_policy), ('UCT0', uct0.uct0_policy), ('UCT1', uct1.uct1_policy),
+                 ('UCT2', uct2.uct2_policy), ('ALPHABETA', alphabeta.ab_policy), ('SOLVER', solver.solver_policy))
+    for name, factory in factories:
+        secs = []
+        for withBook in (None, book):
+            total = 0.0
+            for st in positions:
+                policy = factory(timeAllowed, st.actor(), book=withBook)
+                start = time.perf_counter()
+                policy(st)
+                total += time.perf_counter() - start
+            secs.append(total / len(positions))
+        print(name, "- MICROSECS PER MOVE WITHOUT BOOK: ", round(1e6 * secs[0], 1), "; WITH: ", round(1e6 * secs[1], 1))
+    book.close()
+
+def bench_selfplay(timeAllowed=0.002, games=10, copies=200):
+    """ Generates self-play games between uct2 and alphabeta into a temporary
+    directory and reports positions per second, then the write speed of the
+    shard writer and the read speed of the lazy reader and of the memory
+    map over the generated records repeated the given number of copies.
+    """
+    directory = tempfile.mkdtemp()
+    agents = (tournament.Agent('uct2', timeAllowed, 0, 0), tournament.Agent('alphabeta', timeAllowed, 3, 0))
+    start = time.perf_counter()
+    records = selfplay.generate([tournament.Matchup(agents[0], agents[1], games)], os.path.join(directory, 'games'), workers=1)
+    print("GAMES: ", games, "; POSITIONS: ", records, "; POSITIONS/SEC: ", round(records / (time.perf_counter() - start), 1), "; BYTES/POSITION: ", selfplay.RECORD.itemsize)
+    played = np.concatenate(selfplay.map_shards(os.path.join(directory, 'games')))
+    path = os.path.join(directory, 'copies')
+    writer = selfplay.ShardWriter(path, len(played) * copies // 4)
+    start = time.perf_counter()
+    for _ in range(copies):
+        writer.write(played)
+    writer.close()
+    secs = time.perf_counter() - start
+    print("WRITE - RECORDS: ", writer.written, "; SHARDS: ", len(selfplay.shard_paths(path)), "; RECORDS/SEC: ", round(writer.written / secs), "; MB/SEC: ", round(writer.written * selfplay.RECORD.itemsize / secs / 1e6, 1))
+    start = time.perf_counter()
+    outcomes = sum(int(chunk['outcome'].sum()) for chunk in selfplay.iter_records(path))
+    print("LAZY READ - RECORDS/SEC: ", round(writer.written / (time.perf_counter() - start)))
+    start = time.perf_counter()
+    mapped = sum(int(shard['outcome'].sum()) for shard in selfplay.map_shards(path))
+    print("MEMORY MAP - RECORDS/SEC: ", round(writer.written / (time.perf_counter() - start)), "; SAME TOTALS: ", mapped == outcomes)
+
+benchmarks = {
+    'playouts': bench_playouts,
+    'transpositions': bench_transpositions,
+    'alphabeta-tt': bench_alphabeta_tt,
+    'alphabeta-ordering': bench_alphabeta_ordering,
+    'heuristic': bench_heuristic,
+    'batch-playouts': bench_batch_playouts,
+    'root-parallel': bench_root_parallel,
+    'tree-memory': bench_tree_memory,
+    'tree-reuse': bench_tree_reuse,
+    'uct-throughput': bench_uct_throughput,
+    'uct2-selection': bench_uct2_selection,
+    'endgame-solver': bench_endgame_solver,
+    'mcts-solver': bench_mcts_solver,
+    'early-stop': bench_early_stop,
+    'instrumentation': bench_instrumentation,
+    'make-unmake': bench_make_unmake,
+    'pvs': bench_pvs,
+    'symmetry': bench_symmetry,
+    'opening-book': bench_opening_book,
+    'selfplay': bench_selfplay,
+}
+
+if __name__ == '__main__':
+    names = sys.argv[1:] if len(sys.argv) > 1 else list(benchmarks.keys())
+    for name in names:
+        if name not in benchmarks:
+            print("Unknown benchmark:", name, "- choose from", ", ".join(benchmarks.keys()))
+            continue
+        benchmarks[name]()
@@ -0,0 +1,7 @@
+# File: conftest.py
+# Date: October 18, 2026
+# Description: pytest configuration. The tests live in tests/ and import the
+# modules from this directory; test_connect4.py is the command line script
+# rather than a test module.
+
+collect_ignore = ['test_connect4.py']
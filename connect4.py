@@ -2,15 +2,40 @@
 # Date: December 18, 2023
 # Description: Creates a standard Connect 4 game board
 
+import random
 import numpy as np
 from game import Game, State
 
+# Bitboard layout: each column takes 7 bits (6 rows plus an always-empty
+# sentinel bit on top), so bit (7 * column + row) is the cell in the given
+# column, with row 0 at the bottom of the board.
+HEIGHT = 6
+WIDTH = 7
+COLUMN_BITS = HEIGHT + 1
+CELLS = HEIGHT * WIDTH
+COLUMN_MASK = (1 << COLUMN_BITS) - 1
+
+# Zobrist keys: one random 64-bit number per (player, bit) plus one for
+# Player 2 to move. A fixed seed keeps keys identical across processes.
+_zobrist_rng = random.Random(474)
+ZOBRIST = [[_zobrist_rng.getrandbits(64) for _ in range(COLUMN_BITS * WIDTH)] for _ in range(3)]
+ZOBRIST_TURN = _zobrist_rng.getrandbits(64)
+
+# ZOBRIST_COLUMNS[player][column][bits]: Zobrist keys of a player's discs in a
+# column given as its 7 bits, so a key can be built a column at a time
+ZOBRIST_COLUMNS = [[[0] * (1 << COLUMN_BITS) for _ in range(WIDTH)] for _ in range(3)]
+for _player in (1, 2):
+    for _c in range(WIDTH):
+        for _bits in range(1, 1 << COLUMN_BITS):
+            _low = (_bits & -_bits).bit_length() - 1
+            ZOBRIST_COLUMNS[_player][_c][_bits] = ZOBRIST_COLUMNS[_player][_c][_bits & (_bits - 1)] ^ ZOBRIST[_player][COLUMN_BITS * _c + _low]
+
 class Connect4(Game):
     def __init__(self):
         """ Creates a standard Connect 4 board with six rows and seven columns.
         """
         self.rows = 6
-        self.columns = 7 
+        self.columns = 7
 
     def initial_state(self):
         """ Creates the initial state for this board.
@@ -19,15 +44,293 @@ class Connect4(Game):
         return Connect4.State(board, 1)
 
     class State(State):
+        _history = None # undo records of make, created on the first call
+
         def __init__(self, board, turn):
-            self.board = board
+            """ Creates a state from a 6x7 array in which row 0 is the top of
+            the board and each cell holds 0 (empty), 1 or 2 (player discs).
+
+            board -- 6x7 array of discs
+            turn -- player to move, 1 or 2
+            """
             self.actor1 = turn
+            self.discs = [0, 0, 0] # unused slot 0 so players index directly
+            self.heights = [0] * WIDTH
+            self.key = ZOBRIST_TURN if turn == 2 else 0
+            for c in range(WIDTH):
+                for r in range(HEIGHT):
+                    player = int(board[HEIGHT - 1 - r, c])
+                    if player != 0:
+                        self.discs[player] |= 1 << (COLUMN_BITS * c + r)
+                        self.heights[c] = r + 1
+                        self.key ^= ZOBRIST[player][COLUMN_BITS * c + r]
+            self.moves = sum(self.heights)
+            self.last = None # the move that led here is unknown, so both players get checked
+            self._terminal = None
+            self._board = None
+
+        @classmethod
+        def from_bitboards(cls, discs, heights, turn, moves, last, key):
+            """ Creates a state directly from its bitboards without going
+            through the array representation.
+
+            discs -- list [0, player 1 bitboard, player 2 bitboard]
+            heights -- number of discs in each column
+            turn -- player to move, 1 or 2
+            moves -- number of discs on the board
+            last -- column of the disc dropped to reach this state, or None
+            key -- Zobrist key of the position
+            """
+            st = cls.__new__(cls)
+            st.actor1 = turn
+            st.discs = discs
+            st.heights = heights
+            st.moves = moves
+            st.last = last
+            st.key = key
+            st._terminal = None
+            st._board = None
+            return st
+
+        @property
+        def board(self):
+            """ The 6x7 array view of this state, built on first use.
+            """
+            if self._board is None:
+                board = np.zeros((HEIGHT, WIDTH), dtype=int)
+                for player in (1, 2):
+                    bb = self.discs[player]
+                    for c in range(WIDTH):
+                        for r in range(self.heights[c]):
+                            if (bb >> (COLUMN_BITS * c + r)) & 1:
+                                board[HEIGHT - 1 - r, c] = player
+                self._board = board
+            return self._board
+
+        def __hash__(self):
+            return self.key
+
+        def __eq__(self, other):
+            """ Two states are equal if they hold the same discs and the same
+            player is to move, no matter which move order reached them.
+            """
+            if not isinstance(other, Connect4.State):
+                return NotImplemented
+            return self.key == other.key and self.discs == other.discs and self.actor1 == other.actor1
 
         def is_terminal(self):
             """ Checks if a given state is terminal. A state is terminal if
             either player has won (there are four consecutive same-player discs
             on the game board), or if there are no more available moves.
+            The result is computed once and cached on the state.
+            """
+            if self._terminal is None:
+                x = self._winner()
+                if x != 0:
+                    self._terminal = (True, x)
+                elif self.moves == CELLS:
+                    self._terminal = (True, 0)
+                else:
+                    self._terminal = (False, 0)
+            return self._terminal
+
+        def _winner(self):
+            """ Returns 1 if Player 1 has four in a row, -1 if Player 2 does,
+            and 0 otherwise. When the last move is known only the player who
+            made it can have won: the position before it had no four in a
+            row, so any line found on that player's bitboard passes through
+            the last disc.
             """
+            if self.last is None:
+                if has_four(self.discs[1]):
+                    return 1
+                if has_four(self.discs[2]):
+                    return -1
+                return 0
+            mover = 2 if self.actor1 == 1 else 1
+            if has_four(self.discs[mover]):
+                return 1 if mover == 1 else -1
+            return 0
+
+
+        def payoff(self):
+            """ Checks if a player has gotten four in a row at the given state.
+            The payoff for Player 1 winning is 1, for Player 2 winning is -1,
+            and for no win is 0.
+            """
+            return self.is_terminal()[1]
+
+
+        def actor(self):
+            return self.actor1
+
+
+        def get_actions(self):
+            """ Returns a list of legal moves from the current state.
+                The list of moves is given as a list of columns in which to
+                drop a disc. Columns are indexed from left to right.
+            """
+            heights = self.heights
+            return [c for c in range(WIDTH) if heights[c] < HEIGHT]
+
+        def is_legal(self, action):
+            """ Determines if dropping a disc in the given column is legal
+            from this state. An action won't be legal if a column is full.
+
+            action -- index of column
+            """
+            return self.heights[action] < HEIGHT
+
+        def successor(self, action): # should only take valid actions
+            """ Returns the state that results from dropping a disc in the
+            given column. Only handles valid actions.
+
+            action -- index of column
+            """
+            discs = self.discs[:]
+            heights = self.heights[:]
+            key = self.key ^ ZOBRIST_TURN
+            if heights[action] < HEIGHT:
+                bit = COLUMN_BITS * action + heights[action]
+                discs[self.actor1] |= 1 << bit
+                heights[action] += 1
+                key ^= ZOBRIST[self.actor1][bit]
+                return Connect4.State.from_bitboards(discs, heights, (2 if self.actor1 == 1 else 1), self.moves + 1, action, key)
+            # a full column only passes the turn, as the array board does
+            return Connect4.State.from_bitboards(discs, heights, (2 if self.actor1 == 1 else 1), self.moves, None, key)
+
+        def copy(self):
+            """ Returns a state equal to this one that shares no lists with it,
+            so one can be changed by make without affecting the other.
+            """
+            st = Connect4.State.from_bitboards(self.discs[:], self.heights[:], self.actor1, self.moves, self.last, self.key)
+            st._terminal = self._terminal
+            return st
+
+        def canonical_key(self):
+            """ Returns (key, mirrored): a key shared by this position and its
+            left-right mirror image and by no other position, and whether this
+            state is the mirror image of the orientation the key stands for,
+            in which case its actions translate with mirror_action. A
+            symmetric position is never mirrored. Both images have the same
+            value, so position caches keyed this way hold one entry for the two.
+            """
+            code = self.discs[self.actor1] + (self.discs[1] | self.discs[2]) # unique per position for the player to move
+            reflected = mirror(code)
+            if reflected < code:
+                return ((reflected << 1) | (self.actor1 - 1), True)
+            return ((code << 1) | (self.actor1 - 1), False)
+
+        def mirrored(self):
+            """ Returns the state reflected left to right.
+            """
+            discs = [0, mirror(self.discs[1]), mirror(self.discs[2])]
+            key = ZOBRIST_TURN if self.actor1 == 2 else 0
+            for player in (1, 2):
+                bb, columns = self.discs[player], ZOBRIST_COLUMNS[player]
+                for c in range(WIDTH):
+                    key ^= columns[WIDTH - 1 - c][(bb >> (COLUMN_BITS * c)) & COLUMN_MASK]
+            last = mirror_action(self.last) if self.last != None else None
+            st = Connect4.State.from_bitboards(discs, self.heights[::-1], self.actor1, self.moves, last, key)
+            st._terminal = self._terminal
+            return st
+
+        def canonical(self):
+            """ Returns (state, mirrored): this state, or its mirror image if
+            that is the orientation canonical_key stands for, and whether it
+            was mirrored.
+            """
+            if self.canonical_key()[1]:
+                return (self.mirrored(), True)
+            return (self, False)
+
+        def make(self, action):
+            """ Drops a disc in the given column, changing this state in place
+            into its successor, and records how to undo it with unmake.
+            Cheaper than successor since nothing is copied, but the state
+            must not be used as a dict key or shared while it is changed.
+            Only takes legal actions.
+
+            action -- index of column
+            """
+            if self._history is None:
+                self._history = []
+            self._history.append((self.last, self.key, self._terminal))
+            bit = COLUMN_BITS * action + self.heights[action]
+            self.discs[self.actor1] |= 1 << bit
+            self.heights[action] += 1
+            self.key ^= ZOBRIST[self.actor1][bit] ^ ZOBRIST_TURN
+            self.actor1 = 2 if self.actor1 == 1 else 1
+            self.moves += 1
+            self.last = action
+            self._terminal = None
+            self._board = None
+
+        def unmake(self):
+            """ Takes back the last disc dropped by make, restoring the state
+            it was made from.
+            """
+            action = self.last
+            self.last, self.key, self._terminal = self._history.pop()
+            self.actor1 = 2 if self.actor1 == 1 else 1
+            self.moves -= 1
+            self.heights[action] -= 1
+            self.discs[self.actor1] ^= 1 << (COLUMN_BITS * action + self.heights[action])
+            self._board = None
+
+
+# masks of columns 0, 1 and 2 and of the center column, for mirror
+_MIRROR_MASKS = [COLUMN_MASK << (COLUMN_BITS * c) for c in range(4)]
+
+def mirror(bb):
+    """ Returns the given bitboard reflected left to right. Also works on the
+    sum of a player's bitboard and the board mask, since no column's bits
+    carry into the next.
+
+    bb -- bitboard
+    """
+    m0, m1, m2, m3 = _MIRROR_MASKS
+    return (((bb & m0) << 42) | ((bb & m1) << 28) | ((bb & m2) << 14) | (bb & m3)
+            | ((bb >> 14) & m2) | ((bb >> 28) & m1) | ((bb >> 42) & m0))
+
+def mirror_action(action):
+    """ Returns the column the given column becomes when the board is
+    reflected left to right.
+    """
+    return WIDTH - 1 - action
+
+def has_four(bb):
+    """ Returns True if the given bitboard holds four consecutive discs in any
+    direction. The empty sentinel bit on top of every column keeps lines from
+    wrapping across columns.
+
+    bb -- bitboard of one player's discs
+    """
+    for shift in (1, COLUMN_BITS, COLUMN_BITS - 1, COLUMN_BITS + 1): # vertical, horizontal, both diagonals
+        m = bb & (bb >> shift)
+        if m & (m >> (2 * shift)):
+            return True
+    return False
+
+
+class Connect4Array(Game):
+    """ The original Connect 4 implementation that stores each state as a 6x7
+    NumPy array. Kept as a reference for correctness checks and benchmarks.
+    """
+    def __init__(self):
+        self.rows = 6
+        self.columns = 7
+
+    def initial_state(self):
+        board = np.zeros((6, 7), dtype=int)
+        return Connect4Array.State(board, 1)
+
+    class State(State):
+        def __init__(self, board, turn):
+            self.board = board
+            self.actor1 = turn
+
+        def is_terminal(self):
             x = self.payoff()
             if x != 0:
                 return (True, x)
@@ -36,53 +339,38 @@ class Connect4(Game):
             else:
                 return (False, 0)
 
-
         def payoff(self):
-            """ Checks if a player has gotten four in a row at the given state.
-            The payoff for Player 1 winning is 1, for Player 2 winning is -1,
-            and for no win is 0.
-            """
             # Check rows
             for row in self.board:
                 for i in range(len(row) - 3):
                     if row[i] == row[i + 1] == row[i + 2] == row[i + 3] and row[i] != 0:
-                        #print(row, self.board)
                         return 1 if row[i] == 1 else -1
 
             # Check columns
             for col in range(self.board.shape[1]):
                 for i in range(self.board.shape[0] - 3):
                     if self.board[i, col] == self.board[i + 1, col] == self.board[i + 2, col] ==self.board[i + 3, col] and self.board[i, col] != 0:
-                        #print(row, self.board)
                         return 1 if self.board[i, col] == 1 else -1
 
             # Check diagonals (positive slope)
             for i in range(self.board.shape[0] - 3):
                 for j in range(self.board.shape[1] - 3):
                     if self.board[i, j] == self.board[i + 1, j + 1] == self.board[i + 2, j + 2] == self.board[i + 3, j + 3] and self.board[i, j] != 0:
-                        #print(row, self.board)
                         return 1 if self.board[i, j] == 1 else -1
 
             # Check diagonals (negative slope)
             for i in range(3, self.board.shape[0]):
                 for j in range(self.board.shape[1] - 3):
                     if self.board[i, j] == self.board[i - 1, j + 1] == self.board[i - 2, j + 2] == self.board[i - 3, j + 3] and self.board[i, j] != 0:
-                        #print(row, self.board)
                         return 1 if self.board[i, j] == 1 else -1
 
             # If no winner is found
             return 0
-            
 
         def actor(self):
             return self.actor1
 
-
         def get_actions(self):
-            """ Returns a list of legal moves from the current state.
-                The list of moves is given as a list of columns in which to
-                drop a disc. Columns are indexed from left to right.
-            """
             actions = []
             for i in range(7):
                 if self.is_legal(i):
@@ -90,26 +378,15 @@ class Connect4(Game):
             return actions
 
         def is_legal(self, action):
-            """ Determines if dropping a disc in the given column is legal
-            from this state. An action won't be legal if a column is full.
-
-            action -- index of column
-            """
             if self.board[0,action] == 0:
                 return True
             else:
                 return False
 
-        def successor(self, action): # should only take valid actions
-            """ Returns the state that results from dropping a disc in the
-            given column. Only handles valid actions.
-            
-            action -- index of column
-            """
-            suc = Connect4.State(self.board.copy(), (2 if self.actor1 == 1 else 1))
+        def successor(self, action):
+            suc = Connect4Array.State(self.board.copy(), (2 if self.actor1 == 1 else 1))
             for i in range(6):
                 if suc.board[(5-i), action] == 0:
                     suc.board[(5-i), action] = self.actor1
                     break
             return suc
-        
\ No newline at end of file
@@ -0,0 +1,140 @@
+# File: earlystop.py
+# Date: October 18, 2026
+# Description: Rules that end a tree search before its time runs out once the
+# move at the root is settled. The search loops of mcts, uct0, uct1 and uct2
+# ask a rule every few iterations, and the rule keeps count of the stops it
+# made, the time they saved and, when auditing, how often they changed the move.
+
+import math
+from abc import ABC, abstractmethod
+
+def choose(stats, maximize):
+    """ Returns the action with the highest mean reward, or the lowest when
+    not maximizing, the way the policies pick their move. The first action
+    wins ties.
+
+    stats -- dict mapping each action to [visits, total reward]
+    maximize -- pick the highest mean instead of the lowest
+    """
+    best, bestAction = None, None
+    for action, (visits, reward) in stats.items():
+        mean = reward / visits if maximize else -reward / visits
+        if best == None or mean > best:
+            best, bestAction = mean, action
+    return bestAction
+
+class EarlyStop(ABC):
+    """ A rule deciding from the root statistics when a search may stop.
+    """
+
+    def __init__(self, checkEvery=32, audit=False):
+        """ Creates a rule with empty counters.
+
+        checkEvery -- iterations between two checks of the root statistics
+        audit -- after an early stop, keep searching to the end of the budget
+                 and count how often the move changed; the move played is the
+                 full-budget one
+        """
+        self.checkEvery = checkEvery
+        self.audit = audit
+        self.fired = False # the last search was stopped by this rule
+        self.moves = 0 # searches reported to finish
+        self.stops = 0 # searches stopped early
+        self.timeSaved = 0.0 # seconds left in the budget at the stops
+        self.audited = 0 # stops followed by the rest of the search
+        self.changed = 0 # audited stops whose move differed from the full budget
+
+    def settled(self, stats, numActions, remaining, maximize):
+        """ Returns whether the search can stop, recording the stop. Every
+        action at the root must have been tried.
+
+        stats -- dict mapping each expanded action at the root to [visits,
+                 total reward]
+        numActions -- legal actions at the root
+        remaining -- iterations the search is expected to run before time is up
+        maximize -- the policy plays the highest mean reward
+        """
+        if len(stats) < numActions or not self.decided(stats, remaining, maximize):
+            return False
+        self.fired = True
+        return True
+
+    @abstractmethod
+    def decided(self, stats, remaining, maximize):
+        """ Returns whether the move is settled. Implemented by each rule.
+
+        stats -- dict mapping each action at the root to [visits, total reward]
+        remaining -- iterations the search is expected to run before time is up
+        maximize -- the policy plays the highest mean reward
+        """
+        pass
+
+    def finish(self, stats, timeLeft, resume, maximize):
+        """ Records the end of a search and returns the root statistics the
+        policy should choose from.
+
+        stats -- root statistics when the search ended
+        timeLeft -- seconds left in the budget
+        resume -- function that searches for the rest of the budget and
+                  returns the new root statistics, called when auditing
+        maximize -- the policy plays the highest mean reward
+        """
+        self.moves += 1
+        if not self.fired:
+            return stats
+        self.fired = False
+        self.stops += 1
+        self.timeSaved += max(0.0, timeLeft)
+        if not self.audit:
+            return stats
+        early = choose(stats, maximize)
+        full = resume()
+        self.audited += 1
+        if choose(full, maximize) != early:
+            self.changed += 1
+        return full
+
+    def change_rate(self):
+        """ Returns the fraction of audited stops that changed the move.
+        """
+        return self.changed / self.audited if self.audited else 0.0
+
+class VisitMargin(EarlyStop):
+    def decided(self, stats, remaining, maximize):
+        """ The move the policy would play is also the most visited, by more
+        visits than the search has iterations left, so no other action can
+        overtake it.
+        """
+        visits = sorted((v for v, _ in stats.values()), reverse=True)
+        leader = stats[choose(stats, maximize)][0]
+        return leader == visits[0] and (len(visits) == 1 or visits[0] - visits[1] > remaining)
+
+class ConfidenceBound(EarlyStop):
+    def __init__(self, z=1.96, minVisits=16, checkEvery=32, audit=False):
+        """ Creates a rule stopping once the best mean reward is separated from
+        every other by z standard errors. Rewards lie in [-1, 1], so a
+        standard error of at most 1 / sqrt(visits) is assumed.
+
+        z -- width of the bounds in standard errors
+        minVisits -- visits every action needs before its bound is trusted
+        checkEvery -- iterations between two checks of the root statistics
+        audit -- count how often the move changed, see EarlyStop
+        """
+        EarlyStop.__init__(self, checkEvery, audit)
+        self.z = z
+        self.minVisits = minVisits
+
+    def decided(self, stats, remaining, maximize):
+        """ The lower bound of the best action clears the upper bound of
+        every other action.
+        """
+        sign = 1 if maximize else -1
+        bounds = []
+        for visits, reward in stats.values():
+            if visits < self.minVisits:
+                return False
+            mean = sign * reward / visits
+            width = self.z / math.sqrt(visits)
+            bounds.append((mean, mean - width, mean + width))
+        bounds.sort(reverse=True)
+        return len(bounds) == 1 or bounds[0][1] > max(upper for _, _, upper in bounds[1:])
@@ -2,98 +2,56 @@
 # Date: December 18, 2023
 # Description: Pure Monte Carlo Search Tree
 
-import time
 import random
-import connect4
+import arraytree
+import nodetree
 
-class mctsNode:
-    def __init__(self, parent, state):
-        self.state = state
-        self.parent = parent
-        self.visits = 0
-        self.reward = 0
-        self.children = dict()
-        self.expandable = True if state.is_terminal()[0] == False else False
+class mctsTree(nodetree.NodeTree):
+    compactTree = arraytree.ArrayTree
 
-class mctsTree:
-    def __init__(self, root):
-        sp = self.traverse2(root) 
-        payoff = self.simulate(sp)
-        self.update(sp, payoff)
+    def select(self, parent):
+        """ Returns a random unproven child of the parent node.
 
-    def traverse2(self, root):
-        """ Traverses the tree, expanding nodes based on the actions available
-        from that node. Returns a child from expansion or a terminal.
+        parent -- parent node
         """
-        s = root
-        while s.state.is_terminal()[0] == False:
-            if s.expandable == False:
-                s = random.choice(list(s.children.values()))
-            elif s.expandable == True:
-                s_actions = s.state.get_actions()
-                action = random.choice(list(set(s_actions) - set(s.children.keys())))
-                sp = mctsNode(s,s.state.successor(action))
-                s.children[action] = sp
-                if len(s.children) == len(s_actions):
-                    s.expandable = False
-                return sp
-        return s
+        return random.choice([child for child in parent.children.values() if child.proven == None])
 
-    def simulate(self, spNode):
-        """ Simulates a random playout to a terminal state from the given node.
-        Returns the payoff to the player at the terminal position.
-        """
-        sp = spNode.state
-        while(sp.is_terminal() == False):
-            sp = sp.successor(random.choice(sp.get_actions()))
-        return sp.payoff()
-
-    def update(self, pNode, payoff):
-        """ Back propagates payoff up the tree by updating the total reward and
-        number of visits.
-        """
-        current = pNode
-        while current.parent != None:
-            current.reward += payoff
-            current.visits += 1
-            current = current.parent
-        current.visits += 1
-
-def mcts_policy(timeAllowed, cActor):
+def mcts_policy(timeAllowed, cActor, playouts=1, workers=1, compact=False, reuse=True, solveBelow=0, earlyStop=None, stats=None, book=None):
     """ Takes the allowed CPU time in seconds and returns a function that takes
     a position and returns the move suggested by running MCTS for that amount
     of time starting with that position.
 
     timeAllowed -- allowed CPU time in seconds
+    playouts -- random playouts run together to evaluate each new node
+    workers -- number of processes growing independent trees from the root,
+               whose root statistics are merged (root parallelization)
+    compact -- store the search tree as typed arrays instead of node objects
+    reuse -- keep the tree between moves and continue from the subtree of the
+             position reached, instead of starting each move from scratch.
+             The root visits carried over are appended to
+             mcts.carriedVisits after every move.
+    solveBelow -- once at most this many cells are empty, first try to
+                  solve the position exactly with solver.Solver in
+                  half the time, searching as usual if it does not
+                  finish. The solver and its solve statistics are
+                  exposed as mcts.solver (None when solveBelow is 0).
+    earlyStop -- earlystop.VisitMargin or earlystop.ConfidenceBound ending the
+                 search once the move is settled, or None to always use the
+                 full time. The rule counts the stops and the time they
+                 saved; it is exposed as mcts.earlyStop. Used without workers.
+    stats -- searchstats.SearchStats counting the iterations, playouts and
+             time per phase of every search, and the nodes of the solver, or
+             None. Exposed as mcts.stats. Used without workers.
+    book -- openingbook.OpeningBook whose move is played without searching
+            whenever the position is in it, or None
+
+    Without workers, the tree of the last search is exposed as mcts.tree.
+    Node trees stop searching once the root is proven won, lost or drawn.
+    Without workers, the iterations this skips, estimated from the game's
+    iteration rate, are appended to mcts.savedIterations after every move.
+
+    The root statistics of the last search, a dict mapping each action to
+    [visits, total reward for player 1], are exposed as mcts.rootStats, None
+    when the move came from the book or the solver.
     """
-    def mcts(state):
-        timeout = time.time() + timeAllowed
-        game = connect4.Connect4()
-        st = game.State(state.board, state.actor1)
-        root = mctsNode(None, st)
-        while time.time() < timeout:
-            mctsTree(root)
-
-        if root.state.actor() == cActor:
-            maxReward = float('-inf')
-            maxAction = None
-            for action in root.children.keys(): 
-                child = root.children.get(action)
-                exploit = child.reward / child.visits
-                if exploit > maxReward:
-                    maxReward = exploit
-                    maxAction = action
-            return maxAction
-        else:
-            minReward = float('inf')
-            minAction = None
-            for action in root.children.keys(): 
-                child = root.children.get(action)
-                exploit = child.reward / child.visits
-                if exploit < minReward:
-                    minReward = exploit
-                    minAction = action
-            return minAction
-        
-    return mcts
-
+    return nodetree.tree_policy(mctsTree, timeAllowed, cActor, playouts, workers, compact, reuse, solveBelow, earlyStop, stats, book)
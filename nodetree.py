@@ -0,0 +1,324 @@
+# File: nodetree.py
+# Date: October 18, 2026
+# Description: Monte Carlo tree search over node objects, shared by mcts and
+# uct0: one iteration of selection, expansion, playout and backpropagation
+# with proven values backed up, the reuse of the tree between moves, the
+# root statistics and the policy built on them. The two searches differ
+# only in how a child is selected and in their array-backed tree.
+
+import time
+import random
+from abc import ABC, abstractmethod
+import connect4
+import playout
+import solver
+import rootparallel
+
+class Node:
+    def __init__(self, parent, state):
+        self.state = state
+        self.parent = parent
+        self.visits = 0
+        self.reward = 0
+        self.children = dict()
+        self.expandable = True if state.is_terminal()[0] == False else False
+        # Player 1's payoff under perfect play once known, else None
+        self.proven = state.payoff() if state.is_terminal()[0] else None
+
+class NodeTree(ABC):
+    """ One search iteration from a root Node. Subclasses choose the child
+    followed below fully expanded nodes, and name the arraytree class that
+    stores the same search as arrays in compactTree.
+    """
+
+    def __init__(self, root, playouts=1, stats=None):
+        self.playouts = playouts
+        self.stats = stats
+        if stats != None:
+            self.timed_iteration(root)
+            return
+        sp = self.traverse2(root)
+        payoff = self.simulate(sp)
+        self.update(sp, payoff)
+        self.prove(sp)
+
+    @abstractmethod
+    def select(self, parent):
+        """ Returns the unproven child of the given fully expanded node that
+        the search follows.
+
+        parent -- parent node
+        """
+        pass
+
+    def timed_iteration(self, root):
+        """ Runs the same iteration as the constructor, timing every phase
+        into self.stats and counting the depth reached.
+        """
+        clock = time.perf_counter
+        start = clock()
+        s = self.descend(root)
+        selected = clock()
+        sp = self.expand(s)
+        expanded = clock()
+        payoff = self.simulate(sp)
+        simulated = clock()
+        self.update(sp, payoff)
+        self.prove(sp)
+        stats = self.stats
+        stats.backprop += clock() - simulated
+        stats.simulate += simulated - expanded
+        stats.expand += expanded - selected
+        stats.select += selected - start
+        stats.iterations += 1
+        if sp is not s:
+            stats.expansions += 1
+        depth, current = 0, sp
+        while current.parent != None:
+            depth += 1
+            current = current.parent
+        stats.depth(depth)
+
+    def traverse2(self, root):
+        """ Traverses the tree, expanding nodes based on the actions available
+        from that node. Returns a child from expansion or a terminal. Proven
+        children are never selected, so terminals are only reached once.
+        """
+        return self.expand(self.descend(root))
+
+    def descend(self, root):
+        """ Follows the selection rule down from the root and returns the
+        first node that is terminal or still has unexpanded actions.
+        """
+        s = root
+        while s.state.is_terminal()[0] == False and s.expandable == False:
+            s = self.select(s)
+        return s
+
+    def expand(self, s):
+        """ Adds the child for a random unexpanded action of the given node
+        and returns it, or returns the node itself if it is terminal.
+        """
+        if s.state.is_terminal()[0]:
+            return s
+        s_actions = s.state.get_actions()
+        action = random.choice(list(set(s_actions) - set(s.children.keys())))
+        sp = Node(s,s.state.successor(action))
+        s.children[action] = sp
+        if len(s.children) == len(s_actions):
+            s.expandable = False
+        return sp
+
+    def simulate(self, spNode):
+        """ Simulates a random playout to a terminal state from the given node.
+        Returns the payoff to the player at the terminal position. With more
+        than one playout, returns the mean payoff of a batch of playouts.
+        """
+        sp = spNode.state
+        if self.playouts > 1:
+            if self.stats != None:
+                self.stats.playouts += self.playouts
+            p1Wins, _, p2Wins = playout.batch_playouts(sp, self.playouts)
+            return (p1Wins - p2Wins) / self.playouts
+        while sp.is_terminal()[0] == False:
+            sp = sp.successor(random.choice(sp.get_actions()))
+        if self.stats != None:
+            self.stats.playouts += 1
+            self.stats.playoutMoves += sp.moves - spNode.state.moves
+        return sp.payoff()
+
+    def update(self, pNode, payoff):
+        """ Back propagates payoff up the tree by updating the total reward and
+        number of visits.
+        """
+        current = pNode
+        while current.parent != None:
+            current.reward += payoff
+            current.visits += 1
+            current = current.parent
+        current.visits += 1
+
+    def prove(self, pNode):
+        """ Backs proven values up the tree from the given node by the minimax
+        rules: a node is proven once one child is a proven win for the player
+        to move there, or once every child is expanded and proven.
+        """
+        current = pNode
+        while current.proven != None and current.parent != None:
+            parent = current.parent
+            best = 1 if parent.state.actor() == 1 else -1
+            if current.proven == best:
+                parent.proven = best
+            elif parent.expandable == False and all(child.proven != None for child in parent.children.values()):
+                values = [child.proven for child in parent.children.values()]
+                parent.proven = max(values) if best == 1 else min(values)
+            else:
+                return
+            current = parent
+
+def new_tree(treeClass, state, playouts, compact):
+    """ Returns an empty tree rooted at the given state: the root node, or
+    the compact tree of the given tree class.
+
+    treeClass -- NodeTree subclass the tree is searched with
+    state -- root state
+    playouts -- random playouts run together to evaluate each new node
+    compact -- store the tree as arrays instead of nodes
+    """
+    if compact:
+        return treeClass.compactTree(state, playouts)
+    return Node(None, state)
+
+def find_subtree(root, state):
+    """ Returns the node for the given state among the children and
+    grandchildren of root (the position after our move and the opponent's
+    reply), detached from its parent so the rest of the tree can be freed.
+    Returns None if the state was never expanded.
+
+    root -- root node of the previous search
+    state -- current state
+    """
+    for child in root.children.values():
+        if child.state == state:
+            child.parent = None
+            return child
+        for grandchild in child.children.values():
+            if grandchild.state == state:
+                grandchild.parent = None
+                return grandchild
+    return None
+
+def root_stats(tree, compact):
+    """ Returns the statistics of the root's children as a dict mapping each
+    action to [visits, total reward]. The total reward of a proven child is
+    its proven payoff times its visits, so its mean is exact.
+
+    tree -- tree from new_tree or find_subtree
+    compact -- the tree is stored as arrays instead of nodes
+    """
+    if compact:
+        return tree.root_stats()
+    return {action: [child.visits, child.reward if child.proven == None else child.proven * child.visits] for action, child in tree.children.items()}
+
+def search_root(treeClass, tree, timeout, playouts, compact, stop=None, maximize=True, stats=None):
+    """ Grows the given tree until the timeout, until the root is proven for
+    node trees, or until the stop rule finds the move settled, and returns
+    root_stats.
+
+    treeClass -- NodeTree subclass the tree is searched with
+    tree -- tree from new_tree or find_subtree
+    timeout -- time.time() value at which to stop
+    playouts -- random playouts run together to evaluate each new node
+    compact -- the tree is stored as arrays instead of nodes
+    stop -- earlystop rule asked every stop.checkEvery iterations, or None
+    maximize -- the policy plays the highest mean reward, for the stop rule
+    stats -- searchstats.SearchStats timing every iteration, or None
+    """
+    if compact:
+        tree.stats = stats
+    numActions = len((tree.rootState if compact else tree.state).get_actions())
+    start, count = time.time(), 0
+    while time.time() < timeout and (compact or tree.proven == None):
+        if compact:
+            tree.iterate()
+        else:
+            treeClass(tree, playouts, stats)
+        count += 1
+        if stop != None and count % stop.checkEvery == 0:
+            now = time.time()
+            remaining = count * (timeout - now) / max(now - start, 1e-9)
+            if stop.settled(root_stats(tree, compact), numActions, remaining, maximize):
+                break
+    return root_stats(tree, compact)
+
+def grow_tree(state, timeout, seed, treeClass, playouts, compact):
+    """ Seeds the random generators and runs search_root on a new tree. Used
+    by the workers of a root-parallel search.
+
+    state -- root state
+    timeout -- time.time() value at which to stop
+    seed -- random seed for this tree
+    treeClass -- NodeTree subclass the tree is searched with
+    playouts -- random playouts run together to evaluate each new node
+    compact -- store the tree as arrays instead of nodes
+    """
+    random.seed(seed)
+    playout.seed(seed)
+    return search_root(treeClass, new_tree(treeClass, state, playouts, compact), timeout, playouts, compact)
+
+def tree_policy(treeClass, timeAllowed, cActor, playouts=1, workers=1, compact=False, reuse=True, solveBelow=0, earlyStop=None, stats=None, book=None):
+    """ Returns the policy of mcts.mcts_policy and uct0.uct0_policy, searching
+    with the given NodeTree subclass. The other arguments and the attributes
+    of the policy are described there.
+
+    treeClass -- NodeTree subclass the tree is searched with
+    """
+    endgame = solver.Solver(stats=stats) if solveBelow > 0 else None
+    kept = None
+    iterations, searched = 0, 0.0 # totals this game, for the iteration rate
+
+    def policy(state):
+        nonlocal kept, iterations, searched
+        policy.rootStats = None
+        if book != None:
+            move = book.move(state)
+            if move != None:
+                return move
+        timeout = time.time() + timeAllowed
+        game = connect4.Connect4()
+        st = game.State(state.board, state.actor1)
+        if solveBelow > 0:
+            move = solver.endgame_move(endgame, st, solveBelow, time.time() + timeAllowed / 2)
+            if move != None:
+                return move
+        if workers > 1:
+            rootStats = rootparallel.search(grow_tree, st, timeout, workers, treeClass, playouts, compact)
+        else:
+            tree = None
+            if reuse and kept != None:
+                tree = kept.find_subtree(st) if compact else find_subtree(kept, st)
+            if tree == None:
+                tree = new_tree(treeClass, st, playouts, compact)
+            before = tree.visits[0] if compact else tree.visits
+            policy.carriedVisits.append(before)
+            start = time.time()
+            rootStats = search_root(treeClass, tree, timeout, playouts, compact, earlyStop, st.actor() == cActor, stats)
+            if earlyStop != None:
+                rootStats = earlyStop.finish(rootStats, timeout - time.time(), lambda: search_root(treeClass, tree, timeout, playouts, compact, stats=stats), st.actor() == cActor)
+            searched += time.time() - start
+            iterations += (tree.visits[0] if compact else tree.visits) - before
+            saved = 0
+            if not compact and tree.proven != None and searched > 0:
+                saved = round(iterations / searched * max(0.0, timeout - time.time()))
+            policy.savedIterations.append(saved)
+            kept = tree
+            policy.tree = tree
+
+        policy.rootStats = rootStats
+        if st.actor() == cActor:
+            maxReward = float('-inf')
+            maxAction = None
+            for action, (visits, reward) in rootStats.items():
+                exploit = reward / visits
+                if exploit > maxReward:
+                    maxReward = exploit
+                    maxAction = action
+            return maxAction
+        else:
+            minReward = float('inf')
+            minAction = None
+            for action, (visits, reward) in rootStats.items():
+                exploit = reward / visits
+                if exploit < minReward:
+                    minReward = exploit
+                    minAction = action
+            return minAction
+
+    policy.carriedVisits = []
+    policy.tree = None
+    policy.savedIterations = []
+    policy.solver = endgame
+    policy.earlyStop = earlyStop
+    policy.stats = stats
+    policy.rootStats = None
+    return policy
@@ -0,0 +1,163 @@
+# File: openingbook.py
+# Date: October 18, 2026
+# Description: Opening book of precomputed moves for the first plies of the
+# game. The book is built once by solving or searching every position up to
+# a given number of discs, and stored as a sorted binary file of canonical
+# position keys that is memory-mapped, so opening it parses nothing and each
+# lookup is a binary search over the mapped keys.
+
+import bisect
+import mmap
+import struct
+import time
+from array import array
+import connect4
+import alphabeta
+import solver
+from transposition import TranspositionTable
+
+# File layout, in native byte order: the header (magic, entries, plies,
+# depth), then the sorted canonical keys as uint64, the values as float32
+# and the moves as int8, one of each per position. Keeping each field in
+# its own array keeps every array aligned and lets the keys be searched in
+# place.
+MAGIC = b'C4B1'
+HEADER = struct.Struct('<4sIII')
+BOOK_FILE = 'opening_book.bin'
+
+def book_positions(plies):
+    """ Returns the nonterminal positions with at most the given number of
+    discs, one per pair of mirror images, in the orientation their
+    canonical key stands for.
+
+    plies -- most discs on the board
+    """
+    layer = [connect4.Connect4().initial_state()]
+    positions = []
+    for ply in range(plies + 1):
+        positions.extend(layer)
+        if ply == plies:
+            break
+        children = dict()
+        for st in layer:
+            for action in st.get_actions():
+                child = st.successor(action).canonical()[0]
+                if not child.is_terminal()[0]:
+                    children[child.canonical_key()[0]] = child
+        layer = list(children.values())
+    return positions
+
+def build(path, plies=4, depth=6, tableBytes=1 << 22, solveSeconds=0.01, positions=None):
+    """ Finds the best move and value of every book position and writes the
+    book file. Returns the number of entries. Each position is first given
+    to solver.Solver for a moment, and searched with principal variation
+    search to the given depth if the solver does not finish. Values are for
+    the player to move: 1, 0 or -1 for a solved win, draw or loss, and
+    otherwise the search's score over alphabeta.WIN_SCORE, so a win found by
+    the search is also 1 and heuristic scores stay within (-0.5, 0.5).
+
+    path -- file to write
+    plies -- most discs on the board of a book position, taken from the
+             positions when they are given
+    depth -- search depth of the positions the solver does not finish
+    tableBytes -- memory budget of the transposition table of each search,
+                  emptied between positions, and of the solver's, which
+                  keeps its exact results for all of them
+    solveSeconds -- time the solver gets for each position
+    positions -- states to put in the book instead of every position with
+                 at most plies discs, or None
+    """
+    if positions == None:
+        positions = book_positions(plies)
+    positions = {st.canonical_key()[0]: st.canonical()[0] for st in positions if not st.is_terminal()[0]}
+    plies = max((st.moves for st in positions.values()), default=0)
+    table = TranspositionTable(tableBytes)
+    endgame = solver.Solver(tableBytes)
+    entries = []
+    for key, st in positions.items():
+        result = endgame.best_move(st, time.time() + solveSeconds)
+        if result != None:
+            move, score = result
+            value = (score > 0) - (score < 0)
+        else:
+            # abTree stores values for the root's player, and the roots
+            # alternate players, so each search starts from an empty table;
+            # the book is then the same whatever the order of positions
+            table.clear()
+            tree = alphabeta.abTree(st, depth, table, None, (), alphabeta.MoveOrdering())
+            move = st.get_actions()[tree.best_move[1]]
+            value = max(-1.0, min(1.0, tree.best_move[0] / alphabeta.WIN_SCORE))
+        entries.append((key, value, move))
+    entries.sort()
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(entries), plies, depth))
+        f.write(array('Q', [key for key, _, _ in entries]).tobytes())
+        f.write(array('f', [value for _, value, _ in entries]).tobytes())
+        f.write(array('b', [move for _, _, move in entries]).tobytes())
+    return len(entries)
+
+class OpeningBook:
+    def __init__(self, path):
+        """ Memory-maps the book file at the given path. Nothing is read but
+        the header until positions are looked up.
+
+        path -- file written by build
+        """
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, self.plies, self.depth = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("not an opening book: " + path)
+        view = memoryview(self.map)
+        start = HEADER.size
+        self.keys = view[start:start + 8 * self.size].cast('Q')
+        start += 8 * self.size
+        self.values = view[start:start + 4 * self.size].cast('f')
+        start += 4 * self.size
+        self.moves = view[start:start + self.size].cast('b')
+        self.probes = 0 # lookups of positions within the book's plies
+        self.hits = 0
+
+    def __len__(self):
+        return self.size
+
+    def lookup(self, state):
+        """ Returns (move, value) stored for the given state, with the value
+        for the player to move as build describes, or None if the state is
+        not in the book.
+
+        state -- Connect4 state
+        """
+        if state.moves > self.plies:
+            return None
+        self.probes += 1
+        key, mirrored = state.canonical_key()
+        i = bisect.bisect_left(self.keys, key)
+        if i == self.size or self.keys[i] != key:
+            return None
+        self.hits += 1
+        move = self.moves[i]
+        return (connect4.mirror_action(move) if mirrored else move, self.values[i])
+
+    def move(self, state):
+        """ Returns the book move for the given state, or None if it is not in
+        the book. Used by the policies before they search.
+        """
+        entry = self.lookup(state)
+        return entry[0] if entry != None else None
+
+    def hit_rate(self):
+        """ Returns the fraction of lookups within the book's plies that hit.
+        """
+        return self.hits / self.probes if self.probes else 0.0
+
+    def close(self):
+        """ Releases the mapping and closes the file.
+        """
+        for name in ('keys', 'values', 'moves'):
+            view = getattr(self, name, None)
+            if view != None:
+                view.release()
+        self.map.close()
+        self.file.close()
@@ -0,0 +1,65 @@
+# File: playout.py
+# Date: October 18, 2026
+# Description: Plays many random Connect 4 games from the same state at once,
+# keeping the boards as NumPy arrays of bitboards that advance in lockstep.
+
+import numpy as np
+import connect4
+
+rng = np.random.default_rng()
+
+# the four line directions (vertical, horizontal, both diagonals) as a column
+# so one broadcast checks every direction of every board
+SHIFTS = np.array([[1], [connect4.COLUMN_BITS], [connect4.COLUMN_BITS - 1], [connect4.COLUMN_BITS + 1]], dtype=np.uint64)
+
+def seed(value):
+    """ Reseeds the random generator used by batch_playouts.
+
+    value -- integer seed
+    """
+    global rng
+    rng = np.random.default_rng(value)
+
+def has_four(bb):
+    """ Returns a boolean array marking which of the given bitboards hold four
+    consecutive discs in any direction.
+
+    bb -- uint64 array of bitboards
+    """
+    m = bb & (bb >> SHIFTS)
+    return ((m & (m >> (SHIFTS + SHIFTS))) != 0).any(axis=0)
+
+def batch_playouts(state, n):
+    """ Plays n uniformly random games from the given state and returns the
+    number of (Player 1 wins, draws, Player 2 wins). Every board moves once
+    per step, so all boards share the player to move.
+
+    state -- Connect4 state
+    n -- number of playouts
+    """
+    isTerm, val = state.is_terminal()
+    if isTerm:
+        return (n if val == 1 else 0, n if val == 0 else 0, n if val == -1 else 0)
+    discs = [None, np.full(n, state.discs[1], dtype=np.uint64), np.full(n, state.discs[2], dtype=np.uint64)]
+    heights = np.tile(np.array(state.heights, dtype=np.int64), (n, 1))
+    result = np.zeros(n, dtype=np.int8)
+    active = np.ones(n, dtype=bool)
+    boards = np.arange(n)
+    actor = state.actor1
+    for _ in range(connect4.CELLS - state.moves):
+        # a uniformly random legal column for every board; finished boards
+        # still pick one but their move is masked out
+        cols = np.argmax(rng.random((n, connect4.WIDTH)) + (heights < connect4.HEIGHT), axis=1)
+        rows = heights[boards, cols]
+        heights[boards, cols] = rows + active
+        mover = discs[actor]
+        mover |= active.astype(np.uint64) << (cols * connect4.COLUMN_BITS + rows).astype(np.uint64)
+        won = has_four(mover) & active
+        result[won] = 1 if actor == 1 else -1
+        active &= ~won
+        if not active.any():
+            break
+        actor = 2 if actor == 1 else 1
+    p1Wins = int(np.count_nonzero(result == 1))
+    p2Wins = int(np.count_nonzero(result == -1))
+    return (p1Wins, n - p1Wins - p2Wins, p2Wins)
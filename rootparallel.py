@@ -0,0 +1,55 @@
+# File: rootparallel.py
+# Date: October 18, 2026
+# Description: Root-parallel tree search. Worker processes each grow their own
+# tree from the same root with a different random seed, and the per-action
+# statistics of the roots are summed when time runs out.
+
+import atexit
+import random
+import multiprocessing
+
+pools = dict() # worker count -> persistent process pool
+
+def get_pool(workers):
+    """ Returns the process pool with the given number of workers, starting it
+    the first time it is asked for. Pools live until the program exits so no
+    move pays for process startup.
+
+    workers -- number of worker processes
+    """
+    pool = pools.get(workers)
+    if pool == None:
+        pool = multiprocessing.Pool(workers)
+        pools[workers] = pool
+    return pool
+
+def close_pools():
+    """ Shuts down every pool started by get_pool.
+    """
+    for pool in pools.values():
+        pool.terminate()
+    pools.clear()
+
+atexit.register(close_pools)
+
+def search(grow, state, timeout, workers, *args):
+    """ Runs grow in every worker with a distinct seed and returns the merged
+    root statistics as a dict mapping each action to [visits, total reward].
+
+    grow -- module-level function (state, timeout, seed, *args) that grows a
+            tree from state until timeout and returns its root statistics in
+            the same form
+    state -- root state
+    timeout -- time.time() value at which the workers stop
+    workers -- number of worker processes
+    args -- extra arguments passed on to grow
+    """
+    base = random.getrandbits(32)
+    jobs = [(state, timeout, base + i) + args for i in range(workers)]
+    merged = dict()
+    for stats in get_pool(workers).starmap(grow, jobs):
+        for action, (visits, reward) in stats.items():
+            total = merged.setdefault(action, [0, 0])
+            total[0] += visits
+            total[1] += reward
+    return merged
@@ -0,0 +1,92 @@
+# File: searchstats.py
+# Date: October 18, 2026
+# Description: Counters and phase timers that the agents report into when they
+# are given a SearchStats object. Agents without one skip every measurement,
+# so instrumentation costs nothing unless it is asked for.
+
+import time
+
+COUNTERS = ('iterations', 'expansions', 'playouts', 'playoutMoves', 'nodes', 'cutoffs', 'ttProbes', 'ttHits')
+TIMERS = ('select', 'expand', 'simulate', 'backprop', 'evaluate')
+
+class SearchStats:
+    def __init__(self):
+        """ Creates stats with every counter and timer at zero.
+
+        iterations -- MCTS iterations from the root
+        expansions -- nodes added to a tree or table
+        playouts -- random playouts run
+        playoutMoves -- moves played in the playouts that were run one at a time
+        nodes -- positions searched by alphabeta and the solver
+        cutoffs -- alpha-beta cutoffs
+        ttProbes, ttHits -- transposition table lookups and the ones found
+        select, expand, simulate, backprop, evaluate -- seconds spent in each
+                 phase, each excluding the phases timed inside it
+        maxDepth -- deepest node reached, in plies from the root
+        """
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        for name in TIMERS:
+            setattr(self, name, 0.0)
+        self.maxDepth = 0
+        self.nested = 0.0 # time of timed calls inside the one running
+
+    def depth(self, d):
+        """ Records that a node d plies below the root was reached.
+        """
+        if d > self.maxDepth:
+            self.maxDepth = d
+
+    def timed(self, phase, fn):
+        """ Returns fn wrapped so that the time spent in it, minus the time of
+        other timed calls made from it, is added to the given phase.
+
+        phase -- one of TIMERS
+        fn -- function to time
+        """
+        def wrapper(*args):
+            outer = self.nested
+            self.nested = 0.0
+            start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                elapsed = time.perf_counter() - start
+                setattr(self, phase, getattr(self, phase) + elapsed - self.nested)
+                self.nested = outer + elapsed
+        return wrapper
+
+    def add(self, other):
+        """ Adds the counts and times of other stats into these, keeping the
+        deeper maximum depth. Used to total games and matchups.
+        """
+        for name in COUNTERS + TIMERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.depth(other.maxDepth)
+
+    def mean_playout_length(self):
+        """ Returns the mean moves per playout run one at a time.
+        """
+        return self.playoutMoves / self.playouts if self.playouts else 0.0
+
+    def hit_rate(self):
+        """ Returns the fraction of transposition table lookups that hit.
+        """
+        return self.ttHits / self.ttProbes if self.ttProbes else 0.0
+
+    def as_dict(self):
+        """ Returns every counter, timer and the maximum depth by name.
+        """
+        values = {name: getattr(self, name) for name in COUNTERS + TIMERS}
+        values['maxDepth'] = self.maxDepth
+        return values
+
+    def report(self):
+        """ Returns a one-line summary of the non-zero counters and timers.
+        """
+        parts = ["%s: %d" % (name.upper(), getattr(self, name)) for name in COUNTERS if getattr(self, name)]
+        parts += ["%s SECS: %.4f" % (name.upper(), getattr(self, name)) for name in TIMERS if getattr(self, name)]
+        if self.playouts:
+            parts.append("MEAN PLAYOUT LENGTH: %.2f" % self.mean_playout_length())
+        parts.append("MAX DEPTH: %d" % self.maxDepth)
+        return " ; ".join(parts)
@@ -0,0 +1,210 @@
+# File: selfplay.py
+# Date: October 18, 2026
+# Description: Self-play data generation. Games between any pairings of the
+# agents are played by a pool of worker processes, and every position is
+# appended as a fixed-size record to numbered shard files, so a dataset
+# can grow over many runs and be read back lazily or memory-mapped.
+
+import os
+import random
+import multiprocessing
+import numpy as np
+import connect4
+import playout
+import tournament
+
+# One record per position. p1 and p2 are the bitboards of each player's
+# discs (bit 7 * column + row, row 0 at the bottom), actor is the player to
+# move and move the column played. visits counts the root visits of the
+# search per column, all zero when the move came without a search
+# distribution (alphabeta, the solver or the book). value is the search's
+# mean reward of the move played for the player to move, NaN when there
+# is none. outcome is the final payoff for the player to move, and
+# pairing and seed identify the matchup and game the position comes from.
+RECORD = np.dtype([('p1', '<u8'), ('p2', '<u8'), ('actor', 'u1'), ('ply', 'u1'),
+                   ('move', 'i1'), ('outcome', 'i1'), ('value', '<f4'),
+                   ('visits', '<u4', (connect4.WIDTH,)), ('pairing', '<u2'), ('seed', '<u4')])
+SHARD_RECORDS = 1 << 18 # records per shard before a new one is started
+SHARD_PATTERN = 'shard-%05d.bin'
+
+def play_record(p1_policy, p2_policy):
+    """ Plays one game and returns (payoff, positions), positions being a list
+    of (state, move, root statistics or None) for every move played.
+
+    p1_policy -- policy moving first
+    p2_policy -- policy moving second
+    """
+    pos = connect4.Connect4().initial_state()
+    positions = []
+    while not pos.is_terminal()[0]:
+        policy = p1_policy if pos.actor() == 1 else p2_policy
+        move = policy(pos)
+        positions.append((pos, move, getattr(policy, 'rootStats', None)))
+        pos = pos.successor(move)
+    return pos.payoff(), positions
+
+def game_records(payoff, positions, pairing, seed):
+    """ Returns the RECORD array of one game played by play_record.
+
+    payoff -- final payoff for player 1
+    positions -- (state, move, root statistics or None) of every move
+    pairing -- index of the matchup
+    seed -- seed of the game
+    """
+    records = np.zeros(len(positions), dtype=RECORD)
+    for i, (st, move, rootStats) in enumerate(positions):
+        sign = 1 if st.actor() == 1 else -1
+        rec = records[i]
+        rec['p1'], rec['p2'] = st.discs[1], st.discs[2]
+        rec['actor'], rec['ply'], rec['move'] = st.actor(), st.moves, move
+        rec['outcome'] = sign * payoff
+        rec['value'] = np.nan
+        if rootStats != None:
+            for action, (visits, reward) in rootStats.items():
+                rec['visits'][action] = visits
+            if move in rootStats and rootStats[move][0] > 0:
+                rec['value'] = sign * rootStats[move][1] / rootStats[move][0]
+    records['pairing'] = pairing
+    records['seed'] = seed
+    return records
+
+def play_job(job):
+    """ Seeds the random generators, builds both policies, plays one game and
+    returns (matchup index, RECORD array). Run by the pool workers.
+
+    job -- (matchup index, p1 Agent, p2 Agent, seed, book file or None)
+    """
+    index, p1, p2, seed, bookPath = job
+    random.seed(seed)
+    playout.seed(seed)
+    book = tournament.open_book(bookPath)
+    p1_policy = tournament.policy_factory(p1.agent, p1.t, 1, p1.d, p1.s, book=book)()
+    p2_policy = tournament.policy_factory(p2.agent, p2.t, 2, p2.d, p2.s, book=book)()
+    payoff, positions = play_record(p1_policy, p2_policy)
+    return (index, game_records(payoff, positions, index, seed))
+
+def shard_paths(directory):
+    """ Returns the paths of the shards in the given directory in order.
+    """
+    names = sorted(name for name in os.listdir(directory) if name.startswith('shard-') and name.endswith('.bin'))
+    return [os.path.join(directory, name) for name in names]
+
+class ShardWriter:
+    def __init__(self, directory, shardRecords=SHARD_RECORDS):
+        """ Opens the last shard in the given directory for appending, or
+        creates the first. A record cut short by an interrupted run is
+        dropped first so every shard stays a whole number of records.
+
+        directory -- directory of the shards, created if missing
+        shardRecords -- records per shard before a new one is started
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shardRecords = shardRecords
+        paths = shard_paths(directory)
+        self.shard = len(paths) - 1 if paths else 0
+        self.file = None
+        self.count = 0 # records in the open shard
+        self.written = 0 # records written by this writer
+        self.open_shard()
+
+    def open_shard(self):
+        """ Opens the current shard for appending.
+        """
+        path = os.path.join(self.directory, SHARD_PATTERN % self.shard)
+        self.file = open(path, 'ab')
+        size = self.file.seek(0, os.SEEK_END)
+        if size % RECORD.itemsize:
+            self.file.truncate(size - size % RECORD.itemsize)
+        self.count = size // RECORD.itemsize
+
+    def write(self, records):
+        """ Appends a RECORD array, starting new shards as they fill up.
+        """
+        start = 0
+        while start < len(records):
+            if self.count >= self.shardRecords:
+                self.file.close()
+                self.shard += 1
+                self.open_shard()
+            end = min(len(records), start + self.shardRecords - self.count)
+            self.file.write(records[start:end].tobytes())
+            self.count += end - start
+            start = end
+        self.written += len(records)
+
+    def close(self):
+        self.file.close()
+
+def generate(matchups, directory, workers=None, baseSeed=0, shardRecords=SHARD_RECORDS, book=None):
+    """ Plays the games of the given matchups on a pool of worker processes
+    and appends every position to the shards in the given directory as each
+    game finishes, so memory holds only the games in flight. Returns the
+    number of records written.
+
+    matchups -- list of tournament.Matchup; each plays its number of games
+    directory -- directory of the shards, appended to if it already has some
+    workers -- number of processes, None for one per CPU, 1 to play in this
+               process
+    baseSeed -- seed of the whole run, so runs with different seeds add
+                different games
+    shardRecords -- records per shard before a new one is started
+    book -- opening book file both agents of every game play from, or None
+    """
+    jobs = [(i, m.p1, m.p2, tournament.game_seed(baseSeed, m.p1, m.p2, g), book)
+            for i, m in enumerate(matchups) for g in range(m.games)]
+    writer = ShardWriter(directory, shardRecords)
+    workers = workers if workers != None else (os.cpu_count() or 1)
+    try:
+        if workers > 1:
+            with multiprocessing.Pool(workers) as pool:
+                for _, records in pool.imap_unordered(play_job, jobs):
+                    writer.write(records)
+        else:
+            for job in jobs:
+                writer.write(play_job(job)[1])
+    finally:
+        writer.close()
+    return writer.written
+
+def shard_records(path):
+    """ Returns the number of whole records in the shard at the given path.
+    """
+    return os.path.getsize(path) // RECORD.itemsize
+
+def iter_records(directory, chunk=1 << 14):
+    """ Yields the records of every shard in order as RECORD arrays of at
+    most chunk records, reading one chunk at a time.
+
+    directory -- directory of the shards
+    chunk -- most records per array
+    """
+    for path in shard_paths(directory):
+        remaining = shard_records(path)
+        with open(path, 'rb') as f:
+            while remaining > 0:
+                records = np.fromfile(f, dtype=RECORD, count=min(chunk, remaining))
+                remaining -= len(records)
+                yield records
+
+def map_shards(directory):
+    """ Returns a read-only memory-mapped RECORD array for every nonempty
+    shard in order. Nothing is read until the arrays are indexed.
+
+    directory -- directory of the shards
+    """
+    return [np.memmap(path, dtype=RECORD, mode='r', shape=(shard_records(path),))
+            for path in shard_paths(directory) if shard_records(path) > 0]
+
+def record_state(record):
+    """ Returns the Connect4 state of a record.
+
+    record -- one element of a RECORD array
+    """
+    board = np.zeros((connect4.HEIGHT, connect4.WIDTH), dtype=int)
+    for player, bb in ((1, int(record['p1'])), (2, int(record['p2']))):
+        for c in range(connect4.WIDTH):
+            for r in range(connect4.HEIGHT):
+                if (bb >> (connect4.COLUMN_BITS * c + r)) & 1:
+                    board[connect4.HEIGHT - 1 - r, c] = player
+    return connect4.Connect4().State(board, int(record['actor']))
@@ -0,0 +1,308 @@
+# File: solver.py
+# Date: October 18, 2026
+# Description: Exact Connect 4 solver. Negamax over bitboards with alpha-beta
+# pruning, a transposition table shared by mirrored positions, and a binary
+# search over the score made of null-window searches. The player to move
+# scores (CELLS + 1 - moves) / 2 for winning with their next disc, where moves
+# counts the discs on the board, one less for every later win, the negative
+# for losses and 0 for a draw, so faster wins score higher.
+
+import time
+import connect4
+from connect4 import HEIGHT, WIDTH, CELLS, COLUMN_BITS
+from alphabeta import SearchTimeout
+from transposition import TranspositionTable, LOWER, UPPER
+
+BOTTOM_MASK = sum(1 << (COLUMN_BITS * c) for c in range(WIDTH))
+BOARD_MASK = BOTTOM_MASK * ((1 << HEIGHT) - 1)
+COLUMN_MASKS = [((1 << HEIGHT) - 1) << (COLUMN_BITS * c) for c in range(WIDTH)]
+ORDER = sorted(range(WIDTH), key=lambda c: abs(WIDTH // 2 - c)) # center first
+CHECK_EVERY = 16 # nodes between two looks at the clock, about 0.2ms of search
+DEADLINE_MARGIN = 0.0005 # seconds kept back from a move's time to notice the
+                         # deadline and unwind, so moves end within their time
+
+def winning_cells(position, mask):
+    """ Returns a bitboard of the empty cells that would complete four in a row
+    for the player owning position, reachable now or not.
+
+    position -- bitboard of the player's discs
+    mask -- bitboard of every disc on the board
+    """
+    # vertical
+    r = (position << 1) & (position << 2) & (position << 3)
+    # horizontal and both diagonals: a gap at either end or in the middle
+    for shift in (COLUMN_BITS, COLUMN_BITS - 1, COLUMN_BITS + 1):
+        p = (position << shift) & (position << (2 * shift))
+        r |= p & (position << (3 * shift))
+        r |= p & (position >> shift)
+        p = (position >> shift) & (position >> (2 * shift))
+        r |= p & (position << shift)
+        r |= p & (position >> (3 * shift))
+    return r & (BOARD_MASK ^ mask)
+
+def playable(mask):
+    """ Returns a bitboard of the lowest empty cell of every column.
+
+    mask -- bitboard of every disc on the board
+    """
+    return (mask + BOTTOM_MASK) & BOARD_MASK
+
+def can_win_next(position, mask):
+    """ Returns whether the player owning position wins with their next disc.
+    """
+    return winning_cells(position, mask) & playable(mask) != 0
+
+def non_losing_moves(position, mask):
+    """ Returns a bitboard of the playable cells that do not let the opponent
+    win with their next disc: the only threat to block if there is one, and
+    never the cell under an opponent's winning cell. Zero if every move
+    loses. Assumes the player to move cannot win at once.
+
+    position -- bitboard of the player to move's discs
+    mask -- bitboard of every disc on the board
+    """
+    possible = playable(mask)
+    threats = winning_cells(position ^ mask, mask)
+    forced = possible & threats
+    if forced:
+        if forced & (forced - 1): # two threats, only one can be blocked
+            return 0
+        possible = forced
+    return possible & ~(threats >> 1)
+
+def canonical_key(position, mask):
+    """ Returns the key shared by a position and its mirror image: the smaller
+    of position + mask (unique for every position) and its reflection.
+    """
+    key = position + mask
+    return min(key, connect4.mirror(key))
+
+def trunc_half(x):
+    """ Returns x / 2 rounded toward zero.
+    """
+    return -(-x // 2) if x < 0 else x // 2
+
+class Solver:
+    def __init__(self, tableBytes=1 << 22, stats=None):
+        """ Creates a solver with an empty transposition table. The table keeps
+        score bounds from one solve to the next.
+
+        tableBytes -- memory budget for the transposition table in bytes
+        stats -- searchstats.SearchStats counting the nodes and table lookups
+                 of every solve, or None
+        """
+        self.table = TranspositionTable(tableBytes)
+        self.stats = stats
+        self.nodes = 0
+        self.deadline = None
+        self.solved = 0 # positions solved by best_move
+        self.timeouts = 0 # positions given up at the deadline
+        self.solveTime = 0.0 # seconds spent in finished solves
+        self.maxSolveTime = 0.0
+
+    def negamax(self, position, mask, moves, alpha, beta):
+        """ Returns the score of the position for the player to move if it lies
+        within (alpha, beta), otherwise a bound on the score on the same side
+        of the window. Assumes the player to move cannot win at once.
+
+        position -- bitboard of the player to move's discs
+        mask -- bitboard of every disc on the board
+        moves -- discs on the board
+        alpha -- lower bound of the window
+        beta -- upper bound of the window
+        """
+        self.nodes += 1
+        if self.deadline != None and self.nodes % CHECK_EVERY == 0 and time.time() > self.deadline:
+            raise SearchTimeout()
+        nextMoves = non_losing_moves(position, mask)
+        if nextMoves == 0:
+            return -((CELLS - moves) // 2)
+        if moves >= CELLS - 2:
+            return 0
+
+        lo = -((CELLS - 2 - moves) // 2) # the opponent cannot win next move
+        hi = (CELLS - 1 - moves) // 2 # we cannot win next move
+        key = canonical_key(position, mask)
+        entry = self.table.probe(key)
+        if entry != None:
+            value, _, flag, _ = entry
+            if flag == UPPER:
+                hi = min(hi, int(value))
+            elif flag == LOWER:
+                lo = max(lo, int(value))
+        if alpha < lo:
+            alpha = lo
+            if alpha >= beta:
+                return alpha
+        if beta > hi:
+            beta = hi
+            if alpha >= beta:
+                return beta
+
+        # moves creating the most new winning cells first, ties center first
+        children = []
+        for c in ORDER:
+            move = nextMoves & COLUMN_MASKS[c]
+            if move:
+                threats = bin(winning_cells(position | move, mask)).count('1')
+                children.append((-threats, len(children), move))
+        children.sort()
+
+        opponent = position ^ mask
+        for _, _, move in children:
+            score = -self.negamax(opponent, mask | move, moves + 1, -beta, -alpha)
+            if score >= beta:
+                self.table.store(key, score, 0, LOWER, 0)
+                return score
+            if score > alpha:
+                alpha = score
+        self.table.store(key, alpha, 0, UPPER, 0)
+        return alpha
+
+    def solve(self, position, mask, moves):
+        """ Returns the exact score of the position for the player to move,
+        found by a binary search of null-window searches, each of which only
+        answers whether the score is above a guess.
+        """
+        if can_win_next(position, mask):
+            return (CELLS + 1 - moves) // 2
+        lo = -((CELLS - moves) // 2)
+        hi = (CELLS + 1 - moves) // 2
+        while lo < hi:
+            med = lo + (hi - lo) // 2
+            # look closer to zero first, where most games end
+            if med <= 0 and trunc_half(lo) < med:
+                med = trunc_half(lo)
+            elif med >= 0 and trunc_half(hi) > med:
+                med = trunc_half(hi)
+            r = self.negamax(position, mask, moves, med, med + 1)
+            if r <= med:
+                hi = r
+            else:
+                lo = r
+        return lo
+
+    def best_move(self, state, deadline=None):
+        """ Returns (action, score) for an optimal move in the given state and
+        its score for the player to move, or None if the deadline passed
+        before the position was solved.
+
+        state -- nonterminal Connect4 state
+        deadline -- time.time() value at which to give up, or None
+        """
+        start = time.time()
+        self.deadline = deadline
+        position = state.discs[state.actor1]
+        mask = state.discs[1] | state.discs[2]
+        moves = state.moves
+        nodes, probes, hits = self.nodes, self.table.probes, self.table.hits
+        try:
+            result = self.root_move(position, mask, moves)
+        except SearchTimeout:
+            self.timeouts += 1
+            return None
+        finally:
+            self.deadline = None
+            if self.stats != None:
+                self.stats.nodes += self.nodes - nodes
+                self.stats.ttProbes += self.table.probes - probes
+                self.stats.ttHits += self.table.hits - hits
+        elapsed = time.time() - start
+        self.solved += 1
+        self.solveTime += elapsed
+        self.maxSolveTime = max(self.maxSolveTime, elapsed)
+        return result
+
+    def root_move(self, position, mask, moves):
+        """ Returns (column, score) of an optimal move, checking the moves
+        center first against the score of the position with one null-window
+        search each.
+        """
+        possible = playable(mask)
+        winning = winning_cells(position, mask) & possible
+        if winning:
+            for c in ORDER:
+                if winning & COLUMN_MASKS[c]:
+                    return (c, (CELLS + 1 - moves) // 2)
+        safe = non_losing_moves(position, mask)
+        if safe == 0: # every move loses next turn
+            for c in ORDER:
+                if possible & COLUMN_MASKS[c]:
+                    return (c, -((CELLS - moves) // 2))
+        columns = [c for c in ORDER if safe & COLUMN_MASKS[c]]
+        score = self.solve(position, mask, moves)
+        if len(columns) == 1:
+            return (columns[0], score)
+        opponent = position ^ mask
+        for c in columns:
+            child = mask | (safe & COLUMN_MASKS[c])
+            if self.negamax(opponent, child, moves + 1, -score, -score + 1) <= -score:
+                return (c, score)
+        return (columns[0], score)
+
+    def mean_solve_time(self):
+        """ Returns the mean seconds per finished solve.
+        """
+        return self.solveTime / self.solved if self.solved else 0.0
+
+def endgame_move(solver, state, solveBelow, deadline):
+    """ Returns the solver's move if the state has at most solveBelow empty
+    cells and is solved before the deadline, otherwise None so the caller
+    searches as usual. Used by the tree search policies to hand the endgame
+    to the solver.
+
+    solver -- Solver keeping the statistics of the calling policy
+    state -- current state
+    solveBelow -- most empty cells to try solving, 0 to never try
+    deadline -- time.time() value at which to give up
+    """
+    if CELLS - state.moves > solveBelow:
+        return None
+    result = solver.best_move(state, deadline)
+    return result[0] if result != None else None
+
+def fallback_move(state):
+    """ Returns the first column, center first, that does not let the opponent
+    win next turn, or any legal column if none; the move played when a solve
+    runs out of time.
+    """
+    position = state.discs[state.actor1]
+    mask = state.discs[1] | state.discs[2]
+    for moves in (winning_cells(position, mask) & playable(mask), non_losing_moves(position, mask), playable(mask)):
+        for c in ORDER:
+            if moves & COLUMN_MASKS[c]:
+                return c
+    return state.get_actions()[0]
+
+def solver_policy(timeAllowed, cActor, tableBytes=1 << 22, stats=None, book=None):
+    """ Takes the allowed CPU time in seconds and returns a function that takes
+    a position and returns a perfect move if the position can be solved in
+    that time, and otherwise a move that does not lose at once.
+
+    timeAllowed -- allowed CPU time in seconds
+    tableBytes -- memory budget for the transposition table, kept all game
+    stats -- searchstats.SearchStats the solver counts its nodes and table
+             lookups into, or None. Exposed as solver.stats.
+    book -- openingbook.OpeningBook whose move is played without searching
+            whenever the position is in it, or None
+
+    The solver and its solve statistics are exposed as solver.search.
+    """
+    search = Solver(tableBytes, stats)
+
+    def solver(state):
+        if book != None:
+            move = book.move(state)
+            if move != None:
+                return move
+        deadline = time.time() + max(0.0, timeAllowed - DEADLINE_MARGIN)
+        game = connect4.Connect4()
+        st = game.State(state.board, state.actor1)
+        result = search.best_move(st, deadline)
+        if result == None:
+            return fallback_move(st)
+        return result[0]
+
+    solver.search = search
+    solver.stats = stats
+    return solver
@@ -0,0 +1,57 @@
+# File: sprt.py
+# Date: October 18, 2026
+# Description: Sequential probability ratio test on the decisive games of a
+# matchup. A match can stop as soon as the log-likelihood ratio of Player 1
+# being the stronger agent against Player 2 being the stronger one crosses a
+# bound set by the accepted error rates, instead of playing a fixed number.
+
+import math
+
+class SPRT:
+    def __init__(self, alpha=0.05, beta=0.05, delta=0.1, minGames=10):
+        """ Creates a test of H0: Player 1 wins a decisive game with
+        probability 0.5 - delta, against H1: with probability 0.5 + delta.
+        Ties carry no information and are left out.
+
+        alpha -- accepted probability of declaring Player 1 stronger under H0
+        beta -- accepted probability of declaring Player 2 stronger under H1
+        delta -- distance of both hypotheses from an even match
+        minGames -- games every matchup plays before games are allocated by
+                    information, so the estimates behind it are not empty
+        """
+        self.p0 = 0.5 - delta
+        self.p1 = 0.5 + delta
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.winStep = math.log(self.p1 / self.p0)
+        self.lossStep = math.log((1 - self.p1) / (1 - self.p0))
+        self.minGames = minGames
+
+    def llr(self, wins, losses):
+        """ Returns the log-likelihood ratio of H1 against H0.
+
+        wins -- games won by Player 1
+        losses -- games won by Player 2
+        """
+        return wins * self.winStep + losses * self.lossStep
+
+    def decision(self, wins, losses):
+        """ Returns 1 once the test accepts H1 (Player 1 is stronger), -1 once
+        it accepts H0 (Player 2 is stronger), and 0 while undecided.
+        """
+        llr = self.llr(wins, losses)
+        if llr >= self.upper:
+            return 1
+        if llr <= self.lower:
+            return -1
+        return 0
+
+    def information(self, wins, losses, ties):
+        """ Returns the expected change of the log-likelihood ratio from one
+        more game, in absolute value: how fast the matchup moves toward a
+        decision, from the win rate observed so far with one win and one
+        loss added so early estimates are not extreme.
+        """
+        decisive = (wins + losses + 1) / (wins + losses + ties + 2)
+        p = (wins + 1) / (wins + losses + 2)
+        return decisive * abs(p * self.winStep + (1 - p) * self.lossStep)
@@ -7,233 +7,155 @@
 # For more details, run ./Connect 4
 
 import sys
-import numpy as np
-import time
-import uct0
-import uct1
-import uct2
-import mcts
-import alphabeta
-import connect4
+import agentbench
+import openingbook
+import selfplay
+import sprt
+import tournament
 
 def compare_policies(p1_policy_fxn, p2_policy_fxn, time_limit, num_games):
-    p1_wins, p2_wins, ties, p1_time, p2_time = 0, 0, 0, 0, 0
-    game = connect4.Connect4()
-    p1WinMoves, p2WinMoves = 0, 0
-
+    tally = tournament.Tally(num_games)
     for _ in range(num_games):
-        p1_policy, p2_policy = p1_policy_fxn(), p2_policy_fxn()
-        pos = game.initial_state()
-        moveCounterP1, moveCounterP2 = 0, 0
-
-        while not pos.is_terminal()[0]:
-            move = None
-            if pos.actor() == 1:
-                # comment out why I have try block
-                '''
-                start = time.time()
-                move = p1_policy(pos)
-                p1_time = max(p1_time, time.time() - start)
-                moveCounterP1 += 1
-                '''
-                while move == None:
-                    try:
-                        start = time.time()
-                        move = p1_policy(pos)
-                        p1_time = max(p1_time, time.time() - start)
-                    except:
-                        pass
-                moveCounterP1 += 1
-                
-                
-            else:
-                while move == None:
-                    try:
-                        start = time.time()
-                        move = p2_policy(pos)
-                        p2_time = max(p2_time, time.time() - start)
-                    except:
-                        pass
-                moveCounterP2 += 1
-            pos = pos.successor(move)
-            #print(pos.board)
-
-        if pos.payoff() == 0: # if tie is reached aka board is full
-            ties += 1
-        if pos.actor() == 2: # if someone won and state is terminal, actor of current position is the loser
-            p1WinMoves += moveCounterP1
-            p1_wins += 1
-        else:
-            p2WinMoves += moveCounterP2
-            p2_wins += 1
-    '''
-    if p1_time > time_limit * 1.01:
-        print("WARNING: max time for P1 =", p1_time)
-    if p2_time > time_limit * 1.01:
-        print("WARNING: max time for P2 =", p2_time)
-    '''
+        tally.add(tournament.play_game(p1_policy_fxn(), p2_policy_fxn()))
+    return tally.summary()
 
-    return p1_wins/num_games, p2_wins/num_games, ties/num_games, (p1WinMoves/p1_wins if p1_wins != 0 else 0), (p2WinMoves/p2_wins if p2_wins != 0 else 0)
 
-
-def test_connect_4(p1_agent_name, p1_policy_fxn, p2_agent_name, p2_policy_fxn, time_limit, num_games):
-    p1_win_prob, p2_win_prob, tie_prob, avg_moves_p1, avg_moves_p2 = compare_policies(p1_policy_fxn, p2_policy_fxn, time_limit, num_games)
+def print_results(p1_agent_name, p2_agent_name, results):
+    p1_win_prob, p2_win_prob, tie_prob, avg_moves_p1, avg_moves_p2 = results
     print(p1_agent_name.upper(), "(P1) - WINS: ", p1_win_prob, "; AVG MOVES TO WIN: ", round(avg_moves_p1, 4))
     print(p2_agent_name.upper(), "(P2) - WINS: ", p2_win_prob, "; AVG MOVES TO WIN: ", round(avg_moves_p2, 4))
     print("TIES: ", tie_prob)
 
+def test_connect_4(p1_agent_name, p1_policy_fxn, p2_agent_name, p2_policy_fxn, time_limit, num_games):
+    print_results(p1_agent_name, p2_agent_name, compare_policies(p1_policy_fxn, p2_policy_fxn, time_limit, num_games))
+
+def run_plan(plan, workers, test=None, budget=None, instrument=False, book=None, baseSeed=0):
+    """ Plays every matchup in the plan on a tournament pool and prints the
+    plan in order: each tuple of print arguments as is, and each matchup's
+    results as soon as they are in. With a test, also prints the games each
+    matchup played against its fixed number, and the totals at the end.
+
+    plan -- list of tournament.Matchup and tuples of arguments to print
+    workers -- number of processes, None for one per CPU
+    test -- sprt.SPRT stopping matchups once decided, or None
+    budget -- most games over the whole plan, or None
+    instrument -- also print each player's search stats over the matchup
+    book -- opening book file every agent plays from, or None
+    baseSeed -- seed of the whole plan
+    """
+    matchups = [item for item in plan if isinstance(item, tournament.Matchup)]
+    tallies = tournament.run(matchups, workers, baseSeed, test=test, budget=budget, instrument=instrument, book=book)
+    played, fixed = 0, 0
+    for item in plan:
+        if isinstance(item, tournament.Matchup):
+            tally = next(tallies)
+            print_results(item.p1.agent, item.p2.agent, tally.summary())
+            if instrument:
+                print(item.p1.agent.upper(), "(P1) SEARCH - ", tally.p1Stats.report())
+                print(item.p2.agent.upper(), "(P2) SEARCH - ", tally.p2Stats.report())
+            if test != None:
+                verdict = {1: "P1 STRONGER", -1: "P2 STRONGER", 0: "UNDECIDED"}[tally.decision]
+                print("GAMES PLAYED: ", tally.played, "OF", item.games, "; SPRT: ", verdict)
+            played += tally.played
+            fixed += item.games
+        else:
+            print(*item)
+    if test != None:
+        print("\nTOTAL GAMES PLAYED: ", played, "OF", fixed, "(" + str(round(100 * played / max(fixed, 1), 1)) + "%)")
+
+def sweep_plan(numgames):
+    """ Returns the plan of the test sweep: uct0, uct1 and uct2 against MCTS
+    from both sides at each time, then alphabeta against MCTS at each depth.
+
+    numgames -- games per matchup, a tenth of that for alphabeta
+    """
+    times = [0.0001, 0.0002, 0.0003, 0.0008]
+    plan = []
+    for t in times:
+        plan.append(("When t=", t, " and n=", numgames,":"))
+        baseline = tournament.Agent('mcts', t, 0, 0)
+        for agent in ['uct0', 'uct1', 'uct2']:
+            challenger = tournament.Agent(agent, t, 0, 0)
+            plan.append(tournament.Matchup(challenger, baseline, numgames))
+            plan.append(("\n",))
+            plan.append(tournament.Matchup(baseline, challenger, numgames))
+            plan.append(("\n",) if agent != 'uct2' else ("\n\n",))
+    plan.append(("alphabeta tests:",))
+    baseline = tournament.Agent('mcts', times[0], 0, 0)
+    for d in [2, 3, 4]:
+        for label in ["0.0003", "0.0006"]:
+            plan.append((("when" if (d, label) == (2, "0.0003") else "\nwhen") + " t = " + label + ", d = " + str(d) + ", and n =", int(numgames/10)))
+            challenger = tournament.Agent('alphabeta', times[0], d, 0)
+            plan.append(tournament.Matchup(challenger, baseline, int(numgames/10)))
+            plan.append(("\n",))
+            plan.append(tournament.Matchup(baseline, challenger, int(numgames/10)))
+    return plan
+
 if __name__ == '__main__':
-    validAgents = ['mcts','uct0','uct1','uct2','alphabeta']
+    validAgents = ['mcts','uct0','uct1','uct2','alphabeta','solver']
+    workers, test, budget, book, baseSeed = None, None, None, None, 0
+    instrument = '-stats' in sys.argv
+    if instrument:
+        sys.argv.remove('-stats')
+    while len(sys.argv) > 2 and sys.argv[-2] in ('-w', '-sprt', '-budget', '-book', '-seed'):
+        if sys.argv[-2] == '-w':
+            workers = int(sys.argv[-1])
+        elif sys.argv[-2] == '-sprt':
+            test = sprt.SPRT(alpha=float(sys.argv[-1]), beta=float(sys.argv[-1]))
+        elif sys.argv[-2] == '-book':
+            book = sys.argv[-1]
+        elif sys.argv[-2] == '-seed':
+            baseSeed = int(sys.argv[-1])
+        else:
+            budget = int(sys.argv[-1])
+        sys.argv = sys.argv[:-2]
     if len(sys.argv) == 3 and sys.argv[1] == 'test' and int(sys.argv[2]) > 0:
-        times = [0.0001, 0.0002, 0.0003, 0.0008]
         numgames = int(sys.argv[2])
         print("We are using a multitude of agents, each running uct0, uct1, uct2, or minimax with alpha-beta pruning, to play Connect4 against an MCTS agent. Here are various statistics demonstrating their performance.")
         print("It should take a few minutes to complete, so feel free to scroll tiktok while you wait.")
-        print("When t=", times[0], " and n=", numgames,":")
-        test_connect_4(validAgents[1], lambda: uct0.uct0_policy(times[0], 1), validAgents[0], lambda: mcts.mcts_policy(times[0], 2), times[0], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[0], 1), validAgents[1], lambda: uct0.uct0_policy(times[0], 2), times[0], numgames)
-        print("\n")
-        test_connect_4(validAgents[2], lambda: uct1.uct1_policy(times[0], 1), validAgents[0], lambda: mcts.mcts_policy(times[0], 2), times[0], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[0], 1), validAgents[2], lambda: uct1.uct1_policy(times[0], 2), times[0], numgames)
-        print("\n")
-        test_connect_4(validAgents[3], lambda: uct2.uct2_policy(times[0], 1), validAgents[0], lambda: mcts.mcts_policy(times[0], 2), times[0], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[0], 1), validAgents[3], lambda: uct2.uct2_policy(times[0], 2), times[0], numgames)
-        print("\n\n")
-        print("When t=", times[1], " and n=", numgames,":")
-        test_connect_4(validAgents[1], lambda: uct0.uct0_policy(times[1], 1), validAgents[0], lambda: mcts.mcts_policy(times[1], 2), times[1], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[1], 1), validAgents[1], lambda: uct0.uct0_policy(times[1], 2), times[1], numgames)
-        print("\n")
-        test_connect_4(validAgents[2], lambda: uct1.uct1_policy(times[1], 1), validAgents[0], lambda: mcts.mcts_policy(times[1], 2), times[1], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[1], 1), validAgents[2], lambda: uct1.uct1_policy(times[1], 2), times[1], numgames)
-        print("\n")
-        test_connect_4(validAgents[3], lambda: uct2.uct2_policy(times[1], 1), validAgents[0], lambda: mcts.mcts_policy(times[1], 2), times[1], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[1], 1), validAgents[3], lambda: uct2.uct2_policy(times[1], 2), times[1], numgames)
-        print("\n\n")
-        print("When t=", times[2], " and n=", numgames,":")
-        test_connect_4(validAgents[1], lambda: uct0.uct0_policy(times[2], 1), validAgents[0], lambda: mcts.mcts_policy(times[2], 2), times[2], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[2], 1), validAgents[1], lambda: uct0.uct0_policy(times[2], 2), times[2], numgames)
-        print("\n")
-        test_connect_4(validAgents[2], lambda: uct1.uct1_policy(times[2], 1), validAgents[0], lambda: mcts.mcts_policy(times[2], 2), times[2], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[2], 1), validAgents[2], lambda: uct1.uct1_policy(times[2], 2), times[2], numgames)
-        print("\n")
-        test_connect_4(validAgents[3], lambda: uct2.uct2_policy(times[2], 1), validAgents[0], lambda: mcts.mcts_policy(times[2], 2), times[2], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[2], 1), validAgents[3], lambda: uct2.uct2_policy(times[2], 2), times[2], numgames)
-        print("\n\n")
-        print("When t=", times[3], " and n=", numgames,":")
-        test_connect_4(validAgents[1], lambda: uct0.uct0_policy(times[3], 1), validAgents[0], lambda: mcts.mcts_policy(times[3], 2), times[3], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[3], 1), validAgents[1], lambda: uct0.uct0_policy(times[3], 2), times[3], numgames)
-        print("\n")
-        test_connect_4(validAgents[2], lambda: uct1.uct1_policy(times[3], 1), validAgents[0], lambda: mcts.mcts_policy(times[3], 2), times[3], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[3], 1), validAgents[2], lambda: uct1.uct1_policy(times[3], 2), times[3], numgames)
-        print("\n")
-        test_connect_4(validAgents[3], lambda: uct2.uct2_policy(times[3], 1), validAgents[0], lambda: mcts.mcts_policy(times[3], 2), times[3], numgames)
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[3], 1), validAgents[3], lambda: uct2.uct2_policy(times[3], 2), times[3], numgames)
-        print("\n\n")
-        print("alphabeta tests:")
-        print("when t = 0.0003, d = 2, and n =", int(numgames/10))
-        test_connect_4(validAgents[4], lambda: alphabeta.ab_policy(times[0], 1, 2), validAgents[0], lambda: mcts.mcts_policy(times[0], 2), 0.0003, int(numgames/10))
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[0], 1), validAgents[4], lambda: alphabeta.ab_policy(times[0], 2, 2), 0.0003, int(numgames/10))
-        print("\nwhen t = 0.0006, d = 2, and n =", int(numgames/10))
-        test_connect_4(validAgents[4], lambda: alphabeta.ab_policy(times[0], 1, 2), validAgents[0], lambda: mcts.mcts_policy(times[0], 2), 0.0006, int(numgames/10))
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[0], 1), validAgents[4], lambda: alphabeta.ab_policy(times[0], 2, 2), 0.0006, int(numgames/10))
-        print("\nwhen t = 0.0003, d = 3, and n =", int(numgames/10))
-        test_connect_4(validAgents[4], lambda: alphabeta.ab_policy(times[0], 1, 3), validAgents[0], lambda: mcts.mcts_policy(times[0], 2), 0.0003, int(numgames/10))
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[0], 1), validAgents[4], lambda: alphabeta.ab_policy(times[0], 2, 3), 0.0003, int(numgames/10))
-        print("\nwhen t = 0.0006, d = 3, and n =", int(numgames/10))
-        test_connect_4(validAgents[4], lambda: alphabeta.ab_policy(times[0], 1, 3), validAgents[0], lambda: mcts.mcts_policy(times[0], 2), 0.0006, int(numgames/10))
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[0], 1), validAgents[4], lambda: alphabeta.ab_policy(times[0], 2, 3), 0.0006, int(numgames/10))
-        print("\nwhen t = 0.0003, d = 4, and n =", int(numgames/10))
-        test_connect_4(validAgents[4], lambda: alphabeta.ab_policy(times[0], 1, 4), validAgents[0], lambda: mcts.mcts_policy(times[0], 2), 0.0003, int(numgames/10))
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[0], 1), validAgents[4], lambda: alphabeta.ab_policy(times[0], 2, 4), 0.0003, int(numgames/10))
-        print("\nwhen t = 0.0006, d = 4, and n =", int(numgames/10))
-        test_connect_4(validAgents[4], lambda: alphabeta.ab_policy(times[0], 1, 4), validAgents[0], lambda: mcts.mcts_policy(times[0], 2), 0.0006, int(numgames/10))
-        print("\n")
-        test_connect_4(validAgents[0], lambda: mcts.mcts_policy(times[0], 1), validAgents[4], lambda: alphabeta.ab_policy(times[0], 2, 4), 0.0006, int(numgames/10))
+        run_plan(sweep_plan(numgames), workers, test, budget, instrument, book, baseSeed)
+
+    elif len(sys.argv) in (2, 3) and sys.argv[1] == 'bench' and (len(sys.argv) == 2 or sys.argv[2] == 'update'):
+        sys.exit(agentbench.main(update=len(sys.argv) == 3))
+
+    elif len(sys.argv) in (4, 5) and sys.argv[1] == 'book' and int(sys.argv[2]) >= 0 and int(sys.argv[3]) > 0:
+        path = sys.argv[4] if len(sys.argv) == 5 else openingbook.BOOK_FILE
+        entries = openingbook.build(path, int(sys.argv[2]), int(sys.argv[3]))
+        print("WROTE", entries, "POSITIONS TO", path)
 
+    elif len(sys.argv) >= 7 and sys.argv[1] == 'selfplay' and float(sys.argv[3]) > 0 and int(sys.argv[4]) > 0 and int(sys.argv[5]) > 0 and all(a.lower() in validAgents for a in sys.argv[6:]):
+        directory, t, n, d = sys.argv[2], float(sys.argv[3]), int(sys.argv[4]), int(sys.argv[5])
+        agents = [tournament.Agent(a.lower(), t, d, 0) for a in sys.argv[6:]]
+        matchups = [tournament.Matchup(p1, p2, n) for p1 in agents for p2 in agents]
+        records = selfplay.generate(matchups, directory, workers, baseSeed, book=book)
+        print("WROTE", records, "POSITIONS FROM", n * len(matchups), "GAMES TO", directory)
 
-    elif len(sys.argv) == 6 and float(sys.argv[3]) > 0 and int(sys.argv[4]) > 0 and (sys.argv[1].lower() in validAgents) and (sys.argv[2].lower() in validAgents) and int(sys.argv[5]) > 0:
-        # tried storing lambda functions as values in a dictionary to make it more legible but was difficult to return a function for each agent
+    elif len(sys.argv) in (6, 7) and float(sys.argv[3]) > 0 and int(sys.argv[4]) > 0 and (sys.argv[1].lower() in validAgents) and (sys.argv[2].lower() in validAgents) and int(sys.argv[5]) > 0:
         a1, a2, t, n, d = sys.argv[1].lower(), sys.argv[2].lower(), float(sys.argv[3]), int(sys.argv[4]), int(sys.argv[5])
-        if a1 == validAgents[0]: # mcts first agent
-            if a2 == validAgents[0]:
-                test_connect_4(validAgents[0], lambda: mcts.mcts_policy(t, 1), validAgents[0], lambda: mcts.mcts_policy(t, 2),  t, n)
-            elif a2 == validAgents[1]:
-                test_connect_4(validAgents[0], lambda: mcts.mcts_policy(t, 1), validAgents[1], lambda: uct0.uct0_policy(t, 2),  t, n)
-            elif a2 == validAgents[2]:
-                test_connect_4(validAgents[0], lambda: mcts.mcts_policy(t, 1), validAgents[2], lambda: uct1.uct1_policy(t, 2),  t, n)
-            elif a2 == validAgents[3]:
-                test_connect_4(validAgents[0], lambda: mcts.mcts_policy(t, 1), validAgents[3], lambda: uct2.uct2_policy(t, 2),  t, n)
-            elif a2 == validAgents[4]:
-                test_connect_4(validAgents[0], lambda: mcts.mcts_policy(t, 1), validAgents[4], lambda: alphabeta.ab_policy(t, 2, d),  t, n)
-        elif a1 == validAgents[1]: # uct0 first agent
-            if a2 == validAgents[0]:
-                test_connect_4(validAgents[1], lambda: uct0.uct0_policy(t, 1), validAgents[0], lambda: mcts.mcts_policy(t, 2),  t, n)
-            elif a2 == validAgents[1]:
-                test_connect_4(validAgents[1], lambda: uct0.uct0_policy(t, 1), validAgents[1], lambda: uct0.uct0_policy(t, 2),  t, n)
-            elif a2 == validAgents[2]:
-                test_connect_4(validAgents[1], lambda: uct0.uct0_policy(t, 1), validAgents[2], lambda: uct1.uct1_policy(t, 2),  t, n)
-            elif a2 == validAgents[3]:
-                test_connect_4(validAgents[1], lambda: uct0.uct0_policy(t, 1), validAgents[3], lambda: uct2.uct2_policy(t, 2),  t, n)
-            elif a2 == validAgents[4]:
-                test_connect_4(validAgents[1], lambda: uct0.uct0_policy(t, 1), validAgents[4], lambda: alphabeta.ab_policy(t, 2, d),  t, n)
-        elif a1 == validAgents[2]: # utc1 first agent
-            if a2 == validAgents[0]:
-                test_connect_4(validAgents[2], lambda: uct1.uct1_policy(t, 1), validAgents[0], lambda: mcts.mcts_policy(t, 2),  t, n)
-            elif a2 == validAgents[1]:
-                test_connect_4(validAgents[2], lambda: uct1.uct1_policy(t, 1), validAgents[1], lambda: uct0.uct0_policy(t, 2),  t, n)
-            elif a2 == validAgents[2]:
-                test_connect_4(validAgents[2], lambda: uct1.uct1_policy(t, 1), validAgents[2], lambda: uct1.uct1_policy(t, 2),  t, n)
-            elif a2 == validAgents[3]:
-                test_connect_4(validAgents[2], lambda: uct1.uct1_policy(t, 1), validAgents[3], lambda: uct2.uct2_policy(t, 2),  t, n)
-            elif a2 == validAgents[4]:
-                test_connect_4(validAgents[2], lambda: uct1.uct1_policy(t, 1), validAgents[4], lambda: alphabeta.ab_policy(t, 2, d),  t, n)
-        elif a1 == validAgents[3]: # uct2 first agent
-            if a2 == validAgents[0]:
-                test_connect_4(validAgents[3], lambda: uct2.uct2_policy(t, 1), validAgents[0], lambda: mcts.mcts_policy(t, 2),  t, n)
-            elif a2 == validAgents[1]:
-                test_connect_4(validAgents[3], lambda: uct2.uct2_policy(t, 1), validAgents[1], lambda: uct0.uct0_policy(t, 2),  t, n)
-            elif a2 == validAgents[2]:
-                test_connect_4(validAgents[3], lambda: uct2.uct2_policy(t, 1), validAgents[2], lambda: uct1.uct1_policy(t, 2),  t, n)
-            elif a2 == validAgents[3]:
-                test_connect_4(validAgents[3], lambda: uct2.uct2_policy(t, 1), validAgents[3], lambda: uct2.uct2_policy(t, 2),  t, n)
-            elif a2 == validAgents[4]:
-                test_connect_4(validAgents[3], lambda: uct2.uct2_policy(t, 1), validAgents[4], lambda: alphabeta.ab_policy(t, 2, d),  t, n)
-        elif a1 == validAgents[4]: # ab first agent
-            if a2 == validAgents[0]:
-                test_connect_4(validAgents[4], lambda: alphabeta.ab_policy(t, 1, d), validAgents[0], lambda: mcts.mcts_policy(t, 2),  t, n)
-            elif a2 == validAgents[1]:
-                test_connect_4(validAgents[4], lambda: alphabeta.ab_policy(t, 1, d), validAgents[1], lambda: uct0.uct0_policy(t, 2),  t, n)
-            elif a2 == validAgents[2]:
-                test_connect_4(validAgents[4], lambda: alphabeta.ab_policy(t, 1, d), validAgents[2], lambda: uct1.uct1_policy(t, 2),  t, n)
-            elif a2 == validAgents[3]:
-                test_connect_4(validAgents[4], lambda: alphabeta.ab_policy(t, 1, d), validAgents[3], lambda: uct2.uct2_policy(t, 2),  t, n)
-            elif a2 == validAgents[4]:
-                test_connect_4(validAgents[4], lambda: alphabeta.ab_policy(t, 1, d), validAgents[4], lambda: alphabeta.ab_policy(t, 2, d),  t, n)
+        s = int(sys.argv[6]) if len(sys.argv) == 7 else 0
+        run_plan([tournament.Matchup(tournament.Agent(a1, t, d, s), tournament.Agent(a2, t, d, s), n)], workers, test, budget, instrument, book, baseSeed)
 
     else: 
         print("To compare all agents against baseline MCTS at various times: \n./Connect4 all number_of_games")
         print("\te.g. ./Connect4 all 1000")
-        print("\nTo compare individual agents: \n./Connect4 agent1 agent2 t n d")
+        print("\nTo measure the speed of every agent on fixed positions: \n./Connect4 bench")
+        print("\twrites bench_results.json and fails if an agent's p99 latency is over its time or it regressed against bench_baseline.json. './Connect4 bench update' stores a new baseline")
+        print("\nTo build an opening book of every position with at most p discs, solved or else searched to depth d: \n./Connect4 book p d [file]")
+        print("\te.g. ./Connect4 book 4 6 writes " + openingbook.BOOK_FILE)
+        print("\nTo record self-play games for training and analysis: \n./Connect4 selfplay directory t n d agent1 agent2 [agent...]")
+        print("\te.g. ./Connect4 selfplay games 0.001 100 4 uct2 alphabeta plays n games of every ordered pairing of the agents, each against itself included, and appends every position to the shards in games")
+        print("\nOptions, added at the end of either command:")
+        print("\t-w workers - number of processes playing games at once. defaults to one per CPU")
+        print("\t-sprt error - stop each matchup once a sequential probability ratio test decides the stronger agent with this error rate, e.g. 0.05. n becomes the most games per matchup")
+        print("\t-budget games - most games over all matchups; with -sprt, games go first to the matchups they are expected to tell apart fastest")
+        print("\t-book file - every agent plays the opening book's move in the positions it covers instead of searching")
+        print("\t-seed n - seed of the whole run, so repeated runs play different games. defaults to 0")
+        print("\t-stats - count iterations, playouts, nodes, cutoffs and table hits and time each search phase, printed per player and matchup")
+        print("\nTo compare individual agents: \n./Connect4 agent1 agent2 t n d [s]")
         print("\te.g. ./Connect4 uct2 alphabeta 0.0004 1000 4")
-        print("\tagents 1/2 - strings corresponding desired agents utilizing the following algorithms: 'mcts', 'uct0', 'uct1', 'uct2', 'alphabeta'")
+        print("\tagents 1/2 - strings corresponding desired agents utilizing the following algorithms: 'mcts', 'uct0', 'uct1', 'uct2', 'alphabeta', 'solver'")
         print("\tt - double value representing the time in seconds allowed for each tree search. greater than 0. recommended between 0.0002 to 0.001")
         print("\tn - integer value representing the number of games played by agents. greater than 0. recommended between 100 to 1000")
         print("\td - interger value representing max searchable depth for alphabeta, enter arbitrary integer when not comparing alphabeta")
+        print("\ts - optional integer number of empty cells at which mcts, uct0, uct1 and uct2 switch to the exact solver. defaults to 0, never")
     
\ No newline at end of file
@@ -0,0 +1,22 @@
+# File: test_agentbench.py
+# Date: October 18, 2026
+# Description: Tests of the time budget checked by the agent benchmark.
+
+import agentbench
+
+def bench_results(p95ms, p99ms):
+    """ Returns run_bench results of one agent with the given latencies and
+    10ms per move.
+    """
+    metrics = {'moves': 50, 'playoutsPerSec': None, 'nodesPerSec': 1000.0, 'treeSize': None,
+               'p50ms': 9.5, 'p95ms': p95ms, 'p99ms': p99ms}
+    return {'settings': {'t': 0.01, 'count': 50, 'seed': 0, 'd': 4, 'repeats': 3}, 'agents': {'solver': metrics}}
+
+def test_over_budget():
+    """ Latencies within their slack of the time per move pass, and p95 or
+    p99 latency past its slack is reported.
+    """
+    assert agentbench.over_budget(bench_results(10.4, 12.9)) == []
+    assert len(agentbench.over_budget(bench_results(11.5, 11.65))) == 1
+    assert len(agentbench.over_budget(bench_results(10.2, 13.5))) == 1
+    assert len(agentbench.over_budget(bench_results(11.0, 14.0))) == 2
@@ -0,0 +1,57 @@
+# File: test_alphabeta.py
+# Date: October 18, 2026
+# Description: Tests of alpha-beta and principal variation search against
+# each other and against plain minimax.
+
+import alphabeta
+import benchmark
+from transposition import TranspositionTable
+
+def minimax(tree, state, depth, cActor):
+    """ Returns the minimax value of the given state for cActor in the value
+    frame of abTree.alphabeta, searching every move without pruning.
+
+    tree -- abTree whose heuristic scores the leaves
+    state -- game state
+    depth -- maximum tree depth
+    cActor -- player the values are for
+    """
+    isTerm, val = state.is_terminal()
+    if isTerm:
+        return (alphabeta.WIN_SCORE + depth) * (val if cActor == 1 else -val)
+    if depth == 0:
+        score = tree.heuristic(state)
+        return score if state.actor1 == cActor else -score
+    values = [minimax(tree, state.successor(a), depth - 1, cActor) for a in state.get_actions()]
+    return max(values) if state.actor1 == cActor else min(values)
+
+def searches(st, depth, pvs):
+    """ Returns the trees searching the given state to the given depth with
+    neither table nor ordering, with a new table only, and with a new table
+    and move ordering.
+    """
+    return [alphabeta.abTree(st, depth, None, None, (), None, pvs=pvs),
+            alphabeta.abTree(st, depth, TranspositionTable(1 << 20), None, (), None, pvs=pvs),
+            alphabeta.abTree(st, depth, TranspositionTable(1 << 20), None, (), alphabeta.MoveOrdering(), pvs=pvs)]
+
+def test_pvs_matches_alphabeta():
+    """ PVS finds the move and value of alphabeta at depths 2 to 5, with and
+    without a table and move ordering.
+    """
+    for st in benchmark.sample_positions(8, 2, 30, seed=11):
+        for depth in (2, 3, 4, 5):
+            for plain, principal in zip(searches(st, depth, False), searches(st, depth, True)):
+                assert principal.best_move == plain.best_move
+
+def test_alphabeta_matches_minimax():
+    """ Alpha-beta finds the minimax value at depths 1 to 3 with and without
+    a table and move ordering, and without them also the first move that
+    reaches it.
+    """
+    for st in benchmark.sample_positions(8, 2, 30, seed=12):
+        for depth in (1, 2, 3):
+            trees = searches(st, depth, False)
+            values = [minimax(trees[0], st.successor(a), depth - 1, st.actor1) for a in st.get_actions()]
+            assert trees[0].best_move == (max(values), values.index(max(values)))
+            for tree in trees[1:]:
+                assert tree.best_move[0] == max(values)
@@ -0,0 +1,61 @@
+# File: test_bitboard.py
+# Date: October 18, 2026
+# Description: Tests of the bitboard Connect 4 states against the original
+# array implementation, and of making and unmaking moves in place.
+
+import random
+import numpy as np
+import connect4
+
+def test_bitboard_matches_array_states():
+    """ Over seeded random games, the bitboard state, the array state and a
+    state changed in place with make agree after every move on the legal
+    actions, terminal test, payoff, board and player to move, and the
+    bitboard state equals and hashes like one rebuilt from the array.
+    """
+    rng = random.Random(0)
+    for _ in range(150):
+        st = connect4.Connect4().initial_state()
+        arr = connect4.Connect4Array().initial_state()
+        made = connect4.Connect4().initial_state()
+        while True:
+            assert st.get_actions() == arr.get_actions()
+            assert st.is_terminal() == arr.is_terminal()
+            assert st.payoff() == arr.payoff()
+            assert np.array_equal(st.board, arr.board)
+            assert st.actor() == arr.actor()
+            rebuilt = connect4.Connect4.State(arr.board, arr.actor())
+            assert rebuilt == st and hash(rebuilt) == hash(st)
+            assert made == st and hash(made) == hash(st)
+            assert made.is_terminal() == st.is_terminal() and np.array_equal(made.board, st.board)
+            if st.is_terminal()[0]:
+                break
+            action = rng.choice(st.get_actions())
+            st = st.successor(action)
+            arr = arr.successor(action)
+            made.make(action)
+
+def test_make_unmake_round_trip():
+    """ Making every legal move gives its successor and unmaking it restores
+    the position, and unmaking a whole game restores the initial state.
+    """
+    rng = random.Random(1)
+    initial = connect4.Connect4().initial_state()
+    for _ in range(50):
+        st = connect4.Connect4().initial_state()
+        played = 0
+        while not st.is_terminal()[0]:
+            before = (st.key, list(st.discs), list(st.heights), st.moves, st.last, st.actor1)
+            board = st.board.copy()
+            reference = st.copy()
+            for action in st.get_actions():
+                st.make(action)
+                assert st == reference.successor(action)
+                st.unmake()
+                assert (st.key, st.discs, st.heights, st.moves, st.last, st.actor1) == before
+                assert np.array_equal(st.board, board)
+            st.make(rng.choice(st.get_actions()))
+            played += 1
+        for _ in range(played):
+            st.unmake()
+        assert st == initial and st.heights == initial.heights and st.moves == 0
@@ -0,0 +1,33 @@
+# File: test_earlystop.py
+# Date: October 18, 2026
+# Description: Tests of the early stop rules and of the policies using them.
+
+import random
+import pytest
+import connect4
+import earlystop
+import mcts
+import uct0
+import uct1
+import uct2
+
+def test_rule_must_decide():
+    """ The base rule is abstract; the rules implementing decided are not.
+    """
+    with pytest.raises(TypeError):
+        earlystop.EarlyStop()
+    earlystop.VisitMargin()
+    earlystop.ConfidenceBound()
+
+def test_policies_play_from_finished_stats():
+    """ With an auditing rule, every policy plays the move chosen from the
+    root statistics the rule returns, and exposes those statistics.
+    """
+    st = connect4.Connect4().initial_state().successor(3)
+    for make in (mcts.mcts_policy, uct0.uct0_policy, uct1.uct1_policy, uct2.uct2_policy):
+        random.seed(1)
+        rule = earlystop.VisitMargin(checkEvery=8, audit=True)
+        policy = make(0.02, st.actor(), earlyStop=rule)
+        move = policy(st)
+        assert rule.moves == 1
+        assert move == earlystop.choose(policy.rootStats, True)
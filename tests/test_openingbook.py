@@ -0,0 +1,92 @@
+# File: test_openingbook.py
+# Date: October 18, 2026
+# Description: Tests of the opening book and of the alpha-beta values it is
+# built from.
+
+import random
+import connect4
+import alphabeta
+import solver
+import openingbook
+
+def opening(moves):
+    """ Returns the state reached by playing the given columns from the
+    initial state.
+    """
+    st = connect4.Connect4().initial_state()
+    for action in moves:
+        st = st.successor(action)
+    return st
+
+def test_player_two_book_move_matches_solver(tmp_path):
+    """ In a position where player 2 wins at once, the book move is a winning
+    move as the solver finds it, for the position and its mirror image, and
+    the value is a win for the player to move.
+    """
+    st = opening([0, 1, 0, 1, 6, 1, 5])
+    assert st.actor() == 2
+    path = str(tmp_path / 'book.bin')
+    openingbook.build(path, depth=4, positions=[st])
+    book = openingbook.OpeningBook(path)
+    move, value = book.lookup(st)
+    solved = solver.Solver().best_move(st)
+    assert solved[1] > 0 and value == 1
+    assert st.successor(move).payoff() == -1
+    assert book.lookup(st.mirrored()) == (connect4.mirror_action(move), value)
+    book.close()
+
+def test_searched_entries_block_for_player_two(tmp_path):
+    """ Without time for the solver, the search still blocks player 1's three
+    in a column when player 2 is to move.
+    """
+    st = opening([3, 0, 3, 0, 3])
+    path = str(tmp_path / 'book.bin')
+    openingbook.build(path, depth=4, solveSeconds=0, positions=[st])
+    book = openingbook.OpeningBook(path)
+    move, value = book.lookup(st)
+    assert move == 3 and -1 <= value <= 1
+    book.close()
+
+def test_small_book_covers_its_plies(tmp_path):
+    """ Every position with at most the book's plies is found with a legal
+    move and a value in [-1, 1], and positions beyond them are not.
+    """
+    path = str(tmp_path / 'book.bin')
+    entries = openingbook.build(path, plies=2, depth=2)
+    book = openingbook.OpeningBook(path)
+    assert len(book) == entries == len(openingbook.book_positions(2))
+    layer = [opening([])]
+    for _ in range(3):
+        for st in layer:
+            move, value = book.lookup(st)
+            assert st.is_legal(move) and -1 <= value <= 1
+        layer = [st.successor(a) for st in layer for a in st.get_actions()]
+    assert book.lookup(layer[0]) == None
+    book.close()
+
+def test_alphabeta_takes_immediate_wins():
+    """ Alpha-beta and PVS play an immediate win at every depth for either
+    player, with the value of a win for the player to move.
+    """
+    for moves in ([0, 1, 0, 1, 6, 1, 5], [0, 1, 0, 1, 0, 6]):
+        st = opening(moves)
+        for depth in (1, 2, 3, 4):
+            for pvs in (False, True):
+                tree = alphabeta.abTree(st, depth, None, pvs=pvs)
+                assert st.successor(st.get_actions()[tree.best_move[1]]).is_terminal()[0]
+                assert tree.best_move[0] >= alphabeta.WIN_SCORE
+
+def test_book_does_not_depend_on_position_order(tmp_path):
+    """ Searching the positions in ascending, descending or shuffled order
+    writes the same book, although the players to move alternate.
+    """
+    positions = openingbook.book_positions(3)
+    shuffled = positions[:]
+    random.Random(1).shuffle(shuffled)
+    books = []
+    for i, order in enumerate((positions, list(reversed(positions)), shuffled)):
+        path = str(tmp_path / ('book%d.bin' % i))
+        openingbook.build(path, depth=5, solveSeconds=0, positions=order)
+        with open(path, 'rb') as f:
+            books.append(f.read())
+    assert books[0] == books[1] == books[2]
@@ -0,0 +1,64 @@
+# File: test_selfplay.py
+# Date: October 18, 2026
+# Description: Round-trip tests of the self-play record shards.
+
+import os
+import numpy as np
+import connect4
+import selfplay
+import tournament
+
+def small_run(directory, baseSeed):
+    """ Plays two short games, uct2 against alphabeta, in this process into
+    shards of 16 records and returns the number of records written.
+    """
+    uct = tournament.Agent('uct2', 0.002, 2, 0)
+    ab = tournament.Agent('alphabeta', 0.002, 2, 0)
+    matchups = [tournament.Matchup(uct, ab, 1), tournament.Matchup(ab, uct, 1)]
+    return selfplay.generate(matchups, directory, workers=1, baseSeed=baseSeed, shardRecords=16)
+
+def test_records_round_trip(tmp_path):
+    """ The records read back one chunk at a time and memory-mapped are the
+    same, every shard but the last is full, uct2's moves keep their visits
+    and values while alphabeta's have none, and record_state rebuilds every
+    position: each game starts from the initial state and each record's
+    move leads to the next record's position.
+    """
+    directory = str(tmp_path)
+    written = small_run(directory, 0)
+    read = np.concatenate(list(selfplay.iter_records(directory, chunk=5)))
+    mapped = np.concatenate(selfplay.map_shards(directory))
+    assert len(read) == written == len(mapped)
+    assert read.tobytes() == mapped.tobytes()
+    assert read.dtype.itemsize == 58
+    paths = selfplay.shard_paths(directory)
+    assert len(paths) > 1 and all(selfplay.shard_records(path) == 16 for path in paths[:-1])
+    searched = read['visits'].sum(axis=1) > 0
+    assert searched.any() and not np.isnan(read['value'][searched]).any()
+    assert np.isnan(read['value'][~searched]).all()
+    st = None
+    for rec in read:
+        rebuilt = selfplay.record_state(rec)
+        assert rebuilt.discs[1] == rec['p1'] and rebuilt.discs[2] == rec['p2'] and rebuilt.actor() == rec['actor']
+        if rec['ply'] == 0:
+            assert rebuilt == connect4.Connect4().initial_state()
+        else:
+            assert rebuilt == st
+        assert rebuilt.moves == rec['ply'] and rebuilt.is_legal(int(rec['move']))
+        st = rebuilt.successor(int(rec['move']))
+    assert st.is_terminal()[0]
+
+def test_appending_keeps_earlier_records(tmp_path):
+    """ A second run appends to the last shard without changing the records
+    already written, and a record cut short in between is dropped.
+    """
+    directory = str(tmp_path)
+    first = small_run(directory, 0)
+    before = np.concatenate(list(selfplay.iter_records(directory))).tobytes()
+    with open(selfplay.shard_paths(directory)[-1], 'ab') as f:
+        f.write(b'\x01' * 10)
+    second = small_run(directory, 1)
+    after = np.concatenate(list(selfplay.iter_records(directory)))
+    assert len(after) == first + second
+    assert after.tobytes()[:len(before)] == before
+    assert all(os.path.getsize(path) % selfplay.RECORD.itemsize == 0 for path in selfplay.shard_paths(directory))
@@ -0,0 +1,64 @@
+# File: test_solver.py
+# Date: October 18, 2026
+# Description: Tests of the exact solver against brute-force minimax on
+# endgame positions.
+
+import connect4
+import solver
+import benchmark
+
+def brute_force(state, memo):
+    """ Returns the score of the nonterminal state for the player to move by
+    searching every move, in the solver's scoring: a win with the disc
+    played at move m scores (CELLS + 1 - m) // 2, a loss the negation of the
+    winner's score, and a draw 0.
+
+    state -- nonterminal Connect4 state
+    memo -- dict of the scores already found, keyed by state
+    """
+    if state in memo:
+        return memo[state]
+    best = None
+    for action in state.get_actions():
+        child = state.successor(action)
+        isTerm, val = child.is_terminal()
+        if isTerm:
+            score = (connect4.CELLS + 1 - state.moves) // 2 if val != 0 else 0
+        else:
+            score = -brute_force(child, memo)
+        if best == None or score > best:
+            best = score
+    memo[state] = best
+    return best
+
+def endgames():
+    """ Returns seeded nonterminal positions with 6 to 10 empty cells.
+    """
+    return benchmark.sample_positions(40, connect4.CELLS - 10, connect4.CELLS - 6, seed=15)
+
+def test_solve_matches_brute_force():
+    """ solve finds the brute-force score of every endgame.
+    """
+    memo = dict()
+    search = solver.Solver()
+    for st in endgames():
+        assert connect4.CELLS - st.moves <= 10
+        position = st.discs[st.actor1]
+        mask = st.discs[1] | st.discs[2]
+        assert search.solve(position, mask, st.moves) == brute_force(st, memo)
+
+def test_best_move_keeps_solved_value():
+    """ best_move returns the brute-force score and a legal move that keeps
+    it: an immediate win, or a child whose score is its negation.
+    """
+    memo = dict()
+    search = solver.Solver()
+    for st in endgames():
+        move, score = search.best_move(st)
+        assert st.is_legal(move) and score == brute_force(st, memo)
+        child = st.successor(move)
+        isTerm, val = child.is_terminal()
+        if isTerm:
+            assert score == ((connect4.CELLS + 1 - st.moves) // 2 if val != 0 else 0)
+        else:
+            assert -brute_force(child, memo) == score
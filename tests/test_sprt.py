@@ -0,0 +1,56 @@
+# File: test_sprt.py
+# Date: October 18, 2026
+# Description: Tests that the sequential probability ratio test stops at the
+# bounds set by its error rates.
+
+import math
+import sprt
+
+def test_bounds_and_steps():
+    """ The bounds are Wald's, log(beta / (1 - alpha)) and
+    log((1 - beta) / alpha), and a win and a loss move the ratio by
+    log(p1 / p0) and log((1 - p1) / (1 - p0)).
+    """
+    test = sprt.SPRT(alpha=0.05, beta=0.1, delta=0.1)
+    assert math.isclose(test.lower, math.log(0.1 / 0.95))
+    assert math.isclose(test.upper, math.log(0.9 / 0.05))
+    assert math.isclose(test.llr(1, 0), math.log(0.6 / 0.4))
+    assert math.isclose(test.llr(0, 1), math.log(0.4 / 0.6))
+    assert math.isclose(test.llr(5, 3), 2 * math.log(1.5))
+
+def test_stops_at_known_counts():
+    """ With alpha = beta = 0.05 and delta = 0.1 both bounds are log(19),
+    crossed at a lead of 8 decisive games since 7 * log(1.5) < log(19) <
+    8 * log(1.5).
+    """
+    test = sprt.SPRT(alpha=0.05, beta=0.05, delta=0.1)
+    assert 7 * math.log(1.5) < math.log(19) < 8 * math.log(1.5)
+    assert test.decision(0, 0) == 0
+    assert test.decision(7, 0) == 0 and test.decision(8, 0) == 1
+    assert test.decision(0, 7) == 0 and test.decision(0, 8) == -1
+    assert test.decision(19, 12) == 0 and test.decision(20, 12) == 1
+    assert test.decision(12, 19) == 0 and test.decision(12, 20) == -1
+
+def test_first_crossing_of_a_sequence():
+    """ Fed the games of a match one at a time, the test decides on the first
+    game that takes the lead to 8, and a wider delta decides sooner.
+    """
+    results = [1, 1, 0, 1, 1, 1, 0, 1, 1, 1, 1, 1, 1, 1, 0, 1]
+    for test, lead in ((sprt.SPRT(delta=0.1), 8), (sprt.SPRT(delta=0.2), 4)):
+        wins, losses, stopped = 0, 0, None
+        for game, won in enumerate(results):
+            wins += won
+            losses += 1 - won
+            if test.decision(wins, losses) != 0:
+                stopped = game
+                break
+        assert test.decision(wins, losses) == 1 and wins - losses == lead
+        assert all(sum(results[:g + 1]) * 2 - (g + 1) < lead for g in range(stopped))
+
+def test_information_prefers_lopsided_matchups():
+    """ One more game is expected to move a lopsided matchup further than an
+    even one, and ties carry no information.
+    """
+    test = sprt.SPRT()
+    assert test.information(9, 1, 0) > test.information(5, 5, 0)
+    assert test.information(9, 1, 0) > test.information(9, 1, 10)
@@ -0,0 +1,84 @@
+# File: test_symmetry.py
+# Date: October 18, 2026
+# Description: Tests of the tables shared by a position and its mirror image.
+
+import random
+import connect4
+import uct1
+import uct2
+import alphabeta
+import benchmark
+from transposition import TranspositionTable
+
+def opening(moves):
+    """ Returns the state reached by playing the given columns from the
+    initial state.
+    """
+    st = connect4.Connect4().initial_state()
+    for action in moves:
+        st = st.successor(action)
+    return st
+
+def test_canonical_key_is_shared_by_mirror_images():
+    """ A position and its mirror image have one canonical key and state, and
+    exactly one of them is mirrored unless the position is symmetric.
+    """
+    for st in benchmark.sample_positions(50, 1, 20, seed=3):
+        mirror = st.mirrored()
+        key, mirrored = st.canonical_key()
+        mirrorKey, mirrorMirrored = mirror.canonical_key()
+        assert key == mirrorKey
+        assert st.canonical()[0] == mirror.canonical()[0]
+        if mirror == st:
+            assert mirrored == mirrorMirrored
+        else:
+            assert mirrored != mirrorMirrored
+        for action in st.get_actions():
+            assert mirror.successor(connect4.mirror_action(action)) == st.successor(action).mirrored()
+
+def test_uct_tables_find_every_child():
+    """ Every child of an expanded state of a symmetric uct1 or uct2 table is
+    found under the orientation the table keeps it in.
+    """
+    for implicit in (uct1.uct1implicit, uct2.uct2implicit):
+        random.seed(0)
+        tree = implicit(opening([2]))
+        tree.step(3000)
+        assert tree.hits > 0
+        for st, vals in tree.stateList.items():
+            for action in st.get_actions()[:len(vals[0])]:
+                assert tree.canonical(st.successor(action)) in tree.stateList
+            if implicit == uct2.uct2implicit:
+                assert all(child in tree.stateList for child, _ in vals[4])
+
+def test_uct_root_stats_of_mirror_image():
+    """ Searching a position's mirror image with the same seed reports the
+    same root statistics under mirrored actions.
+    """
+    st = opening([1, 3, 2])
+    for implicit in (uct1.uct1implicit, uct2.uct2implicit):
+        results = []
+        for root in (st, st.mirrored()):
+            random.seed(5)
+            tree = implicit(root)
+            tree.step(2000)
+            results.append(tree.root_stats())
+        assert results[1] == {connect4.mirror_action(a): stats for a, stats in results[0].items()}
+
+def test_alphabeta_table_move_of_mirror_image():
+    """ The table entry stored by searching a position gives its mirror image
+    the same value and the mirrored move.
+    """
+    for st in benchmark.sample_positions(10, 3, 12, seed=6):
+        if st.mirrored() == st:
+            continue
+        table = TranspositionTable(1 << 20)
+        tree = alphabeta.abTree(st, 4, table, None, (), alphabeta.MoveOrdering())
+        mirrorTree = alphabeta.abTree(st.mirrored(), 4, table, None, (), alphabeta.MoveOrdering())
+        assert mirrorTree.best_move[0] == tree.best_move[0]
+        assert st.mirrored().get_actions()[mirrorTree.best_move[1]] == connect4.mirror_action(st.get_actions()[tree.best_move[1]])
+
+def test_uct2_selection_benchmark_runs():
+    """ The uct2-selection benchmark looks up children in a symmetric table.
+    """
+    benchmark.bench_uct2_selection(iterations=300, seconds=0.01)
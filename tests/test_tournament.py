@@ -0,0 +1,70 @@
+# File: test_tournament.py
+# Date: October 18, 2026
+# Description: Tests that the games of a tournament are seeded independently
+# of the worker count, and that matchups stop once the SPRT decides them.
+
+import random
+import playout
+import sprt
+import tournament
+
+def seeded_game(p1_policy, p2_policy):
+    """ Stands in for play_game with a result drawn from both generators
+    play_job seeds, so equal results mean equal seeds.
+    """
+    payoff = random.choice((-1, 0, 1))
+    moves = int(playout.rng.integers(4, 22))
+    return (payoff, moves, moves - 1, 0, 0)
+
+def always_p1(p1_policy, p2_policy):
+    """ Stands in for play_game with a game Player 1 wins in 4 moves.
+    """
+    return (1, 4, 3, 0, 0)
+
+def outcomes(tallies):
+    """ Returns the counts of every tally, leaving out the move times.
+    """
+    return [(t.played, t.p1_wins, t.p2_wins, t.ties, t.p1WinMoves, t.p2WinMoves) for t in tallies]
+
+def test_game_seed_fixed_by_its_arguments():
+    """ The seed depends on the tournament seed, both agents, their order and
+    the game number, and on nothing else.
+    """
+    a = tournament.Agent('alphabeta', 0.01, 2, 0)
+    b = tournament.Agent('uct2', 0.01, 2, 0)
+    seeds = [tournament.game_seed(0, a, b, game) for game in range(20)]
+    assert seeds == [tournament.game_seed(0, a, b, game) for game in range(20)]
+    assert len(set(seeds)) == 20
+    assert tournament.game_seed(1, a, b, 0) != seeds[0]
+    assert tournament.game_seed(0, b, a, 0) != seeds[0]
+
+def test_results_do_not_depend_on_worker_count(monkeypatch):
+    """ Games whose results come from the seeded generators give the same
+    tallies in this process and over two workers, and a tiny alpha-beta
+    match does too.
+    """
+    a = tournament.Agent('alphabeta', 1, 1, 0)
+    b = tournament.Agent('alphabeta', 1, 2, 0)
+    matchups = [tournament.Matchup(a, b, 2), tournament.Matchup(b, a, 2)]
+    single = outcomes(tournament.run(matchups, workers=1, baseSeed=3))
+    assert single == outcomes(tournament.run(matchups, workers=2, baseSeed=3))
+    monkeypatch.setattr(tournament, 'play_game', seeded_game)
+    matchups = [tournament.Matchup(a, b, 12), tournament.Matchup(b, a, 12)]
+    single = outcomes(tournament.run(matchups, workers=1, baseSeed=3))
+    assert single == outcomes(tournament.run(matchups, workers=2, baseSeed=3))
+    assert single != outcomes(tournament.run(matchups, workers=1, baseSeed=4))
+    assert all(played == 12 for played, *_ in single)
+
+def test_sprt_ends_decided_matchup(monkeypatch):
+    """ A matchup Player 1 wins every game of is declared for Player 1 after
+    its minimum games, and only the games already started are played after
+    that.
+    """
+    monkeypatch.setattr(tournament, 'play_game', always_p1)
+    a = tournament.Agent('alphabeta', 1, 1, 0)
+    b = tournament.Agent('alphabeta', 1, 2, 0)
+    test = sprt.SPRT()
+    workers = 2
+    tally, = tournament.run([tournament.Matchup(a, b, 100)], workers=workers, test=test)
+    assert tally.decision == 1 and tally.done()
+    assert test.minGames <= tally.played < test.minGames + 2 * workers
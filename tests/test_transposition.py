@@ -0,0 +1,42 @@
+# File: test_transposition.py
+# Date: October 18, 2026
+# Description: Tests of the transposition table and of the entries alpha-beta
+# stores in it.
+
+import connect4
+import alphabeta
+import benchmark
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+def test_store_probe_and_replacement():
+    """ Entries are found by key only, a shallower search of another
+    position sharing the slot does not replace a deeper one, the same
+    position always does, and clear empties the table.
+    """
+    table = TranspositionTable(10 * 19)
+    size = table.size
+    assert table.probe(5) == None
+    table.store(5, 1.5, 4, EXACT, 3)
+    assert table.probe(5) == (1.5, 4, EXACT, 3)
+    assert table.probe(5 + size) == None
+    table.store(5 + size, -2.0, 2, LOWER, 1)
+    assert table.probe(5) == (1.5, 4, EXACT, 3)
+    table.store(5, 0.5, 1, UPPER, 6)
+    assert table.probe(5) == (0.5, 1, UPPER, 6)
+    table.store(5 + size, -2.0, 2, LOWER, 1)
+    assert table.probe(5) == None and table.probe(5 + size) == (-2.0, 2, LOWER, 1)
+    table.clear()
+    assert table.probe(5 + size) == None
+    assert table.hits == 4
+
+def test_root_entry_holds_search_result():
+    """ After a search, the root's entry holds the exact value and best move
+    found, under the orientation of its canonical key.
+    """
+    for st in benchmark.sample_positions(10, 2, 20, seed=14):
+        table = TranspositionTable(1 << 20)
+        tree = alphabeta.abTree(st, 4, table, None, (), alphabeta.MoveOrdering())
+        key, mirrored = st.canonical_key()
+        value, depth, flag, move = table.probe(key)
+        assert (value, depth, flag) == (tree.best_move[0], 4, EXACT)
+        assert (connect4.mirror_action(move) if mirrored else move) == st.get_actions()[tree.best_move[1]]
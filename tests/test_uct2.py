@@ -0,0 +1,74 @@
+# File: test_uct2.py
+# Date: October 18, 2026
+# Description: Tests of the uct2 state table.
+
+import math
+import random
+import connect4
+import uct2
+
+def opening(moves):
+    """ Returns the state reached by playing the given columns from the
+    initial state.
+    """
+    st = connect4.Connect4().initial_state()
+    for action in moves:
+        st = st.successor(action)
+    return st
+
+def test_child_means_are_payoffs():
+    """ Every child an entry references is the entry the table keeps for
+    that child, and its mean reward, in the whole table and at the root,
+    is a mean of payoffs in [-1, 1], also for children reached through
+    several parents and through their mirror image.
+    """
+    for symmetric in (False, True):
+        for root in (opening([]), opening([3, 3, 2, 4])):
+            random.seed(0)
+            tree = uct2.uct2implicit(root, symmetric=symmetric)
+            tree.step(20000)
+            assert tree.hits > 0
+            for vals in tree.stateList.values():
+                for child, childVals in vals[4]:
+                    assert tree.stateList[child] is childVals
+                    assert childVals[1] > 0 and -1 <= childVals[3] / childVals[1] <= 1
+            for visits, reward in tree.root_stats().values():
+                assert -1 <= reward / visits <= 1
+
+def test_selection_reads_child_values():
+    """ Selection picks the child with the best value of the child state
+    itself plus the exploration term of the edge, as looking up every
+    child state does.
+    """
+    random.seed(3)
+    tree = uct2.uct2implicit(opening([3]))
+    tree.step(3000)
+    for st, vals in tree.stateList.items():
+        if vals[2] == False and len(vals[0]) > 0 and not st.is_terminal()[0]:
+            sign = 1 if st.actor() == 1 else -1
+            scores = [sign * childVals[3] / childVals[1] + math.sqrt(2 * math.log(vals[1]) / visits)
+                      for visits, (_, childVals) in zip(vals[0], vals[4])]
+            assert scores[tree.ucb(st)] == max(scores)
+
+def test_edge_visits_add_up():
+    """ The visits of a state are its first visit, unless it is the root,
+    plus the visits through each of its edges.
+    """
+    random.seed(1)
+    tree = uct2.uct2implicit(opening([3]))
+    tree.step(5000)
+    for st, vals in tree.stateList.items():
+        if not st.is_terminal()[0]:
+            assert vals[1] == sum(vals[0]) + (0 if st == tree.rootState else 1)
+
+def test_policy_plays_legal_moves():
+    """ The policy returns a legal move for each player, with its root
+    statistics in range.
+    """
+    st = opening([3, 2])
+    for actor in (1, 2):
+        random.seed(2)
+        policy = uct2.uct2_policy(0.05, actor)
+        move = policy(st)
+        assert st.is_legal(move)
+        assert all(-1 <= reward / visits <= 1 for visits, reward in policy.rootStats.values())
@@ -0,0 +1,259 @@
+# File: tournament.py
+# Date: October 18, 2026
+# Description: Plays the games of one or many matchups across a pool of
+# processes. Every game is seeded from the agents and its number alone, so
+# the seeds do not depend on how many workers share the games, and each
+# matchup's result is tallied as its games finish.
+
+import os
+import time
+import queue
+import random
+import multiprocessing
+from collections import namedtuple
+import connect4
+import playout
+import mcts
+import uct0
+import uct1
+import uct2
+import alphabeta
+import solver
+import openingbook
+from searchstats import SearchStats
+
+# agent -- one of 'mcts', 'uct0', 'uct1', 'uct2', 'alphabeta', 'solver'
+# t -- time allowed per move in seconds
+# d -- max searchable depth for alphabeta
+# s -- empty cells at which mcts and the uct agents hand over to the solver
+Agent = namedtuple('Agent', ['agent', 't', 'd', 's'])
+Matchup = namedtuple('Matchup', ['p1', 'p2', 'games'])
+
+def policy_factory(agent, t, actor, d, s=0, stats=None, book=None):
+    """ Returns a function that creates a new policy for the given agent, as
+    compare_policies expects.
+
+    agent -- one of 'mcts', 'uct0', 'uct1', 'uct2', 'alphabeta', 'solver'
+    t -- time allowed per move in seconds
+    actor -- player the policy moves for, 1 or 2
+    d -- max searchable depth for alphabeta
+    s -- empty cells at which mcts and the uct agents hand over to the solver
+    stats -- searchstats.SearchStats the policies report into, or None
+    book -- openingbook.OpeningBook the policies play from before searching,
+            or None
+    """
+    if agent == 'mcts':
+        return lambda: mcts.mcts_policy(t, actor, solveBelow=s, stats=stats, book=book)
+    elif agent == 'uct0':
+        return lambda: uct0.uct0_policy(t, actor, solveBelow=s, stats=stats, book=book)
+    elif agent == 'uct1':
+        return lambda: uct1.uct1_policy(t, actor, solveBelow=s, stats=stats, book=book)
+    elif agent == 'uct2':
+        return lambda: uct2.uct2_policy(t, actor, solveBelow=s, stats=stats, book=book)
+    elif agent == 'alphabeta':
+        return lambda: alphabeta.ab_policy(t, actor, d, stats=stats, book=book)
+    elif agent == 'solver':
+        return lambda: solver.solver_policy(t, actor, stats=stats, book=book)
+
+books = dict() # OpeningBook of each book file opened by this process
+
+def open_book(path):
+    """ Returns the opening book at the given path, mapped once per process
+    and shared by every game the process plays, or None if path is None.
+
+    path -- book file written by openingbook.build, or None
+    """
+    if path == None:
+        return None
+    if path not in books:
+        books[path] = openingbook.OpeningBook(path)
+    return books[path]
+
+def game_seed(baseSeed, p1, p2, game):
+    """ Returns the random seed of one game, fixed by the agents and the game
+    number so that it is the same whichever worker plays it.
+
+    baseSeed -- seed of the whole tournament
+    p1 -- Agent moving first
+    p2 -- Agent moving second
+    game -- game number within the matchup
+    """
+    return random.Random("%s:%s:%s:%d" % (baseSeed, tuple(p1), tuple(p2), game)).getrandbits(32)
+
+def play_game(p1_policy, p2_policy):
+    """ Plays one game and returns (payoff, P1 moves, P2 moves, P1 max move
+    time, P2 max move time). A policy that fails or returns None is asked
+    again.
+
+    p1_policy -- policy moving first
+    p2_policy -- policy moving second
+    """
+    game = connect4.Connect4()
+    pos = game.initial_state()
+    moveCounterP1, moveCounterP2, p1_time, p2_time = 0, 0, 0, 0
+    while not pos.is_terminal()[0]:
+        move = None
+        policy = p1_policy if pos.actor() == 1 else p2_policy
+        while move == None:
+            try:
+                start = time.time()
+                move = policy(pos)
+                elapsed = time.time() - start
+            except:
+                pass
+        if pos.actor() == 1:
+            p1_time = max(p1_time, elapsed)
+            moveCounterP1 += 1
+        else:
+            p2_time = max(p2_time, elapsed)
+            moveCounterP2 += 1
+        pos = pos.successor(move)
+    return (pos.payoff(), moveCounterP1, moveCounterP2, p1_time, p2_time)
+
+def play_job(job):
+    """ Seeds the random generators, builds both policies and plays one game.
+    Returns (matchup index, play_game result, P1 SearchStats, P2 SearchStats),
+    the stats being None unless instrumented. Run by the pool workers.
+
+    job -- (matchup index, p1 Agent, p2 Agent, seed, instrument, book file
+            or None)
+    """
+    index, p1, p2, seed, instrument, bookPath = job
+    random.seed(seed)
+    playout.seed(seed)
+    p1Stats = SearchStats() if instrument else None
+    p2Stats = SearchStats() if instrument else None
+    book = open_book(bookPath)
+    p1_policy = policy_factory(p1.agent, p1.t, 1, p1.d, p1.s, p1Stats, book)()
+    p2_policy = policy_factory(p2.agent, p2.t, 2, p2.d, p2.s, p2Stats, book)()
+    return (index, play_game(p1_policy, p2_policy), p1Stats, p2Stats)
+
+class Tally:
+    def __init__(self, games):
+        """ Creates an empty tally for a matchup of at most the given number of
+        games.
+        """
+        self.games = games
+        self.started = 0 # games handed to a worker
+        self.played = 0
+        self.decision = 0 # SPRT decision once made: 1 P1 stronger, -1 P2 stronger
+        self.closed = False # the tournament ran out of budget
+        self.p1_wins, self.p2_wins, self.ties = 0, 0, 0
+        self.p1WinMoves, self.p2WinMoves = 0, 0
+        self.p1_time, self.p2_time = 0, 0
+        self.p1Stats, self.p2Stats = SearchStats(), SearchStats() # totals over the instrumented games
+        self.gameStats = [] # (P1 SearchStats, P2 SearchStats) of each instrumented game
+
+    def add(self, result, p1Stats=None, p2Stats=None):
+        """ Adds the result of one game, as returned by play_game, and the
+        search stats of both players if the game was instrumented.
+        """
+        payoff, moveCounterP1, moveCounterP2, p1_time, p2_time = result
+        self.played += 1
+        if p1Stats != None:
+            self.p1Stats.add(p1Stats)
+            self.p2Stats.add(p2Stats)
+            self.gameStats.append((p1Stats, p2Stats))
+        self.p1_time = max(self.p1_time, p1_time)
+        self.p2_time = max(self.p2_time, p2_time)
+        if payoff == 0: # board is full
+            self.ties += 1
+        elif payoff == 1:
+            self.p1WinMoves += moveCounterP1
+            self.p1_wins += 1
+        else:
+            self.p2WinMoves += moveCounterP2
+            self.p2_wins += 1
+
+    def done(self):
+        """ Returns whether every game started has been added and no more will
+        be started.
+        """
+        return self.played == self.started and (self.started == self.games or self.decision != 0 or self.closed)
+
+    def summary(self):
+        """ Returns (P1 win rate, P2 win rate, tie rate, P1 average moves to
+        win, P2 average moves to win) over the games played, as
+        compare_policies does.
+        """
+        n = max(self.played, 1)
+        return self.p1_wins/n, self.p2_wins/n, self.ties/n, (self.p1WinMoves/self.p1_wins if self.p1_wins != 0 else 0), (self.p2WinMoves/self.p2_wins if self.p2_wins != 0 else 0)
+
+def next_matchup(tallies, test):
+    """ Returns the index of the matchup to start a game of next, or None if
+    none needs one. Without a test the matchups are played in order. With
+    one, the undecided matchups first take turns until each has played
+    test.minGames games, then the game goes to the matchup where it is
+    expected to move the test most.
+
+    tallies -- Tally of every matchup
+    test -- sprt.SPRT deciding matchups early, or None
+    """
+    candidates = [i for i, tally in enumerate(tallies) if tally.started < tally.games and tally.decision == 0]
+    if not candidates:
+        return None
+    if test == None:
+        return candidates[0]
+    warmup = [i for i in candidates if tallies[i].started < test.minGames]
+    if warmup:
+        return min(warmup, key=lambda i: tallies[i].started)
+    return max(candidates, key=lambda i: test.information(tallies[i].p1_wins, tallies[i].p2_wins, tallies[i].ties))
+
+def run(matchups, workers=None, baseSeed=0, test=None, budget=None, instrument=False, book=None):
+    """ Plays the games of the given matchups, spread over a pool of worker
+    processes, and yields the Tally of each matchup in the order given, as
+    soon as it and every matchup before it are complete.
+
+    matchups -- list of Matchup; each plays at most its number of games
+    workers -- number of processes, None for one per CPU, 1 to play in this
+               process
+    baseSeed -- seed of the whole tournament
+    test -- sprt.SPRT that ends a matchup once it decides which agent is
+            stronger, or None to play every game
+    budget -- most games started over all matchups, or None for no limit
+    instrument -- give every policy a searchstats.SearchStats and total them
+                  in each Tally per game and per player
+    book -- opening book file both agents of every game play from before
+            searching, or None
+    """
+    tallies = [Tally(m.games) for m in matchups]
+    workers = workers if workers != None else (os.cpu_count() or 1)
+    finished = queue.Queue()
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    inFlight, started, nextIndex = 0, 0, 0
+    try:
+        while True:
+            # keep every worker busy with one game queued behind it
+            while inFlight < 2 * workers and (budget == None or started < budget):
+                i = next_matchup(tallies, test)
+                if i == None:
+                    break
+                m = matchups[i]
+                job = (i, m.p1, m.p2, game_seed(baseSeed, m.p1, m.p2, tallies[i].started), instrument, book)
+                tallies[i].started += 1
+                started += 1
+                inFlight += 1
+                if pool == None:
+                    finished.put(play_job(job))
+                else:
+                    pool.apply_async(play_job, (job,), callback=finished.put, error_callback=finished.put)
+            if budget != None and started >= budget:
+                for tally in tallies:
+                    tally.closed = True
+            while nextIndex < len(tallies) and tallies[nextIndex].done():
+                yield tallies[nextIndex]
+                nextIndex += 1
+            if inFlight == 0:
+                break
+            result = finished.get()
+            if isinstance(result, BaseException):
+                raise result
+            index, game, p1Stats, p2Stats = result
+            inFlight -= 1
+            tally = tallies[index]
+            tally.add(game, p1Stats, p2Stats)
+            if test != None and tally.decision == 0 and tally.played >= test.minGames:
+                tally.decision = test.decision(tally.p1_wins, tally.p2_wins)
+    finally:
+        if pool != None:
+            pool.terminate()
@@ -0,0 +1,66 @@
+# File: transposition.py
+# Date: October 18, 2026
+# Description: Fixed-size transposition table keyed by the Zobrist or canonical
+# key of a state, for reusing search results across transposed positions.
+
+from array import array
+
+EXACT = 0 # stored value is the minimax value
+LOWER = 1 # search failed high, the value is at least the stored value
+UPPER = 2 # search failed low, the value is at most the stored value
+
+# bytes per entry: 8 key, 8 value, 1 depth, 1 bound flag, 1 best move
+ENTRY_BYTES = 19
+
+class TranspositionTable:
+    def __init__(self, memoryBytes):
+        """ Creates a table holding as many entries as fit in the given memory
+        budget. Each slot is overwritten only by a search of the same or
+        greater depth (depth-preferred replacement), or by the same position.
+
+        memoryBytes -- memory budget for the table in bytes
+        """
+        self.size = max(1, memoryBytes // ENTRY_BYTES)
+        self.keys = array('Q', bytes(8 * self.size))
+        self.values = array('d', bytes(8 * self.size))
+        self.depths = array('b', [-1]) * self.size # -1 marks an empty slot
+        self.flags = array('b', bytes(self.size))
+        self.moves = array('b', bytes(self.size))
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key):
+        """ Returns (value, depth, flag, move) stored for the given key, or
+        None if the position is not in the table.
+
+        key -- Zobrist or canonical key of the state, below 2**64
+        """
+        self.probes += 1
+        i = key % self.size
+        if self.depths[i] >= 0 and self.keys[i] == key:
+            self.hits += 1
+            return (self.values[i], self.depths[i], self.flags[i], self.moves[i])
+        return None
+
+    def store(self, key, value, depth, flag, move):
+        """ Stores a search result unless the slot holds a deeper search of a
+        different position.
+
+        key -- Zobrist or canonical key of the state, below 2**64
+        value -- value found by the search
+        depth -- remaining depth the value was searched to
+        flag -- EXACT, LOWER or UPPER
+        move -- best action found, a column index
+        """
+        i = key % self.size
+        if self.depths[i] < 0 or self.keys[i] == key or depth >= self.depths[i]:
+            self.keys[i] = key
+            self.values[i] = value
+            self.depths[i] = depth
+            self.flags[i] = flag
+            self.moves[i] = move
+
+    def clear(self):
+        """ Empties the table.
+        """
+        self.depths = array('b', [-1]) * self.size
@@ -2,30 +2,18 @@
 # Date: December 18, 2023
 # Description: Monte Carlo Search Tree with UCT0
 
-import time
 import random
 import math
-import connect4
+import arraytree
+import nodetree
 
-class uct0Node:
-    def __init__(self, parent, state):
-        self.state = state
-        self.parent = parent
-        self.visits = 0
-        self.reward = 0
-        self.children = dict()
-        self.expandable = True if state.is_terminal()[0] == False else False
+class uct0Tree(nodetree.NodeTree):
+    compactTree = arraytree.UCTArrayTree
 
-class uct0Tree:
-    def __init__(self, root):
-        sp = self.traverse2(root) 
-        payoff = self.simulate(sp)
-        self.update(sp, payoff)
-
-    def ucb(self, parent):
-        """ Returns the child of the parent node with the maximum UCB value.
-        If there are multiple children sharing the maximum value, one of them
-        is randomly selected to be returned.
+    def select(self, parent):
+        """ Returns the unproven child of the parent node with the maximum UCB
+        value. If there are multiple children sharing the maximum value, one
+        of them is randomly selected to be returned.
 
         parent -- parent node
         """
@@ -34,6 +22,8 @@ class uct0Tree:
         # if p1
         if parent.state.actor() == 1:
             for child in parent.children.values():
+                if child.proven != None:
+                    continue
                 ucb = (child.reward/child.visits) + math.sqrt(2 * math.log(parent.visits) / child.visits)
                 if ucb > maxUCB:
                     maxUCB = ucb
@@ -43,6 +33,8 @@ class uct0Tree:
         # if p2
         else:
             for child in parent.children.values():
+                if child.proven != None:
+                    continue
                 ucb = (child.reward/child.visits) - math.sqrt(2 * math.log(parent.visits) / child.visits) 
                 if ucb < minUCB:
                     minUCB = ucb
@@ -51,79 +43,42 @@ class uct0Tree:
                     returnChild.append(child)
         return random.choice(returnChild) # returns child of passed parent node
 
-    def traverse2(self, root):
-        """ Traverses the tree, expanding nodes based on the actions available
-        from that node. Returns a child from expansion or a terminal.
-        """
-        s = root
-        while s.state.is_terminal()[0] == False:
-            if s.expandable == False:
-                s = self.ucb(s)
-            elif s.expandable == True:
-                s_actions = s.state.get_actions()
-                action = random.choice(list(set(s_actions) - set(s.children.keys())))
-                sp = uct0Node(s,s.state.successor(action))
-                s.children[action] = sp
-                if len(s.children) == len(s_actions):
-                    s.expandable = False
-                return sp
-        return s
-
-    def simulate(self, spNode):
-        """ Simulates a random playout to a terminal state from the given node.
-        Returns the payoff to the player at the terminal position.
-        """
-        sp = spNode.state
-        while(sp.is_terminal() == False):
-            sp = sp.successor(random.choice(sp.get_actions()))
-        return sp.payoff()
-
-    def update(self, pNode, payoff):
-        """ Back propagates payoff up the tree by updating the total reward and
-        number of visits.
-        """
-        current = pNode
-        while current.parent != None:
-            current.reward += payoff
-            current.visits += 1
-            current = current.parent
-        current.visits += 1
-
-def uct0_policy(timeAllowed, cActor):
+def uct0_policy(timeAllowed, cActor, playouts=1, workers=1, compact=False, reuse=True, solveBelow=0, earlyStop=None, stats=None, book=None):
     """ Takes the allowed CPU time in seconds and returns a function that takes
     a position and returns the move suggested by running MCTS for that amount
     of time starting with that position.
 
     timeAllowed -- allowed CPU time in seconds
-    """
-    def uct0(state):
-        timeout = time.time() + timeAllowed
-        game = connect4.Connect4()
-        st = game.State(state.board, state.actor1)
-        root = uct0Node(None, st)
-        
-        while time.time() < timeout:
-            uct0Tree(root)
+    playouts -- random playouts run together to evaluate each new node
+    workers -- number of processes growing independent trees from the root,
+               whose root statistics are merged (root parallelization)
+    compact -- store the search tree as typed arrays instead of node objects
+    reuse -- keep the tree between moves and continue from the subtree of the
+             position reached, instead of starting each move from scratch.
+             The root visits carried over are appended to
+             uct0.carriedVisits after every move.
+    solveBelow -- once at most this many cells are empty, first try to
+                  solve the position exactly with solver.Solver in
+                  half the time, searching as usual if it does not
+                  finish. The solver and its solve statistics are
+                  exposed as uct0.solver (None when solveBelow is 0).
+    earlyStop -- earlystop.VisitMargin or earlystop.ConfidenceBound ending the
+                 search once the move is settled, or None to always use the
+                 full time. The rule counts the stops and the time they
+                 saved; it is exposed as uct0.earlyStop. Used without workers.
+    stats -- searchstats.SearchStats counting the iterations, playouts and
+             time per phase of every search, and the nodes of the solver, or
+             None. Exposed as uct0.stats. Used without workers.
+    book -- openingbook.OpeningBook whose move is played without searching
+            whenever the position is in it, or None
 
-        if root.state.actor() == cActor:
-            maxReward = float('-inf')
-            maxAction = None
-            for action in root.children.keys(): 
-                child = root.children.get(action)
-                exploit = child.reward / child.visits
-                if exploit > maxReward:
-                    maxReward = exploit
-                    maxAction = action
-            return maxAction
-        else:
-            minReward = float('inf')
-            minAction = None
-            for action in root.children.keys(): 
-                child = root.children.get(action)
-                exploit = child.reward / child.visits
-                if exploit < minReward:
-                    minReward = exploit
-                    minAction = action
-            return minAction
-        
-    return uct0
+    Without workers, the tree of the last search is exposed as uct0.tree.
+    Node trees stop searching once the root is proven won, lost or drawn.
+    Without workers, the iterations this skips, estimated from the game's
+    iteration rate, are appended to uct0.savedIterations after every move.
+
+    The root statistics of the last search, a dict mapping each action to
+    [visits, total reward for player 1], are exposed as uct0.rootStats, None
+    when the move came from the book or the solver.
+    """
+    return nodetree.tree_policy(uct0Tree, timeAllowed, cActor, playouts, workers, compact, reuse, solveBelow, earlyStop, stats, book)
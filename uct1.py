@@ -6,13 +6,104 @@ import time
 import random
 import math
 import connect4
+import playout
+import solver
 
 class uct1implicit:
-    def __init__(self, rootState):
+    def __init__(self, rootState, playouts=1, stats=None, symmetric=True):
+        self.playouts = playouts
+        self.stats = stats
+        self.symmetric = symmetric # a position and its mirror image share one entry
+        rootState, self.rootMirrored = rootState.canonical() if symmetric else (rootState, False)
         self.stateList = dict()
         self.stateList[rootState] = [[], 0, True if rootState.is_terminal()[0] == False else False] 
         # array of total reward, visit count for each possible action, own visit count, expandable flag
-        self.run(rootState)
+        self.lookups = 0 # expansions that checked the table for an existing entry
+        self.hits = 0 # expansions that found one and skipped the random playout
+        self.rootState = rootState
+        self.iterations = 0
+        self.elapsed = 0.0 # seconds spent in run_until
+        if stats != None:
+            # the wrappers time each phase without the phases nested in it,
+            # so run keeps only the updates on the way back up
+            self.ucb = stats.timed('select', self.ucb)
+            self.expand = stats.timed('expand', self.expand)
+            self.simulate = stats.timed('simulate', self.simulate)
+            self.run = stats.timed('backprop', self.run)
+
+    def set_root(self, rootState):
+        """ Moves the search to a new root, keeping every statistic already in
+        the table, including any for the new root reached by earlier searches.
+
+        rootState -- state to search from
+        """
+        rootState, self.rootMirrored = rootState.canonical() if self.symmetric else (rootState, False)
+        self.rootState = rootState
+        if self.stateList.get(rootState) == None:
+            self.stateList[rootState] = [[], 0, True if rootState.is_terminal()[0] == False else False]
+
+    def canonical(self, state):
+        """ Returns the state the table keeps the given state under: the
+        orientation its canonical key stands for, or the state itself when
+        the table is not symmetric.
+        """
+        return state.canonical()[0] if self.symmetric else state
+
+    def root_action(self, action):
+        """ Returns the action in the position being searched that matches
+        the given action of the root as the table keeps it.
+        """
+        return connect4.mirror_action(action) if self.rootMirrored else action
+
+    def step(self, n=1):
+        """ Runs n iterations from the root.
+
+        n -- number of iterations
+        """
+        for _ in range(n):
+            self.run(self.rootState)
+        self.iterations += n
+        if self.stats != None:
+            self.stats.iterations += n
+
+    def run_until(self, deadline, stop=None, maximize=True):
+        """ Runs iterations from the root until the deadline, and at least
+        one so the root always has statistics.
+
+        deadline -- time.time() value at which to stop
+        stop -- earlystop rule asked every stop.checkEvery iterations whether
+                the move is settled, or None to run until the deadline
+        maximize -- the policy plays the highest mean reward, for the stop rule
+        """
+        start = time.time()
+        numActions = len(self.rootState.get_actions())
+        count = 0
+        while True:
+            self.run(self.rootState)
+            self.iterations += 1
+            if self.stats != None:
+                self.stats.iterations += 1
+            count += 1
+            now = time.time()
+            if now >= deadline:
+                break
+            if stop != None and count % stop.checkEvery == 0:
+                remaining = count * (deadline - now) / max(now - start, 1e-9)
+                if stop.settled(self.root_stats(), numActions, remaining, maximize):
+                    break
+        self.elapsed += time.time() - start
+
+    def root_stats(self):
+        """ Returns a dict mapping each expanded action at the root to
+        [visits, total reward].
+        """
+        actions = [self.root_action(a) for a in self.rootState.get_actions()]
+        return {actions[i]: [vals[1], vals[0]] for i, vals in enumerate(self.stateList[self.rootState][0])}
+
+    def iterations_per_second(self):
+        """ Returns iterations per second over all calls to run_until.
+        """
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0
 
     def ucb(self, parentState):
         """ Returns the child of the parent node with the maximum UCB value.
@@ -26,7 +117,7 @@ class uct1implicit:
         childList = self.stateList[parentState][0]
         if parentState.actor() == 1:
             for i in range(len(childList)):
-                ucb = (childList[i][0]/childList[i][1]) + math.sqrt(2 * math.log(self.stateList[parentState][3]) / childList[i][1])
+                ucb = (childList[i][0]/childList[i][1]) + math.sqrt(2 * math.log(self.stateList[parentState][1]) / childList[i][1])
                 if ucb > maxUCB:
                     maxUCB = ucb
                     childIndexList = [i]
@@ -34,7 +125,7 @@ class uct1implicit:
                     childIndexList.append(i)
         else:
             for i in range(len(childList)):
-                ucb = (childList[i][0]/childList[i][1]) + math.sqrt(2 * math.log(self.stateList[parentState][3]) / childList[i][1])
+                ucb = (childList[i][0]/childList[i][1]) - math.sqrt(2 * math.log(self.stateList[parentState][1]) / childList[i][1])
                 if ucb < minUCB:
                     minUCB = ucb
                     childIndexList = [i]
@@ -48,7 +139,7 @@ class uct1implicit:
         """
         if state.is_terminal()[0] == False and self.stateList[state][2] == False:
             index = self.ucb(state)
-            newState = state.successor(state.get_actions()[index])
+            newState = self.canonical(state.successor(state.get_actions()[index]))
             reward = self.run(newState)
             stateVals = self.stateList[state]
             stateVals[0][index][0] += reward
@@ -57,77 +148,164 @@ class uct1implicit:
             self.stateList[state] = stateVals
             return reward
         elif state.is_terminal()[0] == False:
-            s_actions = state.get_actions()
-            action = s_actions[len(self.stateList[state][0])] 
-            sp = state.successor(action)
-            if self.stateList.get(sp) != None:
-                reward = self.run(sp)
-                stateVals = self.stateList[state]
-                stateVals[1] += 1
-                stateVals[0].append([reward,1])
-                if len(stateVals[0]) == len(s_actions):
-                        stateVals[2] = False
-                self.stateList[state] = stateVals
-                return reward
-            else:
-                reward = self.simulate(sp)
-                self.stateList[sp] = [[], 1, True if sp.is_terminal()[0] == False else False] 
-                stateVals = self.stateList[state]
-                stateVals[1] += 1
-                stateVals[0].append([reward,1])
-                if len(stateVals[0]) == len(s_actions):
-                        stateVals[2] = False
-                self.stateList[state] = stateVals
-                return reward
+            return self.expand(state)
         else:
             return state.payoff()
 
         
+    def expand(self, state):
+        """ Adds the next untried action of the given nonterminal state to its
+        statistics and returns the payoff backed up through it: from the
+        table if the new state was already reached by another move order,
+        otherwise from a random playout.
+        """
+        s_actions = state.get_actions()
+        action = s_actions[len(self.stateList[state][0])] 
+        sp = self.canonical(state.successor(action))
+        self.lookups += 1
+        if self.stats != None:
+            self.stats.ttProbes += 1
+            self.stats.depth(sp.moves - self.rootState.moves)
+        if self.stateList.get(sp) != None:
+            self.hits += 1
+            if self.stats != None:
+                self.stats.ttHits += 1
+            reward = self.run(sp)
+            stateVals = self.stateList[state]
+            stateVals[1] += 1
+            stateVals[0].append([reward,1])
+            if len(stateVals[0]) == len(s_actions):
+                    stateVals[2] = False
+            self.stateList[state] = stateVals
+            return reward
+        else:
+            if self.stats != None:
+                self.stats.expansions += 1
+            reward = self.simulate(sp)
+            self.stateList[sp] = [[], 1, True if sp.is_terminal()[0] == False else False] 
+            stateVals = self.stateList[state]
+            stateVals[1] += 1
+            stateVals[0].append([reward,1])
+            if len(stateVals[0]) == len(s_actions):
+                    stateVals[2] = False
+            self.stateList[state] = stateVals
+            return reward
+
+    def hit_rate(self):
+        """ Returns the fraction of expansions that reached a state already in
+        the table through a different move order.
+        """
+        return self.hits / self.lookups if self.lookups != 0 else 0
+
     def simulate(self, state):
         """ Simulates a random playout to a terminal state from the given node.
-        Returns the payoff to the player at the terminal position.
+        Returns the payoff to the player at the terminal position. With more
+        than one playout, returns the mean payoff of a batch of playouts.
         """
+        if self.playouts > 1:
+            if self.stats != None:
+                self.stats.playouts += self.playouts
+            p1Wins, _, p2Wins = playout.batch_playouts(state, self.playouts)
+            return (p1Wins - p2Wins) / self.playouts
         s = state
         while s.is_terminal()[0] == False:
             s = s.successor(random.choice(s.get_actions()))
+        if self.stats != None:
+            self.stats.playouts += 1
+            self.stats.playoutMoves += s.moves - state.moves
         return s.payoff()
         
 
 
-def uct1_policy(timeAllowed, cActor):
+def resume(search, timeout):
+    """ Searches until the timeout and returns the new root statistics. Used
+    to audit early stops.
+
+    search -- search object stopped early
+    timeout -- time.time() value at which to stop
+    """
+    search.run_until(timeout)
+    return search.root_stats()
+
+def uct1_policy(timeAllowed, cActor, playouts=1, solveBelow=0, earlyStop=None, stats=None, book=None):
     """ Takes the allowed CPU time in seconds and returns a function that takes
     a position and returns the move suggested by running MCTS for that amount
     of time starting with that position.
 
     timeAllowed -- allowed CPU time in seconds
+    playouts -- random playouts run together to evaluate each new node
+    solveBelow -- once at most this many cells are empty, first try to
+                  solve the position exactly with solver.Solver in
+                  half the time, searching as usual if it does not
+                  finish. The solver and its solve statistics are
+                  exposed as uct1.solver (None when solveBelow is 0).
+    earlyStop -- earlystop.VisitMargin or earlystop.ConfidenceBound ending the
+                 search once the move is settled, or None to always use the
+                 full time. The rule counts the stops and the time they
+                 saved; it is exposed as uct1.earlyStop.
+    stats -- searchstats.SearchStats counting the iterations, playouts, table
+             lookups and time per phase of every search, and the nodes of
+             the solver, or None. Exposed as uct1.stats.
+    book -- openingbook.OpeningBook whose move is played without searching
+            whenever the position is in it, or None
+
+    One table of statistics is kept for every move of the game, and is
+    exposed with its iteration counters as uct1.search.
+
+    The root statistics of the last search, a dict mapping each action to
+    [visits, total reward for player 1], are exposed as uct1.rootStats, None
+    when the move came from the book or the solver.
     """
+    endgame = solver.Solver(stats=stats) if solveBelow > 0 else None
+    imptree = None
+
     def uct1(state):
+        nonlocal imptree
+        uct1.rootStats = None
+        if book != None:
+            move = book.move(state)
+            if move != None:
+                return move
         timeout = time.time() + timeAllowed
         game = connect4.Connect4()
         st = game.State(state.board, state.actor1)
+        if solveBelow > 0:
+            move = solver.endgame_move(endgame, st, solveBelow, time.time() + timeAllowed / 2)
+            if move != None:
+                return move
 
-        while time.time() < timeout:
-            imptree = uct1implicit(st)
-            
+        if imptree == None:
+            imptree = uct1implicit(st, playouts, stats)
+        else:
+            imptree.set_root(st)
+        imptree.run_until(timeout, earlyStop, st.actor() == cActor)
+        rootStats = imptree.root_stats()
+        if earlyStop != None:
+            rootStats = earlyStop.finish(rootStats, timeout - time.time(), lambda: resume(imptree, timeout), st.actor() == cActor)
+        uct1.search = imptree
+        uct1.rootStats = rootStats
         if st.actor() == cActor:
             maxReward = float('-inf')
             maxAction = None
-            rootVals = imptree.stateList[st][0]
-            for i in range(len(rootVals)): 
-                exploit = rootVals[i][0] / rootVals[i][1]
+            for action, (visits, reward) in rootStats.items():
+                exploit = reward / visits
                 if exploit > maxReward:
                     maxReward = exploit
-                    maxAction = i
-            return st.get_actions()[maxAction]
+                    maxAction = action
+            return maxAction
         else:
             minReward = float('inf')
             minAction = None
-            rootVals = imptree.stateList[st][0]
-            for i in range(len(rootVals)):
-                exploit = rootVals[i][0] / rootVals[i][1]
+            for action, (visits, reward) in rootStats.items():
+                exploit = reward / visits
                 if exploit < minReward:
                     minReward = exploit
-                    minAction = i
-            return st.get_actions()[minAction]
+                    minAction = action
+            return minAction
         
+    uct1.search = None
+    uct1.solver = endgame
+    uct1.earlyStop = earlyStop
+    uct1.stats = stats
+    uct1.rootStats = None
     return uct1
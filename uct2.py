@@ -6,13 +6,117 @@ import time
 import random
 import math
 import connect4
+import playout
+import solver
 
 class uct2implicit:
-    def __init__(self, rootState):
+    def __init__(self, rootState, playouts=1, stats=None, symmetric=True):
+        self.playouts = playouts
+        self.stats = stats
+        self.symmetric = symmetric # a position and its mirror image share one entry
+        rootState, self.rootMirrored = rootState.canonical() if symmetric else (rootState, False)
         self.stateList = dict()
-        self.stateList[rootState] = [[], 0, True if rootState.is_terminal()[0] == False else False, 0] 
-        # array of visit count for each possible action, own visit count, expandable flag, state reward
-        self.run(rootState)
+        self.stateList[rootState] = self.new_entry(rootState, 0, 0)
+        # array of visit count for each possible action, own visit count, expandable flag, state reward,
+        # and (child state, child entry) for each possible action in the order of the visit counts.
+        # A child's own reward and visits are shared by every parent reaching it, so selection reads
+        # its value straight from the entry it references
+        self.lookups = 0 # expansions that checked the table for an existing entry
+        self.hits = 0 # expansions that found one and skipped the random playout
+        self.rootState = rootState
+        self.iterations = 0
+        self.elapsed = 0.0 # seconds spent in run_until
+        if stats != None:
+            # the wrappers time each phase without the phases nested in it,
+            # so run keeps only the updates on the way back up
+            self.ucb = stats.timed('select', self.ucb)
+            self.expand = stats.timed('expand', self.expand)
+            self.simulate = stats.timed('simulate', self.simulate)
+            self.run = stats.timed('backprop', self.run)
+
+    def set_root(self, rootState):
+        """ Moves the search to a new root, keeping every statistic already in
+        the table, including any for the new root reached by earlier searches.
+
+        rootState -- state to search from
+        """
+        rootState, self.rootMirrored = rootState.canonical() if self.symmetric else (rootState, False)
+        self.rootState = rootState
+        if self.stateList.get(rootState) == None:
+            self.stateList[rootState] = self.new_entry(rootState, 0, 0)
+
+    def new_entry(self, state, visits, reward):
+        """ Returns a new table entry for the given state with no children.
+
+        state -- game state
+        visits -- initial visit count
+        reward -- initial total reward
+        """
+        return [[], visits, True if state.is_terminal()[0] == False else False, reward, []]
+
+    def canonical(self, state):
+        """ Returns the state the table keeps the given state under: the
+        orientation its canonical key stands for, or the state itself when
+        the table is not symmetric.
+        """
+        return state.canonical()[0] if self.symmetric else state
+
+    def root_action(self, action):
+        """ Returns the action in the position being searched that matches
+        the given action of the root as the table keeps it.
+        """
+        return connect4.mirror_action(action) if self.rootMirrored else action
+
+    def step(self, n=1):
+        """ Runs n iterations from the root.
+
+        n -- number of iterations
+        """
+        for _ in range(n):
+            self.run(self.rootState)
+        self.iterations += n
+        if self.stats != None:
+            self.stats.iterations += n
+
+    def run_until(self, deadline, stop=None, maximize=True):
+        """ Runs iterations from the root until the deadline, and at least
+        one so the root always has statistics.
+
+        deadline -- time.time() value at which to stop
+        stop -- earlystop rule asked every stop.checkEvery iterations whether
+                the move is settled, or None to run until the deadline
+        maximize -- the policy plays the highest mean reward, for the stop rule
+        """
+        start = time.time()
+        numActions = len(self.rootState.get_actions())
+        count = 0
+        while True:
+            self.run(self.rootState)
+            self.iterations += 1
+            if self.stats != None:
+                self.stats.iterations += 1
+            count += 1
+            now = time.time()
+            if now >= deadline:
+                break
+            if stop != None and count % stop.checkEvery == 0:
+                remaining = count * (deadline - now) / max(now - start, 1e-9)
+                if stop.settled(self.root_stats(), numActions, remaining, maximize):
+                    break
+        self.elapsed += time.time() - start
+
+    def root_stats(self):
+        """ Returns a dict mapping each expanded action at the root to the
+        [visits, total reward] of the child it leads to, shared by every
+        parent reaching that child, so each mean is the child's value.
+        """
+        actions = [self.root_action(a) for a in self.rootState.get_actions()]
+        return {actions[i]: [child[1], child[3]] for i, (_, child) in enumerate(self.stateList[self.rootState][4])}
+
+    def iterations_per_second(self):
+        """ Returns iterations per second over all calls to run_until.
+        """
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0
 
     def ucb(self, parentState):
         """ Returns the child of the parent node with the maximum UCB value.
@@ -23,11 +127,14 @@ class uct2implicit:
         """
         ucb, maxUCB, minUCB = 0, float('-inf'), float('inf')
         childIndexList = []
-        childVisitList = self.stateList[parentState][0]
-        actions = parentState.get_actions()
+        parentVals = self.stateList[parentState]
+        childVisitList = parentVals[0]
+        children = parentVals[4]
+        logVisits = math.log(parentVals[1])
         if parentState.actor() == 1:
             for i in range(len(childVisitList)):
-                ucb = ((self.stateList[parentState.successor(actions[i])][3])/childVisitList[i]) + math.sqrt(2 * math.log(self.stateList[parentState][3]) / childVisitList[i])
+                child = children[i][1]
+                ucb = (child[3]/child[1]) + math.sqrt(2 * logVisits / childVisitList[i])
                 if ucb > maxUCB:
                     maxUCB = ucb
                     childIndexList = [i]
@@ -35,7 +142,8 @@ class uct2implicit:
                     childIndexList.append(i)
         else:
             for i in range(len(childVisitList)):
-                ucb = ((self.stateList[parentState.successor(actions[i])][3])/childVisitList[i]) + math.sqrt(2 * math.log(self.stateList[parentState][3]) / childVisitList[i])
+                child = children[i][1]
+                ucb = (child[3]/child[1]) - math.sqrt(2 * logVisits / childVisitList[i])
                 if ucb < minUCB:
                     minUCB = ucb
                     childIndexList = [i]
@@ -49,7 +157,7 @@ class uct2implicit:
         """
         if state.is_terminal()[0] == False and self.stateList[state][2] == False:
             index = self.ucb(state)
-            newState = state.successor(state.get_actions()[index])
+            newState = self.stateList[state][4][index][0]
             reward = self.run(newState)
             stateVals = self.stateList[state]
             stateVals[3] += reward
@@ -58,83 +166,174 @@ class uct2implicit:
             self.stateList[state] = stateVals
             return reward
         elif state.is_terminal()[0] == False:
-            s_actions = state.get_actions()
-            action = s_actions[len(self.stateList[state][0])] # is an index
-            sp = state.successor(action)
-            if self.stateList.get(sp) != None:
-                reward = self.run(sp)
-                stateVals = self.stateList[state]
-                stateVals[1] += 1
-                stateVals[0].append(1)
-                stateVals[3] += reward
-                if len(stateVals[0]) == len(s_actions):
-                        stateVals[2] = False
-                self.stateList[state] = stateVals
-                return reward
-            else:
-                reward = self.simulate(sp)
-                self.stateList[sp] = [[], 1, True if sp.is_terminal()[0] == False else False] 
-                stateVals = self.stateList[state]
+            return self.expand(state)
+        else:
+            reward = state.payoff()
+            stateVals = self.stateList.get(state)
+            if stateVals != None: # terminal states shared through the table keep their own totals
                 stateVals[1] += 1
-                stateVals[0].append(1)
                 stateVals[3] += reward
-                if len(stateVals[0]) == len(s_actions):
-                        stateVals[2] = False
-                self.stateList[state] = stateVals
-                return reward
-        else:
-            return state.payoff()
+            return reward
 
         
+    def expand(self, state):
+        """ Adds the next untried action of the given nonterminal state to its
+        statistics and returns the payoff backed up through it: from the
+        table if the new state was already reached by another move order,
+        otherwise from a random playout.
+        """
+        s_actions = state.get_actions()
+        action = s_actions[len(self.stateList[state][0])] # is an index
+        sp = self.canonical(state.successor(action))
+        self.lookups += 1
+        if self.stats != None:
+            self.stats.ttProbes += 1
+            self.stats.depth(sp.moves - self.rootState.moves)
+        spVals = self.stateList.get(sp)
+        if spVals != None:
+            self.hits += 1
+            if self.stats != None:
+                self.stats.ttHits += 1
+            reward = self.run(sp)
+            stateVals = self.stateList[state]
+            stateVals[1] += 1
+            stateVals[0].append(1)
+            stateVals[4].append((sp, spVals))
+            stateVals[3] += reward
+            if len(stateVals[0]) == len(s_actions):
+                    stateVals[2] = False
+            self.stateList[state] = stateVals
+            return reward
+        else:
+            if self.stats != None:
+                self.stats.expansions += 1
+            reward = self.simulate(sp)
+            spVals = self.new_entry(sp, 1, reward)
+            self.stateList[sp] = spVals
+            stateVals = self.stateList[state]
+            stateVals[1] += 1
+            stateVals[0].append(1)
+            stateVals[4].append((sp, spVals))
+            stateVals[3] += reward
+            if len(stateVals[0]) == len(s_actions):
+                    stateVals[2] = False
+            self.stateList[state] = stateVals
+            return reward
+
+    def hit_rate(self):
+        """ Returns the fraction of expansions that reached a state already in
+        the table through a different move order.
+        """
+        return self.hits / self.lookups if self.lookups != 0 else 0
+
     def simulate(self, state):
         """ Simulates a random playout to a terminal state from the given node.
-        Returns the payoff to the player at the terminal position.
+        Returns the payoff to the player at the terminal position. With more
+        than one playout, returns the mean payoff of a batch of playouts.
         """
+        if self.playouts > 1:
+            if self.stats != None:
+                self.stats.playouts += self.playouts
+            p1Wins, _, p2Wins = playout.batch_playouts(state, self.playouts)
+            return (p1Wins - p2Wins) / self.playouts
         s = state
         while s.is_terminal()[0] == False:
             s = s.successor(random.choice(s.get_actions()))
+        if self.stats != None:
+            self.stats.playouts += 1
+            self.stats.playoutMoves += s.moves - state.moves
         return s.payoff()
         
 
-def uct2_policy(timeAllowed, cActor):
+def resume(search, timeout):
+    """ Searches until the timeout and returns the new root statistics. Used
+    to audit early stops.
+
+    search -- search object stopped early
+    timeout -- time.time() value at which to stop
+    """
+    search.run_until(timeout)
+    return search.root_stats()
+
+def uct2_policy(timeAllowed, cActor, playouts=1, solveBelow=0, earlyStop=None, stats=None, book=None):
     """ Takes the allowed CPU time in seconds and returns a function that takes
     a position and returns the move suggested by running MCTS for that amount
     of time starting with that position.
 
     timeAllowed -- allowed CPU time in seconds
+    playouts -- random playouts run together to evaluate each new node
+    solveBelow -- once at most this many cells are empty, first try to
+                  solve the position exactly with solver.Solver in
+                  half the time, searching as usual if it does not
+                  finish. The solver and its solve statistics are
+                  exposed as uct2.solver (None when solveBelow is 0).
+    earlyStop -- earlystop.VisitMargin or earlystop.ConfidenceBound ending the
+                 search once the move is settled, or None to always use the
+                 full time. The rule counts the stops and the time they
+                 saved; it is exposed as uct2.earlyStop.
+    stats -- searchstats.SearchStats counting the iterations, playouts, table
+             lookups and time per phase of every search, and the nodes of
+             the solver, or None. Exposed as uct2.stats.
+    book -- openingbook.OpeningBook whose move is played without searching
+            whenever the position is in it, or None
+
+    One table of statistics is kept for every move of the game, and is
+    exposed with its iteration counters as uct2.search.
+
+    The root statistics of the last search, a dict mapping each action to
+    [visits, total reward for player 1], are exposed as uct2.rootStats, None
+    when the move came from the book or the solver.
     """
+    endgame = solver.Solver(stats=stats) if solveBelow > 0 else None
+    imptree = None
+
     def uct2(state):
+        nonlocal imptree
+        uct2.rootStats = None
+        if book != None:
+            move = book.move(state)
+            if move != None:
+                return move
         timeout = time.time() + timeAllowed
         game = connect4.Connect4()
         st = game.State(state.board, state.actor1)
+        if solveBelow > 0:
+            move = solver.endgame_move(endgame, st, solveBelow, time.time() + timeAllowed / 2)
+            if move != None:
+                return move
 
-        while time.time() < timeout:
-            imptree = uct2implicit(st)
-
-        actions = st.get_actions()
+        if imptree == None:
+            imptree = uct2implicit(st, playouts, stats)
+        else:
+            imptree.set_root(st)
+        imptree.run_until(timeout, earlyStop, st.actor() == cActor)
+        rootStats = imptree.root_stats()
+        if earlyStop != None:
+            rootStats = earlyStop.finish(rootStats, timeout - time.time(), lambda: resume(imptree, timeout), st.actor() == cActor)
+        uct2.search = imptree
+        uct2.rootStats = rootStats
         if st.actor() == cActor:
             maxReward = float('-inf')
-            maxAction = 0
-            rootVals = imptree.stateList[st][0]
-            for i in range(len(rootVals)): 
-                exp = imptree.stateList.get(st.successor(actions[i]))
-                if exp != None:
-                    exploit = exp[3] / rootVals[i]
-                    if exploit > maxReward:
-                        maxReward = exploit
-                        maxAction = i
-            return actions[maxAction]
+            maxAction = None
+            for action, (visits, reward) in rootStats.items():
+                exploit = reward / visits
+                if exploit > maxReward:
+                    maxReward = exploit
+                    maxAction = action
+            return maxAction
         else:
             minReward = float('inf')
             minAction = None
-            rootVals = imptree.stateList[st][0]
-            for i in range(len(rootVals)):
-                exp = imptree.stateList.get(st.successor(actions[i]))
-                if exp != None:
-                    exploit = exp[3] / rootVals[i]
-                    if exploit < minReward:
-                        minReward = exploit
-                        minAction = i
-            return actions[minAction]
+            for action, (visits, reward) in rootStats.items():
+                exploit = reward / visits
+                if exploit < minReward:
+                    minReward = exploit
+                    minAction = action
+            return minAction
         
+    uct2.search = None
+    uct2.solver = endgame
+    uct2.earlyStop = earlyStop
+    uct2.stats = stats
+    uct2.rootStats = None
     return uct2